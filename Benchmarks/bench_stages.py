@@ -0,0 +1,175 @@
+"""
+bench_stages.py
+
+파이프라인 단계별 벤치마크 하네스 (오프라인 전용).
+
+합성 데이터셋(synthetic_data.py)을 만들거나 기존 데이터셋 디렉토리를 읽어
+단계별 wall time(반복 중 최솟값)과 tracemalloc peak 메모리를 측정한다.
+
+    python -m Benchmarks.bench_stages --videos 100000 --snapshots 5
+    python -m Benchmarks.bench_stages --save-baseline Benchmarks/baseline.json
+    python -m Benchmarks.bench_stages --compare Benchmarks/baseline.json
+
+--compare 시 baseline 대비 threshold 이상 느려진 단계가 있으면 exit code 1.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional
+
+from Sources.Youtube.storage.raw_store import read_raw, list_raw_files
+
+import Normalized.trending_topics as trending_topics
+import Scoring.scoring as scoring
+import Scoring.topic_scoring as topic_scoring
+import Insights.trend_insights as trend_insights
+
+from Benchmarks.synthetic_data import generate_dataset
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_mb": peak / (1024 * 1024), "result": result}
+
+
+def run_benchmarks(data_root: Path, repeat: int = 3, limit_snapshots: int = 5) -> Dict[str, Dict[str, Any]]:
+    raw = data_root / "raw"
+    trending_path = list_raw_files(raw / "trending")[-1]
+    snapshot_paths = list_raw_files(raw / "stats_snapshots")[-limit_snapshots:]
+
+    # score_topics는 결과 파일을 쓰므로 임시 디렉토리로 돌린다
+    out_dir = Path(tempfile.mkdtemp(prefix="bench_out_"))
+    topic_scoring.TOPIC_SCORE_DIR = out_dir
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def stage(name: str, fn: Callable[[], Any], count: Callable[[Any], int]) -> Any:
+        m = _measure(fn, repeat)
+        items = count(m["result"])
+        results[name] = {
+            "seconds": round(m["seconds"], 6),
+            "peak_mb": round(m["peak_mb"], 3),
+            "items": items,
+        }
+        print(f"{name:22s} {m['seconds'] * 1000:10.2f} ms  {m['peak_mb']:9.2f} MB  items={items}")
+        return m["result"]
+
+    trending = stage("load_trending", lambda: read_raw(trending_path),
+                     lambda d: len(d.get("items", [])))
+    snaps = stage("load_snapshots", lambda: [read_raw(p) for p in snapshot_paths],
+                  lambda ss: sum(len(s.get("items", [])) for s in ss))
+    n_trending = results["load_trending"]["items"]
+    n_snapshot = results["load_snapshots"]["items"]
+
+    ts = stage("build_time_series", lambda: scoring.build_time_series(snaps), lambda _: n_snapshot)
+    deltas = stage("compute_deltas", lambda: scoring.compute_deltas(ts), lambda _: len(ts))
+    stage("compute_spike_scores", lambda: scoring.compute_spike_scores(deltas), lambda _: len(deltas))
+    scoring_results = stage("run_scoring", lambda: scoring.run_scoring(snapshots=snaps), lambda _: n_snapshot)
+
+    topics = stage("build_topics", lambda: trending_topics.build_topics(trending), lambda _: n_trending)
+    topics_data = {
+        "region_code": trending.get("region_code"),
+        "fetched_at_utc": trending.get("fetched_at_utc"),
+        "topics": topics,
+    }
+    stage("score_topics", lambda: topic_scoring.score_topics(topics_data, scoring_results), len)
+    stage("build_insights", lambda: trend_insights.build_insights(trending), lambda _: n_trending)
+
+    return results
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.2,
+) -> List[str]:
+    """
+    baseline 대비 threshold(비율) 이상 느려지거나 메모리가 늘어난 단계 목록.
+    """
+    regressions: List[str] = []
+    print()
+    print(f"{'stage':22s} {'time x':>8s} {'mem x':>8s}")
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        t_ratio = cur["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        m_ratio = cur["peak_mb"] / base["peak_mb"] if base["peak_mb"] else 1.0
+        flag = ""
+        if t_ratio > 1 + threshold or m_ratio > 1 + threshold:
+            flag = "  <-- regression"
+            regressions.append(name)
+        print(f"{name:22s} {t_ratio:8.2f} {m_ratio:8.2f}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 벤치마크")
+    parser.add_argument("--data-dir", type=Path, help="기존 합성 데이터셋 root (없으면 임시 생성)")
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--snapshots", type=int, default=5)
+    parser.add_argument("--trending-items", type=int, default=220)
+    parser.add_argument("--search-files", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    data_root = args.data_dir
+    if data_root is None or not (data_root / "raw").exists():
+        data_root = data_root or Path(tempfile.mkdtemp(prefix="bench_data_"))
+        print(f"합성 데이터 생성: {data_root} (videos={args.videos}, snapshots={args.snapshots})")
+        generate_dataset(
+            data_root,
+            n_videos=args.videos,
+            n_snapshots=args.snapshots,
+            trending_items=args.trending_items,
+            n_search_files=args.search_files,
+            seed=args.seed,
+        )
+
+    results = run_benchmarks(data_root, repeat=args.repeat, limit_snapshots=min(args.snapshots, 5))
+    report = {
+        "params": {"videos": args.videos, "snapshots": args.snapshots,
+                   "trending_items": args.trending_items, "seed": args.seed},
+        "stages": results,
+    }
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.save_baseline.open("w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"baseline 저장: {args.save_baseline}")
+
+    if args.compare:
+        with args.compare.open("r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != report["params"]:
+            print(f"[주의] baseline 파라미터가 다릅니다: {baseline.get('params')}")
+        if compare_with_baseline(results, baseline.get("stages", {}), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+check_circuit_breaker.py
+
+request_with_retry / CircuitBreaker 회귀 체크 (오프라인, 네트워크 없음).
+
+requests.get 을 정해진 응답 순서로 바꿔 끼우고 서킷 상태 전이를 확인한다.
+- 503 연속 → open → cooldown 후 half-open 시험 요청이 404 (YouTubeClientError)
+  → 다음 요청은 통과해야 한다 (시험 요청이 풀리지 않으면 영원히 CircuitOpenError)
+- half-open 시험 요청이 quotaExceeded (trip) → trip cooldown 후 다시 시험 요청 허용
+
+    python -m Benchmarks.check_circuit_breaker
+
+실패한 체크가 있으면 exit code 1.
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import Sources.Youtube.api.youtube_client as yc
+
+COOLDOWN = 0.05
+URL = "http://breaker-check.invalid/youtube/v3/videos"
+
+
+class _Response:
+
+    def __init__(self, status: int, reason: Optional[str] = None):
+        self.status_code = status
+        self._body: Dict[str, Any] = {"items": []} if status == 200 else {
+            "error": {"errors": [{"reason": reason or str(status)}]}
+        }
+        self.content = b"{}"
+        self.text = str(self._body)
+        self.headers: Dict[str, str] = {}
+
+    def json(self) -> Dict[str, Any]:
+        return self._body
+
+
+def _install(responses: List[_Response]) -> None:
+    queue = list(responses)
+
+    def get(url: str, params: Dict[str, Any], timeout: float) -> _Response:
+        return queue.pop(0)
+
+    yc.requests = SimpleNamespace(get=get, RequestException=yc.requests.RequestException)
+
+
+def _call() -> str:
+    try:
+        yc.request_with_retry(URL, {"id": "x"}, max_retries=1, wait=0.0, max_wait=0.0)
+        return "ok"
+    except yc.CircuitOpenError:
+        return "open"
+    except yc.QuotaExceededError:
+        return "quota"
+    except yc.YouTubeClientError:
+        return "client_error"
+    except yc.YouTubeAPIError:
+        return "api_error"
+
+
+def _fresh_breaker() -> yc.CircuitBreaker:
+    breaker = yc.CircuitBreaker(failure_threshold=5, cooldown=COOLDOWN)
+    with yc._BREAKERS_LOCK:
+        yc._BREAKERS[urlsplit(URL).netloc] = breaker
+    return breaker
+
+
+def check_client_error_probe() -> List[str]:
+    _fresh_breaker()
+    _install([_Response(503)] * 5 + [_Response(404, "notFound"), _Response(200), _Response(200)])
+    got = [_call() for _ in range(5)]
+    got.append(_call())           # cooldown 중
+    time.sleep(COOLDOWN * 2)
+    got.append(_call())           # half-open 시험 요청 → 404
+    got.append(_call())           # 시험 요청이 풀렸으면 통과
+    got.append(_call())
+    expected = ["api_error"] * 5 + ["open", "client_error", "ok", "ok"]
+    return [] if got == expected else [f"client_error_probe: {got} != {expected}"]
+
+
+def check_trip_releases_probe() -> List[str]:
+    breaker = _fresh_breaker()
+    _install([_Response(503)] * 5 + [_Response(403, "quotaExceeded"), _Response(200)])
+    got = [_call() for _ in range(5)]
+    time.sleep(COOLDOWN * 2)
+    saved = yc.QUOTA_COOLDOWN_SEC
+    yc.QUOTA_COOLDOWN_SEC = COOLDOWN
+    try:
+        got.append(_call())       # half-open 시험 요청 → quotaExceeded (trip)
+    finally:
+        yc.QUOTA_COOLDOWN_SEC = saved
+    got.append(_call())           # trip cooldown 중
+    time.sleep(COOLDOWN * 2)
+    got.append(_call())           # cooldown 후 다시 시험 요청 허용
+    expected = ["api_error"] * 5 + ["quota", "open", "ok"]
+    errors = [] if got == expected else [f"trip_releases_probe: {got} != {expected}"]
+    if breaker.half_open_inflight:
+        errors.append("trip_releases_probe: half_open_inflight 가 남아 있음")
+    return errors
+
+
+def main() -> int:
+    original = yc.requests
+    errors: List[str] = []
+    try:
+        for check in (check_client_error_probe, check_trip_releases_probe):
+            found = check()
+            print(f"{check.__name__:28s} {'FAIL' if found else 'ok'}")
+            errors += found
+    finally:
+        yc.requests = original
+    for e in errors:
+        print(e)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
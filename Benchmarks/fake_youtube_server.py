@@ -0,0 +1,414 @@
+"""
+fake_youtube_server.py
+
+부하 테스트용 로컬 YouTube Data API / Innertube 대역 서버 (실제 쿼타 소모 없음).
+
+구현 엔드포인트 (synthetic_data.SyntheticDataset 기반 결정적 데이터):
+- GET  /youtube/v3/search                      (search.list, 100 units)
+- GET  /youtube/v3/videos?id=...               (videos.list by id, 1 unit)
+- GET  /youtube/v3/videos?chart=mostPopular    (videos.list chart, 1 unit)
+- GET  /youtube/v3/channels?id=...             (channels.list, 1 unit)
+- GET  /youtube/v3/playlistItems?playlistId=.. (업로드 재생목록, 최신순, 1 unit)
+- POST /youtubei/v1/browse                     (FEwhat_to_watch / FEshorts)
+- POST /youtubei/v1/next                       (관련 영상)
+
+장애 주입:
+- 고정 지연 + jitter (latency_ms, jitter_ms)
+- 403 rateLimitExceeded / 429 / 5xx backendError 비율
+- 쿼타 한도 초과 시 403 quotaExceeded
+
+클라이언트는 환경변수로 이 서버를 바라보게 한다.
+
+    python -m Benchmarks.fake_youtube_server --port 8765 --rate-429 0.05 --quota 10000
+    YOUTUBE_API_BASE=http://127.0.0.1:8765/youtube/v3 \\
+    INNERTUBE_API_BASE=http://127.0.0.1:8765/youtubei/v1 \\
+    YOUTUBE_API_KEY=fake python -m Pipeline snapshot
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from Benchmarks.synthetic_data import SyntheticDataset
+
+QUOTA_COSTS: Dict[str, int] = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+}
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_403: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after: Optional[int] = None
+    quota: Optional[int] = None
+    seed: int = 0
+
+
+def _error_body(code: int, reason: str, message: str) -> Dict[str, Any]:
+    domain = "youtube.quota" if reason == "quotaExceeded" else "global"
+    return {
+        "error": {
+            "code": code,
+            "message": message,
+            "errors": [{"message": message, "domain": domain, "reason": reason}],
+        }
+    }
+
+
+class FakeYouTubeBackend:
+    """
+    요청 → (status, headers, body) 변환 로직. HTTP 계층과 분리해 두어
+    핸들러 없이도 테스트/재사용할 수 있다.
+    """
+
+    def __init__(self, n_videos: int = 10000, faults: Optional[FaultConfig] = None,
+                 step_seconds: float = 60.0):
+        self.dataset = SyntheticDataset(n_videos=n_videos, seed=faults.seed if faults else 0)
+        self.index = {vid: i for i, vid in enumerate(self.dataset.video_ids)}
+        # 채널별 업로드 (publishedAt 최신순)
+        self.uploads: Dict[str, List[int]] = {}
+        for i, ch in enumerate(self.dataset.channels):
+            self.uploads.setdefault(ch, []).append(i)
+        for indices in self.uploads.values():
+            indices.sort(key=lambda i: (i % 720, i))
+        self.faults = faults or FaultConfig()
+        self.step_seconds = step_seconds
+        self.started = time.time()
+
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self.quota_used = 0
+        self.request_counts: Dict[str, int] = {}
+
+    # ------------------------------
+    # 공통
+    # ------------------------------
+
+    def _step(self) -> int:
+        return int((time.time() - self.started) / self.step_seconds)
+
+    def _inject(self, endpoint: str) -> Optional[Tuple[int, Dict[str, str], Dict[str, Any]]]:
+        f = self.faults
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+            delay = f.latency_ms + (self._rng.uniform(0, f.jitter_ms) if f.jitter_ms else 0.0)
+            roll = self._rng.random()
+            cost = QUOTA_COSTS.get(endpoint, 0)
+            if f.quota is not None and self.quota_used + cost > f.quota:
+                quota_exhausted = True
+            else:
+                quota_exhausted = False
+                self.quota_used += cost
+
+        if delay:
+            time.sleep(delay / 1000.0)
+
+        if quota_exhausted:
+            return 403, {}, _error_body(403, "quotaExceeded",
+                                        "The request cannot be completed because you have exceeded your quota.")
+        headers: Dict[str, str] = {}
+        if f.retry_after is not None:
+            headers["Retry-After"] = str(f.retry_after)
+        if roll < f.rate_403:
+            return 403, headers, _error_body(403, "rateLimitExceeded", "Rate limit exceeded.")
+        roll -= f.rate_403
+        if roll < f.rate_429:
+            return 429, headers, _error_body(429, "rateLimitExceeded", "Too many requests.")
+        roll -= f.rate_429
+        if roll < f.rate_5xx:
+            return 503, headers, _error_body(503, "backendError", "Backend Error")
+        return None
+
+    def _page(self, params: Dict[str, str], total: int) -> Tuple[int, int, Optional[str]]:
+        max_results = max(1, min(int(params.get("maxResults", 5)), 50))
+        start = int(params.get("pageToken") or 0)
+        end = min(total, start + max_results)
+        next_token = str(end) if end < total else None
+        return start, end, next_token
+
+    # ------------------------------
+    # Data API
+    # ------------------------------
+
+    def search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        n = self.dataset.n_videos
+        offset = zlib.crc32(params.get("q", "").encode("utf-8")) % n
+        start, end, next_token = self._page(params, min(n, 500))
+        items = []
+        for k in range(start, end):
+            idx = (offset + k) % n
+            full = self.dataset.video_item(idx)
+            items.append({
+                "kind": "youtube#searchResult",
+                "id": {"kind": "youtube#video", "videoId": full["id"]},
+                "snippet": {k2: full["snippet"][k2] for k2 in
+                            ("publishedAt", "channelId", "title", "description", "channelTitle")},
+            })
+        body: Dict[str, Any] = {
+            "kind": "youtube#searchListResponse",
+            "pageInfo": {"totalResults": min(n, 500), "resultsPerPage": len(items)},
+            "items": items,
+        }
+        if next_token:
+            body["nextPageToken"] = next_token
+        return body
+
+    def videos(self, params: Dict[str, str]) -> Dict[str, Any]:
+        step = self._step()
+        parts = set((params.get("part") or "snippet,statistics").split(","))
+        full = bool(parts & {"snippet", "contentDetails"})
+
+        if params.get("chart") == "mostPopular":
+            cat = params.get("videoCategoryId")
+            region = params.get("regionCode", "KR")
+            pool = [i for i in range(self.dataset.n_videos)
+                    if cat is None or self.dataset.categories[i] == cat]
+            # 지역별로 다른 결정적 순서
+            pool.sort(key=lambda i: (-self.dataset.views_at(i, step), zlib.crc32(f"{region}{i}".encode())))
+            start, end, next_token = self._page(params, min(len(pool), 200))
+            indices = pool[start:end]
+        else:
+            ids = [v for v in (params.get("id") or "").split(",") if v][:50]
+            # 모르는 id는 응답에서 빠진다 (삭제/비공개 영상 흉내)
+            indices = [self.index[v] for v in ids if v in self.index]
+            next_token = None
+
+        items = []
+        for idx in indices:
+            item = self.dataset.video_item(idx, step, full=full)
+            if "statistics" not in parts:
+                item.pop("statistics", None)
+            items.append(item)
+        body: Dict[str, Any] = {
+            "kind": "youtube#videoListResponse",
+            "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)},
+            "items": items,
+        }
+        if next_token:
+            body["nextPageToken"] = next_token
+        return body
+
+    def channels(self, params: Dict[str, str]) -> Dict[str, Any]:
+        ids = [c for c in (params.get("id") or "").split(",") if c][:50]
+        items = [
+            {
+                "kind": "youtube#channel",
+                "id": ch,
+                "contentDetails": {"relatedPlaylists": {"uploads": "UU" + ch[2:]}},
+            }
+            for ch in ids if ch in self.uploads
+        ]
+        return {"kind": "youtube#channelListResponse",
+                "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)},
+                "items": items}
+
+    def playlist_items(self, params: Dict[str, str]) -> Dict[str, Any]:
+        playlist = params.get("playlistId") or ""
+        uploads = self.uploads.get("UC" + playlist[2:], [])
+        start, end, next_token = self._page(params, len(uploads))
+        items = []
+        for idx in uploads[start:end]:
+            full = self.dataset.video_item(idx)
+            items.append({
+                "kind": "youtube#playlistItem",
+                "contentDetails": {"videoId": full["id"],
+                                   "videoPublishedAt": full["snippet"]["publishedAt"]},
+            })
+        body: Dict[str, Any] = {
+            "kind": "youtube#playlistItemListResponse",
+            "pageInfo": {"totalResults": len(uploads), "resultsPerPage": len(items)},
+            "items": items,
+        }
+        if next_token:
+            body["nextPageToken"] = next_token
+        return body
+
+    # ------------------------------
+    # Innertube
+    # ------------------------------
+
+    def _video_renderer(self, idx: int, key: str = "videoRenderer") -> Dict[str, Any]:
+        item = self.dataset.video_item(idx, self._step())
+        views = int(item["statistics"]["viewCount"])
+        if key == "reelItemRenderer":
+            return {key: {
+                "videoId": item["id"],
+                "headline": {"simpleText": item["snippet"]["title"]},
+                "viewCountText": {"simpleText": f"{views:,} views"},
+            }}
+        return {key: {
+            "videoId": item["id"],
+            "title": {"runs": [{"text": item["snippet"]["title"]}]},
+            "ownerText": {"runs": [{"text": item["snippet"]["channelTitle"]}]},
+            "viewCountText": {"simpleText": f"{views:,} views"},
+            "thumbnail": {"thumbnails": [{"url": "https://i.ytimg.com/vi/x/hq.jpg", "width": 480}]},
+        }}
+
+    def browse(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        n = self.dataset.n_videos
+        browse_id = body.get("browseId", "FEwhat_to_watch")
+        offset = zlib.crc32(browse_id.encode()) % n
+        if browse_id == "FEshorts":
+            shelf = [self._video_renderer((offset + k) % n, "reelItemRenderer") for k in range(30)]
+            contents = [{"reelShelfRenderer": {"title": {"simpleText": "Shorts"}, "items": shelf}}]
+        else:
+            contents = [{"richItemRenderer": {"content": self._video_renderer((offset + k) % n)}}
+                        for k in range(40)]
+        return {
+            "contents": {"twoColumnBrowseResultsRenderer": {"tabs": [{"tabRenderer": {
+                "content": {"richGridRenderer": {"contents": contents}}
+            }}]}}
+        }
+
+    def next(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        n = self.dataset.n_videos
+        vid = body.get("videoId", "")
+        base = self.index.get(vid, zlib.crc32(vid.encode()) % n)
+        rng = random.Random(base)
+        related = [self._video_renderer(rng.randrange(n), "compactVideoRenderer") for _ in range(20)]
+        return {
+            "contents": {"twoColumnWatchNextResults": {
+                "results": {"results": {"contents": []}},
+                "secondaryResults": {"secondaryResults": {"results": related}},
+            }}
+        }
+
+    # ------------------------------
+    # 라우팅
+    # ------------------------------
+
+    def handle(self, method: str, path: str, params: Dict[str, str],
+               body: Dict[str, Any]) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        routes = {
+            ("GET", "/youtube/v3/search"): ("search", lambda: self.search(params)),
+            ("GET", "/youtube/v3/videos"): ("videos", lambda: self.videos(params)),
+            ("GET", "/youtube/v3/channels"): ("channels", lambda: self.channels(params)),
+            ("GET", "/youtube/v3/playlistItems"): ("playlistItems", lambda: self.playlist_items(params)),
+            ("POST", "/youtubei/v1/browse"): ("browse", lambda: self.browse(body)),
+            ("POST", "/youtubei/v1/next"): ("next", lambda: self.next(body)),
+        }
+        route = routes.get((method, path.rstrip("/")))
+        if route is None:
+            return 404, {}, _error_body(404, "notFound", f"Unknown endpoint: {method} {path}")
+        endpoint, fn = route
+        if not params.get("key"):
+            return 400, {}, _error_body(400, "keyInvalid", "API key missing.")
+        injected = self._inject(endpoint)
+        if injected is not None:
+            return injected
+        return 200, {}, fn()
+
+
+def _make_handler(backend: FakeYouTubeBackend):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, method: str, body: Dict[str, Any]) -> None:
+            parsed = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            status, headers, payload = backend.handle(method, parsed.path, params, body)
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond("GET", {})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = {}
+            self._respond("POST", body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    n_videos: int = 10000,
+    faults: Optional[FaultConfig] = None,
+) -> Tuple[ThreadingHTTPServer, FakeYouTubeBackend]:
+    """
+    백그라운드 스레드에서 서버를 띄운다. port=0 이면 빈 포트 자동 선택.
+    종료는 server.shutdown().
+    """
+    backend = FakeYouTubeBackend(n_videos=n_videos, faults=faults)
+    server = ThreadingHTTPServer((host, port), _make_handler(backend))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, backend
+
+
+def base_urls(server: ThreadingHTTPServer) -> Dict[str, str]:
+    host, port = server.server_address[:2]
+    return {
+        "YOUTUBE_API_BASE": f"http://{host}:{port}/youtube/v3",
+        "INNERTUBE_API_BASE": f"http://{host}:{port}/youtubei/v1",
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 YouTube API fake 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-403", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int)
+    parser.add_argument("--quota", type=int, help="쿼타 한도(units). 없으면 무제한")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_403=args.rate_403, rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after, quota=args.quota, seed=args.seed,
+    )
+    backend = FakeYouTubeBackend(n_videos=args.videos, faults=faults)
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(backend))
+    server.daemon_threads = True
+    for k, v in base_urls(server).items():
+        print(f"export {k}={v}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"quota used: {backend.quota_used}, requests: {backend.request_counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+synthetic_data.py
+
+벤치마크용 합성 raw 데이터셋 생성기 (오프라인 전용).
+
+실제 수집기와 같은 포맷으로
+- raw/trending/{ts}__trending_{region}.json.(zst|gz)
+- raw/search/{ts}__{query}.json.(zst|gz)
+- raw/stats_snapshots/{ts}__snapshot.json.(zst|gz)
+를 만든다. 규모는 영상 수(1k ~ 1M)와 스냅샷 수(1 ~ 1000)로 조절한다.
+
+- 제목 토큰은 Zipf 분포(소수 키워드가 자주 등장)
+- 조회수는 log-normal, 스냅샷마다 성장 + 일부 영상은 스파이크
+- 같은 seed면 항상 같은 데이터셋
+"""
+
+import argparse
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from Sources.Youtube.storage.raw_store import write_raw
+
+CATEGORY_WEIGHTS: Dict[str, float] = {
+    "1": 4, "10": 18, "17": 7, "20": 16, "22": 12, "23": 6,
+    "24": 20, "25": 6, "26": 4, "27": 3, "28": 4,
+}
+
+VOCAB_KO = [
+    "먹방", "브이로그", "리뷰", "하이라이트", "뉴스", "예능", "드라마", "게임",
+    "축구", "야구", "노래", "커버", "댄스", "챌린지", "요리", "여행", "공략",
+    "실황", "라이브", "직캠", "무대", "반응", "꿀팁", "언박싱", "최신", "속보",
+]
+VOCAB_EN = [
+    "live", "highlights", "review", "reaction", "music", "cover", "dance",
+    "challenge", "gameplay", "trailer", "news", "vlog", "tutorial", "top",
+    "best", "funny", "moments", "unboxing", "world", "league", "stream",
+]
+
+SNAPSHOT_INTERVAL = timedelta(hours=1)
+START_TIME = datetime(2025, 1, 1)
+
+
+def _ts(dt: datetime) -> str:
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+class SyntheticDataset:
+
+    def __init__(self, n_videos: int = 1000, seed: int = 42, vocab_size: int = 2000):
+        self.n_videos = n_videos
+        self.rng = random.Random(seed)
+
+        base = VOCAB_KO + VOCAB_EN
+        self.vocab = base + [f"{base[i % len(base)]}{i}" for i in range(max(0, vocab_size - len(base)))]
+        # Zipf 가중치 누적합 (rng.choices cum_weights 용)
+        acc = 0.0
+        self.vocab_cum: List[float] = []
+        for rank in range(1, len(self.vocab) + 1):
+            acc += 1.0 / rank
+            self.vocab_cum.append(acc)
+
+        cats = list(CATEGORY_WEIGHTS)
+        self.video_ids = [f"v{i:010d}" for i in range(n_videos)]
+        self.categories = self.rng.choices(cats, weights=list(CATEGORY_WEIGHTS.values()), k=n_videos)
+        self.base_views = [int(self.rng.lognormvariate(9.0, 2.0)) for _ in range(n_videos)]
+        self.growth = [self.rng.uniform(0.001, 0.05) for _ in range(n_videos)]
+        self.channels = [f"UC{self.rng.randrange(max(1, n_videos // 20)):022d}" for _ in range(n_videos)]
+
+    def _title(self, idx: int) -> str:
+        rng = random.Random(idx)
+        words = rng.choices(self.vocab, cum_weights=self.vocab_cum, k=rng.randint(3, 9))
+        return " ".join(words) + f" #{idx}"
+
+    def _description(self, idx: int) -> str:
+        rng = random.Random(-idx - 1)
+        return " ".join(rng.choices(self.vocab, cum_weights=self.vocab_cum, k=rng.randint(5, 30)))
+
+    def views_at(self, idx: int, step: int) -> int:
+        views = self.base_views[idx] * (1.0 + self.growth[idx]) ** step
+        # 약 1% 영상은 특정 구간에서 스파이크
+        if idx % 97 == step % 97:
+            views *= 1.5
+        return int(views)
+
+    def video_item(self, idx: int, step: int = 0, full: bool = True) -> Dict[str, Any]:
+        views = self.views_at(idx, step)
+        item: Dict[str, Any] = {
+            "kind": "youtube#video",
+            "id": self.video_ids[idx],
+            "statistics": {
+                "viewCount": str(views),
+                "likeCount": str(views // 40),
+                "commentCount": str(views // 900),
+            },
+        }
+        if full:
+            published = START_TIME - timedelta(hours=idx % 720)
+            item["snippet"] = {
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "channelId": self.channels[idx],
+                "channelTitle": f"channel {self.channels[idx][-4:]}",
+                "title": self._title(idx),
+                "description": self._description(idx),
+                "categoryId": self.categories[idx],
+                "thumbnails": {"default": {"url": f"https://i.ytimg.com/vi/{self.video_ids[idx]}/default.jpg"}},
+            }
+            item["contentDetails"] = {"duration": f"PT{1 + idx % 59}M{idx % 60}S"}
+        return item
+
+    # ------------------------------
+    # raw 파일 생성
+    # ------------------------------
+
+    def write_trending(self, out_dir: Path, n_files: int = 1, items_per_file: int = 220,
+                       regions: Optional[List[str]] = None, dedupe: bool = False) -> List[Path]:
+        regions = regions or ["KR"]
+        paths = []
+        k = min(items_per_file, self.n_videos)
+        for step in range(n_files):
+            ts = _ts(START_TIME + step * SNAPSHOT_INTERVAL)
+            for region in regions:
+                picked = sorted(self.rng.sample(range(self.n_videos), k),
+                                key=lambda i: -self.views_at(i, step))
+                items = []
+                for idx in picked:
+                    item = self.video_item(idx, step)
+                    item["__category_id_from_request"] = self.categories[idx]
+                    items.append(item)
+                payload = {"region_code": region, "fetched_at_utc": ts, "items": items}
+                paths.append(write_raw(out_dir, f"{ts}__trending_{region}", payload, dedupe_items=dedupe))
+        return paths
+
+    def write_search(self, out_dir: Path, n_files: int = 10, dedupe: bool = False) -> List[Path]:
+        paths = []
+        per_file = max(1, math.ceil(self.n_videos / max(1, n_files)))
+        for f in range(n_files):
+            lo, hi = f * per_file, min(self.n_videos, (f + 1) * per_file)
+            if lo >= hi:
+                break
+            ts = _ts(START_TIME + f * timedelta(minutes=1))
+            query = self.vocab[f % len(self.vocab)]
+            payload = {
+                "query": query,
+                "max_results": hi - lo,
+                "order": "date",
+                "published_after": None,
+                "region_code": "KR",
+                "fetched_at_utc": ts,
+                "items": [self.video_item(i) for i in range(lo, hi)],
+            }
+            paths.append(write_raw(out_dir, f"{ts}__q{f}", payload, dedupe_items=dedupe))
+        return paths
+
+    def write_snapshots(self, out_dir: Path, n_snapshots: int = 5, dedupe: bool = False) -> List[Path]:
+        paths = []
+        for step in range(n_snapshots):
+            ts = _ts(START_TIME + step * SNAPSHOT_INTERVAL)
+            payload = {
+                "snapshot_time_utc": ts,
+                "items": [self.video_item(i, step, full=False) for i in range(self.n_videos)],
+            }
+            paths.append(write_raw(out_dir, f"{ts}__snapshot", payload, dedupe_items=dedupe))
+        return paths
+
+
+def generate_dataset(
+    root: Path,
+    n_videos: int = 1000,
+    n_snapshots: int = 5,
+    n_trending_files: int = 1,
+    trending_items: int = 220,
+    n_search_files: int = 10,
+    seed: int = 42,
+) -> Dict[str, List[Path]]:
+    """
+    root/raw/{trending,search,stats_snapshots} 아래 합성 데이터셋을 생성한다.
+    """
+    ds = SyntheticDataset(n_videos=n_videos, seed=seed)
+    raw = Path(root) / "raw"
+    return {
+        "trending": ds.write_trending(raw / "trending", n_trending_files, trending_items),
+        "search": ds.write_search(raw / "search", n_search_files),
+        "stats_snapshots": ds.write_snapshots(raw / "stats_snapshots", n_snapshots),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="합성 raw 데이터셋 생성")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--snapshots", type=int, default=5)
+    parser.add_argument("--trending-files", type=int, default=1)
+    parser.add_argument("--trending-items", type=int, default=220)
+    parser.add_argument("--search-files", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    out = generate_dataset(
+        args.root, args.videos, args.snapshots, args.trending_files,
+        args.trending_items, args.search_files, args.seed,
+    )
+    for name, paths in out.items():
+        print(f"{name}: {len(paths)} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
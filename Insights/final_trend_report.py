@@ -1,34 +1,150 @@
 # final_trend_report.py
 import json
+from collections import defaultdict
 from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.catalog import latest_path
 
 HERE = Path(__file__).resolve()
 ROOT = HERE.parents[1]
 TRENDING_TOPICS_DIR = ROOT / "02_Normalized" / "trending_topics"
 TOPIC_SCORES_DIR    = ROOT / "03_Scoring" / "topic_scores"
 REPORT_DIR          = HERE.parent / "final_reports"
-REPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+TOP_TOPICS = 10
 
 def _load_latest_json(dir_path: Path) -> dict:
-    files = sorted(dir_path.glob("*.json"))
-    if not files:
+    latest = latest_path(dir_path)
+    if latest is None:
         raise FileNotFoundError(f"No files in {dir_path}")
-    with files[-1].open("r", encoding="utf-8") as f:
+    with latest.open("r", encoding="utf-8") as f:
         return json.load(f)
 
-def build_final_report():
-    topics_data = _load_latest_json(TRENDING_TOPICS_DIR)
-    scores_data = _load_latest_json(TOPIC_SCORES_DIR)
-    # topics_data["topics"], scores_data["topics"]를 매칭하여
-    # topic_id 혹은 category_id 기준으로 합치기
-    # 필요한 종합 랭킹을 계산 후 리포트를 구성
+def join_topics(topics_data: Dict[str, Any], scores_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    토픽과 토픽 점수를 topic_id 맵으로 합쳐 topic_score 내림차순으로 반환.
+    점수가 없는 토픽은 0점. (topic_id 가 다르면 category_id 로 한 번 더 찾는다)
+    """
+    by_id = {t["topic_id"]: t for t in scores_data.get("topics", [])}
+    by_cat = {t["category_id"]: t for t in scores_data.get("topics", [])}
+    rows: List[Dict[str, Any]] = []
+    for topic in topics_data.get("topics", []):
+        score = by_id.get(topic["topic_id"]) or by_cat.get(topic["category_id"]) or {}
+        rows.append({
+            "topic_id": topic["topic_id"],
+            "category_id": topic["category_id"],
+            "label": topic["label"],
+            "video_count": topic["video_count"],
+            "total_views": topic["total_views"],
+            "top_keywords": topic.get("top_keywords", []),
+            "topic_score": score.get("topic_score", 0.0),
+            "avg_spike_score": score.get("avg_spike_score", 0.0),
+            "total_delta_views": score.get("total_delta_views", 0),
+        })
+    rows.sort(key=lambda r: r["topic_score"], reverse=True)
+    return rows
+
+def _region_section(region: str, fetched_at: str, rows: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"## {region}", "", f"- Fetched at (UTC): **{fetched_at}**", f"- Topics: **{len(rows)}**", ""]
+    lines.append("| # | Topic | Score | Spike avg | Δviews | Videos | Views | Keywords |")
+    lines.append("|---|---|---:|---:|---:|---:|---:|---|")
+    for i, r in enumerate(rows[:TOP_TOPICS], start=1):
+        lines.append(
+            f"| {i} | {r['label']} ({r['category_id']}) | {r['topic_score']:.2f} | "
+            f"{r['avg_spike_score']:.2f} | {r['total_delta_views']} | {r['video_count']} | "
+            f"{r['total_views']} | {', '.join(r['top_keywords'])} |"
+        )
+    lines.append("")
+    return lines
+
+@profiled("build_final_report")
+def build_final_report(
+    topics_data: Optional[Dict[str, Any]] = None,
+    scores_data: Optional[Dict[str, Any]] = None,
+):
+    if topics_data is None:
+        topics_data = _load_latest_json(TRENDING_TOPICS_DIR)
+    if scores_data is None:
+        scores_data = _load_latest_json(TOPIC_SCORES_DIR)
+    rows = join_topics(topics_data, scores_data)
 
     # 최종 리포트 저장
+    region = topics_data.get("region_code", "unknown")
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
     report_path = REPORT_DIR / f"final_report_{topics_data['fetched_at_utc']}.md"
-    with report_path.open("w", encoding="utf-8") as f:
-        # 마크다운 형식으로 작성
-        f.write("# Final Trend Report\n\n")
-        # ... 내용 채우기 ...
+    lines = ["# Final Trend Report", ""]
+    lines += _region_section(region, topics_data["fetched_at_utc"], rows)
+    report_path.write_text("\n".join(lines), encoding="utf-8")
+    return report_path
+
+@profiled("build_multi_region_report", count=len)
+def build_multi_region_report(regions: List[Dict[str, Any]]) -> Path:
+    """
+    regions: [{"topics": 토픽 payload, "scores": 토픽 점수 payload}, ...]
+    전 지역 요약 + 여러 지역에서 동시에 뜨는 카테고리 / 키워드 + 지역별 상세를 한 파일로.
+    """
+    if not regions:
+        raise ValueError("리포트할 지역이 없습니다.")
+    joined = [
+        (r["topics"].get("region_code", "unknown"), r["topics"]["fetched_at_utc"], join_topics(r["topics"], r["scores"]))
+        for r in regions
+    ]
+    joined.sort(key=lambda x: x[0])
+
+    # 카테고리 / 키워드 → 지역 (지역 교차 신호)
+    cat_regions: Dict[str, Dict[str, float]] = defaultdict(dict)
+    cat_labels: Dict[str, str] = {}
+    kw_regions: Dict[str, set] = defaultdict(set)
+    for region, _, rows in joined:
+        for r in rows:
+            cat_regions[r["category_id"]][region] = r["topic_score"]
+            cat_labels[r["category_id"]] = r["label"]
+            for kw in r["top_keywords"]:
+                kw_regions[kw].add(region)
+
+    latest_ts = max(ts for _, ts, _ in joined)
+    lines = ["# Final Trend Report — All Regions", "", f"- Regions: **{len(joined)}**", f"- Latest fetch (UTC): **{latest_ts}**", ""]
+
+    lines.append("## Overview")
+    lines.append("")
+    lines.append("| Region | Fetched at | Topics | Top topic | Score |")
+    lines.append("|---|---|---:|---|---:|")
+    for region, ts, rows in joined:
+        top = rows[0] if rows else None
+        lines.append(
+            f"| {region} | {ts} | {len(rows)} | {top['label'] if top else '-'} | "
+            f"{top['topic_score'] if top else 0:.2f} |"
+        )
+    lines.append("")
+
+    lines.append("## Cross-Region Categories")
+    lines.append("")
+    shared = sorted(
+        ((cid, scores) for cid, scores in cat_regions.items() if len(scores) > 1),
+        key=lambda x: (-len(x[1]), -sum(x[1].values()) / len(x[1])),
+    )
+    for cid, scores in shared[:TOP_TOPICS]:
+        avg = sum(scores.values()) / len(scores)
+        lines.append(f"- **{cat_labels[cid]}** (ID {cid}): {len(scores)} regions, avg score {avg:.2f} "
+                     f"({', '.join(sorted(scores))})")
+    lines.append("")
+
+    lines.append("## Cross-Region Keywords")
+    lines.append("")
+    for kw, regs in sorted(kw_regions.items(), key=lambda x: (-len(x[1]), x[0]))[:20]:
+        if len(regs) < 2:
+            break
+        lines.append(f"- `{kw}` — {', '.join(sorted(regs))}")
+    lines.append("")
+
+    for region, ts, rows in joined:
+        lines += _region_section(region, ts, rows)
+
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = REPORT_DIR / f"final_report_all_{latest_ts}.md"
+    report_path.write_text("\n".join(lines), encoding="utf-8")
     return report_path
 
 if __name__ == "__main__":
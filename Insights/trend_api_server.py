@@ -0,0 +1,373 @@
+"""
+trend_api_server.py
+
+최신 트렌드 결과를 메모리에 올려두고 로컬 HTTP/JSON으로 조회하는 read 서비스.
+
+메모리에 올리는 데이터
+- 최신 topic_scores (score_topics 결과)
+- 최신 video_scores (run_scoring 결과, 영상별 스파이크 점수)
+- 최신 raw/trending (제목/채널/카테고리)
+- 최근 스냅샷 time series (영상별 최근 N개 포인트)
+
+인덱스 (로드 시 한 번 만들고, 조회 시에는 정렬된 리스트를 slice만 함)
+- topic_id → topic, category → topics
+- video_id → video, category → videos(점수 내림차순), keyword → videos(점수 내림차순)
+- keyword → topics
+
+새 산출물이 생기면 백그라운드 스레드가 감지해 인덱스를 새로 만들고 참조를 교체한다.
+(조회 스레드는 교체 전/후 어느 한 쪽의 완성된 인덱스만 본다)
+
+    GET /health
+    GET /topics?category=Gaming&keyword=...&limit=20
+    GET /topics/{topic_id}
+    GET /videos/top?category=Gaming&keyword=...&limit=20
+    GET /videos/{video_id}
+    GET /keywords/{keyword}?limit=20
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+from Sources.Youtube.storage.raw_store import read_raw
+from Sources.Youtube.storage.catalog import latest_path, recent_paths
+from Normalized.video_record import records_from_items
+from Normalized.text_tokens import tokenize
+from Sources.Youtube.storage.metadata_cache import MetadataCache, DEFAULT_CACHE_PATH
+
+import Normalized.trending_topics as trending_topics
+import Scoring.scoring as scoring
+import Scoring.topic_scoring as topic_scoring
+
+logger = logging.getLogger(__name__)
+
+SERIES_POINTS = 12
+SNAPSHOT_LIMIT = 12
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+
+LABEL_TO_CATEGORY: Dict[str, str] = {
+    label.lower(): cid for cid, label in trending_topics.CATEGORY_LABELS.items()
+}
+
+
+def _resolve_category(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return LABEL_TO_CATEGORY.get(value.lower(), value)
+
+
+# ------------------------------
+# 인덱스
+# ------------------------------
+
+class TrendIndex:
+    """
+    한 번 만들어지면 변경하지 않는 읽기 전용 인덱스.
+    """
+
+    def __init__(self):
+        self.loaded_at = time.time()
+        self.sources: Dict[str, Optional[str]] = {}
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self.topics_by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self.topics_by_keyword: Dict[str, List[Dict[str, Any]]] = {}
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self.videos_ranked: List[Dict[str, Any]] = []
+        self.videos_by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self.videos_by_keyword: Dict[str, List[Dict[str, Any]]] = {}
+        self.series: Dict[str, List[Dict[str, Any]]] = {}
+
+    @classmethod
+    def build(cls, paths: Dict[str, Optional[Path]]) -> "TrendIndex":
+        idx = cls()
+        idx.sources = {k: (str(p) if p else None) for k, p in paths.items()}
+
+        # 1) 트렌딩 raw → 영상 메타 (제목/채널/카테고리)
+        meta: Dict[str, Dict[str, Any]] = {}
+        if paths.get("trending"):
+            data = read_raw(paths["trending"])
+            for rec in records_from_items(data.get("items", [])):
+                if rec.video_id is None:
+                    continue
+                meta[rec.video_id] = {
+                    "title": rec.title,
+                    "channel": rec.channel_title,
+                    "category_id": rec.category_id,
+                    "region_code": data.get("region_code"),
+                }
+
+        # 2) 토픽 (video → topic 매핑 포함)
+        video_topic: Dict[str, str] = {}
+        if paths.get("topics"):
+            with paths["topics"].open("r", encoding="utf-8") as f:
+                for t in json.load(f).get("topics", []):
+                    for vid in t.get("video_ids", []):
+                        video_topic[vid] = t["topic_id"]
+
+        if paths.get("topic_scores"):
+            with paths["topic_scores"].open("r", encoding="utf-8") as f:
+                scored = json.load(f).get("topics", [])
+            by_cat: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            by_kw: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for t in scored:  # 이미 topic_score 내림차순
+                idx.topics[t["topic_id"]] = t
+                by_cat[t["category_id"]].append(t)
+                for kw in t.get("top_keywords", []):
+                    by_kw[kw].append(t)
+            idx.topics_by_category = dict(by_cat)
+            idx.topics_by_keyword = dict(by_kw)
+
+        # 3) 영상 점수
+        scores: Dict[str, Dict[str, Any]] = {}
+        if paths.get("video_scores"):
+            with paths["video_scores"].open("r", encoding="utf-8") as f:
+                scores = json.load(f).get("videos", {})
+
+        # 트렌딩에 없는 점수 영상은 metadata cache에서 제목/카테고리 보충
+        unknown = [vid for vid in scores if vid not in meta]
+        if unknown and DEFAULT_CACHE_PATH.exists():
+            with MetadataCache() as cache:
+                for vid, m in cache.lookup(unknown).items():
+                    meta[vid] = {
+                        "title": m["title"],
+                        "channel": m["channel_title"],
+                        "category_id": m["category_id"],
+                        "region_code": None,
+                    }
+
+        for vid in set(scores) | set(meta):
+            s = scores.get(vid, {})
+            m = meta.get(vid, {})
+            idx.videos[vid] = {
+                "video_id": vid,
+                "title": m.get("title"),
+                "channel": m.get("channel"),
+                "category_id": m.get("category_id"),
+                "region_code": m.get("region_code"),
+                "topic_id": video_topic.get(vid),
+                "score": s.get("score"),
+                "delta_views": s.get("delta_views"),
+                "current_views": s.get("current_views"),
+            }
+
+        ranked = sorted(
+            idx.videos.values(),
+            key=lambda v: (v["score"] is not None, v["score"] or 0.0, v["delta_views"] or 0),
+            reverse=True,
+        )
+        idx.videos_ranked = ranked
+        by_cat_v: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        by_kw_v: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for v in ranked:  # 정렬 순서 유지한 채 분배
+            if v["category_id"]:
+                by_cat_v[v["category_id"]].append(v)
+            if v["title"]:
+                for kw in set(tokenize(v["title"])):
+                    by_kw_v[kw].append(v)
+        idx.videos_by_category = dict(by_cat_v)
+        idx.videos_by_keyword = dict(by_kw_v)
+
+        # 4) 최근 time series
+        snaps = []
+        for p in paths.get("snapshots") or []:
+            try:
+                snaps.append(read_raw(p))
+            except Exception as e:
+                logger.warning("스냅샷 로드 실패 %s: %s", p, e)
+        for vid, rows in scoring.build_time_series(snaps).items():
+            idx.series[vid] = [p._asdict() for p in rows[-SERIES_POINTS:]]
+
+        return idx
+
+
+class TrendStore:
+    """
+    최신 산출물 경로를 감시하다가 바뀌면 인덱스를 새로 만들어 교체한다.
+    """
+
+    def __init__(self, reload_interval: float = 10.0):
+        self.reload_interval = reload_interval
+        self.index = TrendIndex()
+        self._signature: Optional[Tuple] = None
+        self._stop = threading.Event()
+
+    def _current_paths(self) -> Dict[str, Any]:
+        return {
+            "trending": latest_path(trending_topics.TRENDING_RAW_DIR),
+            "topics": latest_path(trending_topics.TOPICS_DIR),
+            "topic_scores": latest_path(topic_scoring.TOPIC_SCORE_DIR),
+            "video_scores": latest_path(scoring.VIDEO_SCORE_DIR),
+            "snapshots": recent_paths(scoring.SNAPSHOT_DIR, SNAPSHOT_LIMIT),
+        }
+
+    @staticmethod
+    def _signature_of(paths: Dict[str, Any]) -> Tuple:
+        sig = []
+        for key in sorted(paths):
+            value = paths[key]
+            items = value if isinstance(value, list) else [value]
+            for p in items:
+                if p is None:
+                    sig.append((key, None))
+                else:
+                    st = p.stat()
+                    sig.append((key, p.name, st.st_size, st.st_mtime_ns))
+        return tuple(sig)
+
+    def reload_if_changed(self) -> bool:
+        paths = self._current_paths()
+        try:
+            sig = self._signature_of(paths)
+        except FileNotFoundError:
+            return False
+        if sig == self._signature:
+            return False
+        t0 = time.perf_counter()
+        new_index = TrendIndex.build(paths)
+        self.index = new_index  # 참조 교체는 원자적
+        self._signature = sig
+        logger.info("인덱스 재로드: videos=%d topics=%d (%.1f ms)",
+                    len(new_index.videos), len(new_index.topics), (time.perf_counter() - t0) * 1000)
+        return True
+
+    def start_watcher(self) -> threading.Thread:
+
+        def loop():
+            while not self._stop.wait(self.reload_interval):
+                try:
+                    self.reload_if_changed()
+                except Exception:
+                    logger.exception("인덱스 재로드 실패")
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+# ------------------------------
+# 조회
+# ------------------------------
+
+def _limit(params: Dict[str, str]) -> int:
+    try:
+        return max(1, min(int(params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT))
+    except ValueError:
+        return DEFAULT_LIMIT
+
+
+def query(index: TrendIndex, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+    parts = [unquote(p) for p in path.strip("/").split("/") if p]
+    limit = _limit(params)
+    category = _resolve_category(params.get("category"))
+    keyword = (params.get("keyword") or "").lower() or None
+
+    if parts == ["health"]:
+        return 200, {
+            "loaded_at": index.loaded_at,
+            "videos": len(index.videos),
+            "topics": len(index.topics),
+            "sources": index.sources,
+        }
+
+    if parts == ["topics"]:
+        if keyword:
+            rows = index.topics_by_keyword.get(keyword, [])
+            if category:
+                rows = [t for t in rows if t["category_id"] == category]
+        elif category:
+            rows = index.topics_by_category.get(category, [])
+        else:
+            rows = list(index.topics.values())
+        return 200, {"topics": rows[:limit]}
+
+    if len(parts) == 2 and parts[0] == "topics":
+        topic = index.topics.get(parts[1])
+        return (200, topic) if topic else (404, {"error": "topic not found"})
+
+    if parts == ["videos", "top"]:
+        if keyword:
+            rows = index.videos_by_keyword.get(keyword, [])
+            if category:
+                rows = [v for v in rows if v["category_id"] == category]
+        elif category:
+            rows = index.videos_by_category.get(category, [])
+        else:
+            rows = index.videos_ranked
+        return 200, {"videos": rows[:limit]}
+
+    if len(parts) == 2 and parts[0] == "videos":
+        video = index.videos.get(parts[1])
+        if video is None and parts[1] not in index.series:
+            return 404, {"error": "video not found"}
+        return 200, {**(video or {"video_id": parts[1]}), "series": index.series.get(parts[1], [])}
+
+    if len(parts) == 2 and parts[0] == "keywords":
+        kw = parts[1].lower()
+        return 200, {
+            "keyword": kw,
+            "topics": index.topics_by_keyword.get(kw, [])[:limit],
+            "videos": index.videos_by_keyword.get(kw, [])[:limit],
+        }
+
+    return 404, {"error": f"unknown path: {path}"}
+
+
+def make_server(store: TrendStore, host: str = "127.0.0.1", port: int = 8780) -> ThreadingHTTPServer:
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            status, body = query(store.index, parsed.path, params)
+            data = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="트렌드 결과 read API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--reload-interval", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    store = TrendStore(reload_interval=args.reload_interval)
+    store.reload_if_changed()
+    store.start_watcher()
+    server = make_server(store, args.host, args.port)
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
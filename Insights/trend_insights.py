@@ -5,19 +5,37 @@ raw/trending/*.json 을 읽어
 - 카테고리별 비중 및 조회수 합계
 - 주요 키워드 빈도
 를 계산하고 간단한 리포트를 작성한다.
+
+최신 파일 하나 대신 "최근 24h / 7d" 구간 리포트도 만들 수 있다.
+트렌딩 파일마다 요약(카테고리 수, 조회수 합, 키워드 빈도)을 처음 볼 때 한 번만 계산해
+summaries/ 에 저장해두고, 구간 리포트는 요약들을 합치기만 한다.
 """
 
+import argparse
+import hashlib
 import json
+import os
+import sys
 from collections import Counter, defaultdict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw, raw_stem
+from Sources.Youtube.storage.catalog import latest_path, paths_between, stem_timestamp
+from Normalized.video_record import VideoRecord, records_from_items
+import Normalized.video_record as video_record
+from Normalized.text_tokens import tokenize
+import Normalized.text_tokens as text_tokens
 
 HERE = Path(__file__).resolve()
 PROJECT_ROOT = HERE.parents[1]  # .../04_Insights
 YOUTUBE_ROOT = PROJECT_ROOT.parents[1] / "01_Sources" / "YouTube"
 TRENDING_DIR = YOUTUBE_ROOT / "raw" / "trending"
 REPORT_DIR = PROJECT_ROOT
-REPORT_DIR.mkdir(parents=True, exist_ok=True)
+SUMMARY_DIR = HERE.parent / "summaries"
+TS_FORMAT = "%Y%m%dT%H%M%SZ"
 
 CATEGORY_LABELS: Dict[str, str] = {
     "1": "Film & Animation",
@@ -34,48 +52,67 @@ CATEGORY_LABELS: Dict[str, str] = {
     "31": "Anime/Animation",
 }
 
-STOPWORDS = {
-    "the","a","an","and","or","of","to","in","on",
-    "이","그","저","것","오늘","영상","쇼츠","shorts",
-    "video","official","mv","edit","full","episode",
-}
-
 def _load_latest_trending() -> Dict[str, Any]:
-    files = sorted(TRENDING_DIR.glob("*.json"))
-    if not files:
+    latest = latest_path(TRENDING_DIR)
+    if latest is None:
         raise FileNotFoundError(f"트렌딩 파일이 없습니다: {TRENDING_DIR}")
-    latest = files[-1]
-    with latest.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data
-
-def _tokenize(text: str) -> List[str]:
-    import re
-    text = text.lower()
-    text = re.sub(r"[^0-9a-z가-힣]+", " ", text)
-    tokens = [t for t in text.split() if len(t) > 1 and t not in STOPWORDS]
-    return tokens
-
-def build_insights() -> Dict[str, Any]:
-    data = _load_latest_trending()
-    items = data.get("items", [])
-
-    cat_counts = Counter()
-    cat_views = defaultdict(int)
-    keyword_counts = Counter()
-
-    for item in items:
-        snippet = item.get("snippet", {})
-        stats = item.get("statistics", {})
-        cat_id = snippet.get("categoryId") or item.get("__category_id_from_request") or "unknown"
-        views = int(stats.get("viewCount", 0))
-        cat_counts[cat_id] += 1
-        cat_views[cat_id] += views
-
-        title = snippet.get("title", "") or ""
-        desc = snippet.get("description", "") or ""
-        tokens = _tokenize(title + " " + desc)
-        keyword_counts.update(tokens)
+    return read_raw(latest)
+
+@profiled("build_insights", count=lambda ins: ins["total_items"])
+def build_insights(data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if data is None:
+        data = _load_latest_trending()
+    state = accumulate_insights(records_from_items(data.get("items", [])))
+    return finalize_insights(state, data.get("region_code"), data.get("fetched_at_utc"))
+
+# ------------------------------
+# 집계 단계 (Pipeline.aggregate 의 map / reduce 에서도 사용)
+# ------------------------------
+
+def new_insight_state() -> Dict[str, Any]:
+    return {
+        "cat_counts": Counter(),
+        "cat_views": defaultdict(int),
+        "keywords": Counter(),
+        "total_items": 0,
+    }
+
+def accumulate_insights(
+    records: List[VideoRecord],
+    state: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    if state is None:
+        state = new_insight_state()
+    cat_counts = state["cat_counts"]
+    cat_views = state["cat_views"]
+    keyword_counts = state["keywords"]
+
+    for rec in records:
+        cat_counts[rec.category_id] += 1
+        cat_views[rec.category_id] += rec.views
+        keyword_counts.update(tokenize(rec.text))
+    state["total_items"] += len(records)
+    return state
+
+def merge_insight_states(into: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Counter.update는 새 key를 뒤에 붙이므로, shard 순서대로 합치면 직렬 결과와 같다.
+    """
+    into["cat_counts"].update(other["cat_counts"])
+    for cid, views in other["cat_views"].items():
+        into["cat_views"][cid] += views
+    into["keywords"].update(other["keywords"])
+    into["total_items"] += other["total_items"]
+    return into
+
+def finalize_insights(
+    state: Dict[str, Any],
+    region_code: Optional[str],
+    fetched_at: Optional[str],
+) -> Dict[str, Any]:
+    cat_counts = state["cat_counts"]
+    cat_views = state["cat_views"]
+    keyword_counts = state["keywords"]
 
     top_cats = [
         {
@@ -89,22 +126,139 @@ def build_insights() -> Dict[str, Any]:
     top_keywords = keyword_counts.most_common(30)
 
     return {
-        "region_code": data.get("region_code"),
-        "fetched_at_utc": data.get("fetched_at_utc"),
+        "region_code": region_code,
+        "fetched_at_utc": fetched_at,
         "top_categories": top_cats,
         "top_keywords": top_keywords,
-        "total_items": len(items),
+        "total_items": state["total_items"],
+    }
+
+# ------------------------------
+# 파일별 요약 캐시 / 구간 리포트
+# ------------------------------
+
+def _fingerprint(path: Path) -> List[Any]:
+    st = path.stat()
+    return [path.name, st.st_size, st.st_mtime_ns]
+
+def _summary_path(path: Path) -> Path:
+    return SUMMARY_DIR / f"{raw_stem(path)}.json"
+
+# 요약을 만드는 코드(레코드 변환 / 토큰화 / accumulate_insights)의 소스 해시.
+# 원본 fingerprint 만 보면 로직이 바뀌어도 옛 요약이 구간 리포트에 섞인다.
+_SUMMARY_SOURCES = [Path(__file__), Path(video_record.__file__), Path(text_tokens.__file__)]
+_SUMMARY_CODE: Optional[str] = None
+
+def _summary_code_hash() -> str:
+    global _SUMMARY_CODE
+    if _SUMMARY_CODE is None:
+        h = hashlib.blake2b(digest_size=8)
+        for src in _SUMMARY_SOURCES:
+            h.update(src.read_bytes())
+        _SUMMARY_CODE = h.hexdigest()
+    return _SUMMARY_CODE
+
+def _state_to_json(state: Dict[str, Any]) -> Dict[str, Any]:
+    # dict 순서(첫 등장 순서)를 그대로 저장해 합친 뒤 동률 순서도 직렬과 같게 유지
+    return {
+        "cat_counts": dict(state["cat_counts"]),
+        "cat_views": dict(state["cat_views"]),
+        "keywords": dict(state["keywords"]),
+        "total_items": state["total_items"],
     }
 
+def _state_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "cat_counts": Counter(data["cat_counts"]),
+        "cat_views": defaultdict(int, data["cat_views"]),
+        "keywords": Counter(data["keywords"]),
+        "total_items": data["total_items"],
+    }
+
+@profiled("summary_for")
+def summary_for(path: Path, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    트렌딩 파일 하나의 insight 부분 상태. 캐시가 있고 원본과 요약 코드가 그대로면
+    파일을 다시 읽지 않는다.
+    data(이미 로드한 payload)를 주면 새로 계산할 때 그대로 쓴다.
+    """
+    path = Path(path)
+    fingerprint = _fingerprint(path)
+    code = _summary_code_hash()
+    cache_path = _summary_path(path)
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("source") == fingerprint and cached.get("code") == code:
+            return _state_from_json(cached["state"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if data is None:
+        data = read_raw(path)
+    state = accumulate_insights(records_from_items(data.get("items", [])))
+    SUMMARY_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump({
+            "source": fingerprint,
+            "code": code,
+            "region_code": data.get("region_code"),
+            "fetched_at_utc": data.get("fetched_at_utc"),
+            "state": _state_to_json(state),
+        }, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, cache_path)
+    return state
+
+WINDOWS: Dict[str, timedelta] = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+
+@profiled("build_window_insights", count=lambda ins: ins["file_count"])
+def build_window_insights(
+    window: str = "24h",
+    end: Optional[str] = None,
+    region: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    end(기본: 최신 트렌딩 파일 시각)까지 window 구간의 트렌딩 파일 요약을 시간순으로 합친다.
+    """
+    if end is None:
+        latest = latest_path(TRENDING_DIR, region)
+        if latest is None:
+            raise FileNotFoundError(f"트렌딩 파일이 없습니다: {TRENDING_DIR}")
+        end = stem_timestamp(latest)
+    start_dt = datetime.strptime(end, TS_FORMAT) - WINDOWS[window]
+    # start는 구간에서 제외 (정확히 24h 전 파일은 이전 구간)
+    start = (start_dt + timedelta(seconds=1)).strftime(TS_FORMAT)
+
+    paths = paths_between(TRENDING_DIR, start, end, region)
+    state = new_insight_state()
+    for path in paths:
+        merge_insight_states(state, summary_for(path))
+
+    insights = finalize_insights(state, region or "ALL", f"{start}-{end}")
+    insights["window"] = window
+    insights["file_count"] = len(paths)
+    return insights
+
+@profiled("save_markdown_report")
 def save_markdown_report(insights: Dict[str, Any]) -> Path:
     ts = insights.get("fetched_at_utc", "unknown")
     region = insights.get("region_code", "unknown")
-    filename = f"trend_report_{region}_{ts}.md"
+    window = insights.get("window")
+    filename = f"trend_report_{region}_{window + '_' if window else ''}{ts}.md"
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
     out_path = REPORT_DIR / filename
     lines: List[str] = []
     lines.append(f"# YouTube Trending Report — {region}")
     lines.append("")
-    lines.append(f"- Fetched at (UTC): **{ts}**")
+    if window:
+        lines.append(f"- Window: **{window}** ({insights.get('file_count', 0)} files)")
+        lines.append(f"- Range (UTC): **{ts}**")
+    else:
+        lines.append(f"- Fetched at (UTC): **{ts}**")
     lines.append(f"- Total items: **{insights.get('total_items', 0)}**")
     lines.append("")
     lines.append("## Top Categories")
@@ -117,10 +271,29 @@ def save_markdown_report(insights: Dict[str, Any]) -> Path:
     lines.append("## Top Keywords")
     for word, cnt in insights["top_keywords"][:20]:
         lines.append(f"- `{word}` — {cnt}")
+    if insights.get("hot_keywords"):
+        # keyword_sketch: 반감기 감쇠 빈도 (최근 수집일수록 가중)
+        lines.append("")
+        lines.append("## Hot Keywords (time-decayed)")
+        for row in insights["hot_keywords"][:20]:
+            lines.append(f"- `{row['keyword']}` — {row['count']:.1f}")
     out_path.write_text("\n".join(lines), encoding="utf-8")
     return out_path
 
-if __name__ == "__main__":
-    ins = build_insights()
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="트렌딩 인사이트 리포트")
+    parser.add_argument("--window", choices=["latest"] + list(WINDOWS), default="latest")
+    parser.add_argument("--region")
+    args = parser.parse_args(argv)
+
+    if args.window == "latest":
+        ins = build_insights()
+    else:
+        ins = build_window_insights(args.window, region=args.region)
     path = save_markdown_report(ins)
     print(f"saved report: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
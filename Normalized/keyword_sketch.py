@@ -0,0 +1,353 @@
+"""
+keyword_sketch.py
+
+고정 메모리 "지금 뜨는 키워드" 추적기. (Space-Saving + 시간 감쇠)
+
+trending_topics / trend_insights 는 모든 토큰을 정확한 Counter로 세므로
+트렌딩·검색·피드 제목이 계속 들어오면 어휘 수만큼 메모리가 늘어난다.
+
+- SpaceSaving(capacity) : 키워드 capacity 개만 유지. 꽉 차면 가장 작은 카운터를
+  새 키워드에 넘겨주고(count = min + w, error = min) 상위 K 를 보장한다.
+- 시간 감쇠 : forward decay. 시각 t 의 관측은 weight·2^((t - landmark)/half_life) 로 더하고
+  조회 시 2^(-(now - landmark)/half_life) 를 곱한다. 기존 카운터를 매번 줄이지 않아도
+  반감기(half_life_hours) 기준 "최근" 빈도가 된다. 지수가 커지면 landmark 를 옮겨 재정규화.
+- KeywordTracker : (region, category) 별 SpaceSaving. category "*" 는 지역 전체.
+- merge() : 다른 worker의 sketch를 합친다. (mergeable summary, 한쪽에 없는 키는 그쪽 min 으로 추정)
+
+상태는 Normalized/keyword_sketch.json 하나에 저장하고,
+update_from_catalog() 는 마지막 반영 시각 이후의 트렌딩 파일만 반영한다.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw
+from Sources.Youtube.storage.catalog import latest_paths_by_region, paths_between, stem_timestamp
+from Normalized.video_record import VideoRecord, records_from_items
+from Normalized.text_tokens import tokenize as _tokenize
+
+HERE = Path(__file__).resolve()
+DEFAULT_SKETCH_PATH = HERE.parent / "keyword_sketch.json"
+
+TIME_FORMAT = "%Y%m%dT%H%M%SZ"
+ALL_CATEGORIES = "*"
+# 2^RENORMALIZE_EXP 를 넘기 전에 landmark 를 옮긴다 (float 오버플로 방지)
+RENORMALIZE_EXP = 512
+
+
+def ts_to_hours(ts: str) -> float:
+    return datetime.strptime(ts, TIME_FORMAT).timestamp() / 3600.0
+
+
+class SpaceSaving:
+
+    def __init__(self, capacity: int = 500, half_life_hours: float = 24.0, landmark: float = 0.0):
+        self.capacity = capacity
+        self.half_life_hours = half_life_hours
+        self.landmark = landmark
+        self.counts: Dict[str, float] = {}
+        self.errors: Dict[str, float] = {}
+        # (count, key) lazy min-heap. 갱신된 카운터는 새 항목을 넣고 오래된 항목은 pop 할 때 버린다
+        self._heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    # ------------------------------
+    # 감쇠
+    # ------------------------------
+
+    def _scale(self, t: float) -> float:
+        return 2.0 ** ((t - self.landmark) / self.half_life_hours)
+
+    def _move_landmark(self, landmark: float) -> None:
+        factor = 2.0 ** ((self.landmark - landmark) / self.half_life_hours)
+        self.counts = {k: c * factor for k, c in self.counts.items()}
+        self.errors = {k: e * factor for k, e in self.errors.items()}
+        self.landmark = landmark
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(c, k) for k, c in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    # ------------------------------
+    # 갱신
+    # ------------------------------
+
+    def _pop_min(self) -> Tuple[float, str]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+    def min_count(self) -> float:
+        """
+        가득 찼을 때 가장 작은 카운터 (추적 안 되는 키의 상한). 여유가 있으면 0.
+        """
+        if len(self.counts) < self.capacity:
+            return 0.0
+        while self._heap:
+            count, key = self._heap[0]
+            if self.counts.get(key) == count:
+                return count
+            heapq.heappop(self._heap)
+        return 0.0
+
+    def add(self, key: str, t: float, weight: float = 1.0) -> None:
+        if (t - self.landmark) / self.half_life_hours > RENORMALIZE_EXP:
+            self._move_landmark(t)
+        w = weight * self._scale(t)
+
+        if key in self.counts:
+            count = self.counts[key] + w
+        elif len(self.counts) < self.capacity:
+            count = w
+            self.errors[key] = 0.0
+        else:
+            floor, evicted = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            count = floor + w
+            self.errors[key] = floor
+        self.counts[key] = count
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        other 를 합친다. 한쪽에만 있는 키는 다른 쪽 min_count 를 더해 상한으로 잡고,
+        합친 뒤 큰 순서로 capacity 개만 남긴다.
+        """
+        landmark = max(self.landmark, other.landmark)
+        if self.landmark != landmark:
+            self._move_landmark(landmark)
+        if other.landmark != landmark:
+            other = other.copy()
+            other._move_landmark(landmark)
+
+        mine_min, other_min = self.min_count(), other.min_count()
+        counts: Dict[str, float] = {}
+        errors: Dict[str, float] = {}
+        for key in set(self.counts) | set(other.counts):
+            c1 = self.counts.get(key)
+            c2 = other.counts.get(key)
+            counts[key] = (c1 if c1 is not None else mine_min) + (c2 if c2 is not None else other_min)
+            errors[key] = (
+                (self.errors[key] if c1 is not None else mine_min)
+                + (other.errors[key] if c2 is not None else other_min)
+            )
+        keep = heapq.nlargest(self.capacity, counts, key=lambda k: (counts[k], k))
+        self.counts = {k: counts[k] for k in keep}
+        self.errors = {k: errors[k] for k in keep}
+        self._rebuild_heap()
+        return self
+
+    def copy(self) -> "SpaceSaving":
+        return SpaceSaving.from_dict(self.to_dict())
+
+    # ------------------------------
+    # 조회 / 직렬화
+    # ------------------------------
+
+    def top(self, k: int = 20, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        now(시간 단위) 기준 감쇠 카운트 상위 k. guaranteed = count - error (하한)
+        """
+        decay = 1.0 / self._scale(now) if now is not None else 1.0
+        keys = heapq.nlargest(k, self.counts, key=lambda key: (self.counts[key], key))
+        return [
+            {
+                "keyword": key,
+                "count": round(self.counts[key] * decay, 4),
+                "guaranteed": round((self.counts[key] - self.errors[key]) * decay, 4),
+            }
+            for key in keys
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "half_life_hours": self.half_life_hours,
+            "landmark": self.landmark,
+            "counters": [[k, self.counts[k], self.errors[k]] for k in self.counts],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data["capacity"], data["half_life_hours"], data["landmark"])
+        for key, count, error in data["counters"]:
+            sketch.counts[key] = count
+            sketch.errors[key] = error
+        sketch._rebuild_heap()
+        return sketch
+
+
+class KeywordTracker:
+    """
+    (region, category) 별 SpaceSaving 묶음. 메모리는 region × category × capacity 로 고정.
+    """
+
+    def __init__(self, capacity: int = 500, half_life_hours: float = 24.0):
+        self.capacity = capacity
+        self.half_life_hours = half_life_hours
+        self.sketches: Dict[str, SpaceSaving] = {}
+        self.last_ts: Dict[str, str] = {}  # region → 마지막으로 반영한 파일 ts
+
+    @staticmethod
+    def _key(region: str, category: str) -> str:
+        return f"{region}/{category}"
+
+    def _sketch(self, region: str, category: str) -> SpaceSaving:
+        key = self._key(region, category)
+        if key not in self.sketches:
+            self.sketches[key] = SpaceSaving(self.capacity, self.half_life_hours)
+        return self.sketches[key]
+
+    def observe(self, records: Iterable[VideoRecord], region: str, ts: str) -> int:
+        """
+        records 의 제목 + 설명 토큰을 ts 시각으로 반영한다. 반영한 토큰 수를 반환.
+        """
+        t = ts_to_hours(ts)
+        region_all = self._sketch(region, ALL_CATEGORIES)
+        n = 0
+        for rec in records:
+            per_cat = self._sketch(region, rec.category_id)
+            for token in _tokenize(rec.text):
+                per_cat.add(token, t)
+                region_all.add(token, t)
+                n += 1
+        if ts > self.last_ts.get(region, ""):
+            self.last_ts[region] = ts
+        return n
+
+    def top(
+        self,
+        region: str,
+        category: Optional[str] = None,
+        k: int = 20,
+        now: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        now(ts) 기준 감쇠 빈도 상위 k. now 가 없으면 그 지역의 마지막 반영 시각.
+        """
+        sketch = self.sketches.get(self._key(region, category or ALL_CATEGORIES))
+        if sketch is None:
+            return []
+        now = now or self.last_ts.get(region)
+        return sketch.top(k, ts_to_hours(now) if now else None)
+
+    def merge(self, other: "KeywordTracker") -> "KeywordTracker":
+        for key, sketch in other.sketches.items():
+            if key in self.sketches:
+                self.sketches[key].merge(sketch)
+            else:
+                self.sketches[key] = sketch.copy()
+        for region, ts in other.last_ts.items():
+            if ts > self.last_ts.get(region, ""):
+                self.last_ts[region] = ts
+        return self
+
+    # ------------------------------
+    # 저장 / 증분 갱신
+    # ------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "half_life_hours": self.half_life_hours,
+            "last_ts": self.last_ts,
+            "sketches": {k: s.to_dict() for k, s in self.sketches.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KeywordTracker":
+        tracker = cls(data["capacity"], data["half_life_hours"])
+        tracker.last_ts = dict(data.get("last_ts", {}))
+        tracker.sketches = {k: SpaceSaving.from_dict(s) for k, s in data.get("sketches", {}).items()}
+        return tracker
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_SKETCH_PATH, **kwargs: Any) -> "KeywordTracker":
+        try:
+            with Path(path).open("r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return cls(**kwargs)
+
+    def save(self, path: Path = DEFAULT_SKETCH_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def observe_file(self, path: Path, data: Optional[Dict[str, Any]] = None) -> int:
+        if data is None:
+            data = read_raw(path)
+        region = data.get("region_code") or "unknown"
+        ts = data.get("fetched_at_utc") or stem_timestamp(Path(path))
+        return self.observe(records_from_items(data.get("items", [])), region, ts)
+
+    def _catalog_start(self, trending_dir: Path) -> Optional[str]:
+        """
+        catalog 조회 시작 시각. region 별 마지막 반영 시각 중 가장 이른 시각부터 읽되,
+        아직 반영한 적 없는 지역이 catalog 에 있으면 처음부터. (RankTrajectoryIndex 와 같은 규칙)
+        """
+        if not self.last_ts:
+            return None
+        regions = list(latest_paths_by_region(trending_dir))
+        if any(r not in self.last_ts for r in regions):
+            return None
+        return min(self.last_ts[r] for r in regions) if regions else min(self.last_ts.values())
+
+    @profiled("keyword_sketch_update", count=lambda n: n)
+    def update_from_catalog(self, trending_dir: Path) -> int:
+        """
+        지역별 마지막 반영 시각보다 새로운 트렌딩 파일만 반영한다. 반영한 파일 수를 반환.
+        """
+        start = self._catalog_start(trending_dir)
+        added = 0
+        for path in paths_between(trending_dir, start, None):
+            data = read_raw(path)
+            region = data.get("region_code") or "unknown"
+            ts = data.get("fetched_at_utc") or stem_timestamp(path)
+            if ts <= self.last_ts.get(region, ""):
+                continue
+            self.observe(records_from_items(data.get("items", [])), region, ts)
+            added += 1
+        return added
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import Normalized.trending_topics as trending_topics
+
+    parser = argparse.ArgumentParser(description="시간 감쇠 키워드 sketch")
+    parser.add_argument("command", choices=["update", "top"])
+    parser.add_argument("--region", default="KR")
+    parser.add_argument("--category")
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    tracker = KeywordTracker.load()
+    if args.command == "update":
+        added = tracker.update_from_catalog(trending_topics.TRENDING_RAW_DIR)
+        tracker.save()
+        print(f"observed {added} files")
+    else:
+        for row in tracker.top(args.region, args.category, args.k):
+            print(f"{row['count']:10.2f} (≥{row['guaranteed']:.2f}) {row['keyword']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+rank_trajectory.py
+
+트렌딩 수집 간 순위 궤적 인덱스. (SQLite, 증분 갱신)
+
+collect_trending 결과는 카테고리별 mostPopular 목록을 이어 붙인 평면 리스트라
+영상이 수집 사이에 몇 위에서 몇 위로 움직였는지, 얼마나 오래 트렌딩에 머물렀는지 알 수 없다.
+새 트렌딩 파일이 들어올 때마다 ingest 해서 다음을 유지한다.
+
+- ranks   : (region, category, video_id, ts) → rank, views
+- current : (region, category) 별 현재 트렌딩 목록 + 직전 순위, 진입 시각
+- events  : enter / exit 이벤트
+
+조회
+- fastest_climbers(region, since=None) : 순위 상승폭 순 (since 없으면 직전 수집 대비)
+- new_entrants(region, since)          : since 이후 진입한 영상
+- trajectory(video_id, region)         : 순위/조회수 시계열
+
+raw/trending 전체를 다시 읽지 않도록, update_from_catalog()는
+catalog에서 마지막으로 반영한 시각 이후의 파일만 가져온다.
+(region 을 주지 않으면 region 별 마지막 시각 중 가장 이른 시각부터)
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw, raw_stem
+from Sources.Youtube.storage.catalog import paths_between, latest_paths_by_region
+from Normalized.video_record import records_from_items
+
+HERE = Path(__file__).resolve()
+DEFAULT_INDEX_PATH = HERE.parent / "rank_index.sqlite3"
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ranks (
+    region TEXT NOT NULL, category TEXT NOT NULL, video_id TEXT NOT NULL, ts TEXT NOT NULL,
+    rank INTEGER NOT NULL, views INTEGER NOT NULL,
+    PRIMARY KEY (region, category, video_id, ts)
+);
+CREATE INDEX IF NOT EXISTS idx_ranks_video ON ranks(video_id, ts);
+CREATE INDEX IF NOT EXISTS idx_ranks_region_ts ON ranks(region, ts);
+
+CREATE TABLE IF NOT EXISTS current (
+    region TEXT NOT NULL, category TEXT NOT NULL, video_id TEXT NOT NULL,
+    rank INTEGER NOT NULL, prev_rank INTEGER, views INTEGER NOT NULL,
+    ts TEXT NOT NULL, entered_at TEXT NOT NULL,
+    PRIMARY KEY (region, category, video_id)
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    region TEXT NOT NULL, category TEXT NOT NULL, video_id TEXT NOT NULL,
+    ts TEXT NOT NULL, kind TEXT NOT NULL, rank INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_events_region_ts ON events(region, ts, kind);
+
+CREATE TABLE IF NOT EXISTS ingested (
+    file TEXT PRIMARY KEY, region TEXT NOT NULL, ts TEXT NOT NULL
+);
+"""
+
+
+class RankTrajectoryIndex:
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "RankTrajectoryIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------
+    # 갱신
+    # ------------------------------
+
+    def last_ts(self, region: Optional[str] = None) -> Optional[str]:
+        sql = "SELECT MAX(ts) FROM ingested" + (" WHERE region = ?" if region else "")
+        with self._lock:
+            (ts,) = self._conn.execute(sql, (region,) if region else ()).fetchone()
+        return ts
+
+    @profiled("rank_index_ingest")
+    def ingest(self, path: Path, data: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        트렌딩 파일 하나를 반영한다. 이미 반영한 파일이면 False.
+        같은 region에서 더 최신 파일이 이미 반영돼 있으면 순위 기록만 남기고
+        current / events 는 건드리지 않는다. (늦게 도착한 파일)
+        """
+        path = Path(path)
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM ingested WHERE file = ?", (path.name,)).fetchone():
+                return False
+        if data is None:
+            data = read_raw(path)
+        region = data.get("region_code") or "unknown"
+        ts = data.get("fetched_at_utc") or raw_stem(path).split("__")[0]
+
+        # 카테고리별 요청 순서 = 순위
+        groups: "OrderedDict[str, List[Any]]" = OrderedDict()
+        for rec in records_from_items(data.get("items", [])):
+            if rec.video_id:
+                groups.setdefault(rec.category_id, []).append(rec)
+
+        with self._lock, self._conn:
+            conn = self._conn
+            (latest,) = conn.execute(
+                "SELECT MAX(ts) FROM ingested WHERE region = ?", (region,)
+            ).fetchone()
+            in_order = latest is None or ts > latest
+
+            rank_rows = []
+            for category, recs in groups.items():
+                seen = set()
+                for rank, rec in enumerate(recs, start=1):
+                    if rec.video_id in seen:
+                        continue
+                    seen.add(rec.video_id)
+                    rank_rows.append((region, category, rec.video_id, ts, rank, rec.views))
+            conn.executemany("INSERT OR REPLACE INTO ranks VALUES (?,?,?,?,?,?)", rank_rows)
+
+            if in_order:
+                self._update_current(conn, region, ts, rank_rows, set(groups))
+            else:
+                logger.warning("늦게 도착한 트렌딩 파일 (%s < %s): 순위만 기록 %s", ts, latest, path.name)
+
+            conn.execute("INSERT INTO ingested VALUES (?,?,?)", (path.name, region, ts))
+        return True
+
+    def _update_current(
+        self,
+        conn: sqlite3.Connection,
+        region: str,
+        ts: str,
+        rank_rows: List[tuple],
+        categories: set,
+    ) -> None:
+        new: Dict[tuple, tuple] = {(r[1], r[2]): r for r in rank_rows}
+        prev: Dict[tuple, sqlite3.Row] = {
+            (row["category"], row["video_id"]): row
+            for row in conn.execute("SELECT * FROM current WHERE region = ?", (region,))
+        }
+
+        events = []
+        for key, row in prev.items():
+            # 이번 파일에 수집된 카테고리에서 빠진 영상만 exit (수집 안 한 카테고리는 유지)
+            if key not in new and key[0] in categories:
+                events.append((region, key[0], key[1], ts, "exit", row["rank"]))
+                conn.execute(
+                    "DELETE FROM current WHERE region = ? AND category = ? AND video_id = ?",
+                    (region, key[0], key[1]),
+                )
+
+        upserts = []
+        for key, (_, category, vid, _, rank, views) in new.items():
+            old = prev.get(key)
+            if old is None:
+                events.append((region, category, vid, ts, "enter", rank))
+                upserts.append((region, category, vid, rank, None, views, ts, ts))
+            else:
+                upserts.append((region, category, vid, rank, old["rank"], views, ts, old["entered_at"]))
+        conn.executemany("INSERT OR REPLACE INTO current VALUES (?,?,?,?,?,?,?,?)", upserts)
+        conn.executemany("INSERT INTO events VALUES (?,?,?,?,?,?)", events)
+
+    def _catalog_start(self, trending_dir: Path) -> Optional[str]:
+        """
+        전 지역 갱신의 시작 시각. 전체 MAX(ts)부터 읽으면 다른 지역보다 수집이 늦은
+        지역의 파일이 영영 빠지므로, region 별 마지막 시각 중 가장 이른 시각부터 읽는다.
+        아직 반영한 적 없는 지역이 catalog 에 있으면 처음부터. (이미 반영한 파일은 ingest 가 건너뜀)
+        """
+        with self._lock:
+            last = dict(self._conn.execute("SELECT region, MAX(ts) FROM ingested GROUP BY region"))
+        if not last:
+            return None
+        regions = list(latest_paths_by_region(trending_dir))
+        if any(r not in last for r in regions):
+            return None
+        return min(last[r] for r in regions) if regions else min(last.values())
+
+    @profiled("rank_index_update", count=lambda n: n)
+    def update_from_catalog(self, trending_dir: Path, region: Optional[str] = None) -> int:
+        """
+        마지막으로 반영한 시각 이후(같은 시각 포함)의 트렌딩 파일만 시간순으로 반영한다.
+        """
+        start = self.last_ts(region) if region else self._catalog_start(trending_dir)
+        added = 0
+        for path in paths_between(trending_dir, start, None, region):
+            if self.ingest(path):
+                added += 1
+        return added
+
+    # ------------------------------
+    # 조회
+    # ------------------------------
+
+    def fastest_climbers(
+        self,
+        region: str,
+        since: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        현재 트렌딩 영상 중 순위 상승폭 순.
+        since 가 없으면 직전 수집 대비, 있으면 since 이후 처음 기록된 순위 대비.
+        """
+        params: List[Any] = [region]
+        cat_sql = ""
+        if category:
+            cat_sql = " AND c.category = ?"
+            params.append(category)
+        if since is None:
+            sql = (
+                "SELECT c.*, c.prev_rank AS from_rank, c.prev_rank - c.rank AS climb "
+                "FROM current c WHERE c.region = ? AND c.prev_rank IS NOT NULL" + cat_sql
+            )
+        else:
+            sql = (
+                "SELECT c.*, r.rank AS from_rank, r.rank - c.rank AS climb FROM current c "
+                "JOIN ranks r ON r.region = c.region AND r.category = c.category AND r.video_id = c.video_id "
+                "AND r.ts = (SELECT MIN(ts) FROM ranks r2 WHERE r2.region = c.region "
+                "AND r2.category = c.category AND r2.video_id = c.video_id AND r2.ts >= ?) "
+                "WHERE c.region = ?" + cat_sql
+            )
+            params.insert(0, since)
+        sql += " ORDER BY climb DESC, c.rank ASC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows if row["climb"] > 0]
+
+    def new_entrants(
+        self,
+        region: str,
+        since: str,
+        category: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM events WHERE region = ? AND ts >= ? AND kind = 'enter'"
+        params: List[Any] = [region, since]
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        sql += " ORDER BY ts DESC, rank ASC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def trajectory(self, video_id: str, region: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT region, category, ts, rank, views FROM ranks WHERE video_id = ?"
+        params: List[Any] = [video_id]
+        if region:
+            sql += " AND region = ?"
+            params.append(region)
+        sql += " ORDER BY ts"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import Normalized.trending_topics as trending_topics
+
+    parser = argparse.ArgumentParser(description="트렌딩 순위 궤적 인덱스")
+    parser.add_argument("command", choices=["update", "climbers", "new"])
+    parser.add_argument("--region", default="KR")
+    parser.add_argument("--category")
+    parser.add_argument("--since", help="ts (예: 20250101T000000Z)")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    with RankTrajectoryIndex() as index:
+        if args.command == "update":
+            print(f"ingested {index.update_from_catalog(trending_topics.TRENDING_RAW_DIR)} files")
+        elif args.command == "climbers":
+            for row in index.fastest_climbers(args.region, args.since, args.category, args.limit):
+                print(f"{row['video_id']} cat={row['category']:3s} {row['from_rank']:3d} → {row['rank']:3d} (+{row['climb']})")
+        else:
+            if not args.since:
+                parser.error("new 는 --since 가 필요합니다.")
+            for row in index.new_entrants(args.region, args.since, args.category, args.limit):
+                print(f"{row['ts']} {row['video_id']} cat={row['category']:3s} rank={row['rank']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""
+text_tokens.py
+
+제목 / 태그 키워드 토큰화 규칙.
+소문자, 영숫자/한글 외 공백, 1글자·불용어 제거.
+
+trending_topics(토픽 키워드), trend_insights(키워드 빈도), trend_api_server(키워드 조회),
+keyword_sketch, fulltext_index(색인 토큰)가 같은 규칙을 쓴다.
+저장 계층(fulltext_index)도 import 하므로 다른 모듈에 의존하지 않는다.
+"""
+
+import re
+from typing import List
+
+STOPWORDS = {
+    "the","a","an","and","or","of","to","in","on",
+    "이","그","저","것","오늘","영상","쇼츠","shorts",
+    "video","official","mv","edit","full","episode",
+}
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    text = _NON_WORD.sub(" ", text.lower())
+    return [t for t in text.split() if len(t) > 1 and t not in STOPWORDS]
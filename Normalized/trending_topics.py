@@ -10,7 +10,13 @@ import os
 from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw
+from Sources.Youtube.storage.catalog import latest_path, register
+from Normalized.video_record import VideoRecord, records_from_items
+from Normalized.text_tokens import tokenize as _tokenize
 
 # 디렉토리 설정
 HERE = Path(__file__).resolve()
@@ -18,7 +24,6 @@ PROJECT_ROOT = HERE.parents[1]  # .../02_Normalized
 YOUTUBE_ROOT = PROJECT_ROOT.parents[1] / "01_Sources" / "YouTube"
 TRENDING_RAW_DIR = YOUTUBE_ROOT / "raw" / "trending"
 TOPICS_DIR = PROJECT_ROOT / "trending_topics"
-TOPICS_DIR.mkdir(parents=True, exist_ok=True)
 
 # 카테고리 라벨 (trend_insights.py와 동일하게 맞춤)
 CATEGORY_LABELS: Dict[str, str] = {
@@ -36,43 +41,47 @@ CATEGORY_LABELS: Dict[str, str] = {
     "31": "Anime/Animation",
 }
 
-STOPWORDS = {
-    "the","a","an","and","or","of","to","in","on",
-    "이","그","저","것","오늘","영상","쇼츠","shorts",
-    "video","official","mv","edit","full","episode",
-}
-
-def _tokenize(text: str) -> List[str]:
-    import re
-    text = text.lower()
-    text = re.sub(r"[^0-9a-z가-힣]+", " ", text)
-    tokens = [t for t in text.split() if len(t) > 1 and t not in STOPWORDS]
-    return tokens
-
 def _load_latest_trending() -> Dict[str, Any]:
-    files = sorted(TRENDING_RAW_DIR.glob("*.json"))
-    if not files:
+    latest = latest_path(TRENDING_RAW_DIR)
+    if latest is None:
         raise FileNotFoundError(f"트렌딩 파일이 없습니다: {TRENDING_RAW_DIR}")
-    latest = files[-1]
-    with latest.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data
-
-def build_topics() -> List[Dict[str, Any]]:
-    data = _load_latest_trending()
+    return read_raw(latest)
+
+@profiled("build_topics", count=lambda topics: sum(t["video_count"] for t in topics))
+def build_topics(data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    data를 주지 않으면 raw/trending 최신 파일을 읽는다.
+    (파이프라인 러너는 이미 로드한 payload를 그대로 넘긴다)
+    """
+    if data is None:
+        data = _load_latest_trending()
     fetched_at = data.get("fetched_at_utc")
-    items = data.get("items", [])
-
+    state = accumulate_topics(records_from_items(data.get("items", [])), fetched_at)
+    return finalize_topics(state)
+
+# ------------------------------
+# 집계 단계 (Pipeline.aggregate 의 map / reduce 에서도 사용)
+# ------------------------------
+
+def new_topic_state() -> Dict[str, Any]:
+    return {"topics": {}, "keywords": defaultdict(Counter)}
+
+def accumulate_topics(
+    records: List[VideoRecord],
+    fetched_at: Optional[str],
+    state: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    records를 state에 누적한다. (topic_id 는 처음 등장할 때의 fetched_at 기준)
+    """
+    if state is None:
+        state = new_topic_state()
     # 카테고리별 데이터 집계
-    topics: Dict[str, Dict[str, Any]] = {}
-    keyword_accumulator: Dict[str, Counter] = defaultdict(Counter)
+    topics: Dict[str, Dict[str, Any]] = state["topics"]
+    keyword_accumulator: Dict[str, Counter] = state["keywords"]
 
-    for item in items:
-        snippet = item.get("snippet", {})
-        stats = item.get("statistics", {})
-        cat_id = snippet.get("categoryId") or item.get("__category_id_from_request") or "unknown"
-        views = int(stats.get("viewCount", 0))
-        video_id = item.get("id")
+    for rec in records:
+        cat_id = rec.category_id
 
         # 토픽 초기화
         if cat_id not in topics:
@@ -87,15 +96,35 @@ def build_topics() -> List[Dict[str, Any]]:
             }
 
         # 정보 누적
-        topics[cat_id]["video_ids"].append(video_id)
-        topics[cat_id]["total_views"] += views
+        topics[cat_id]["video_ids"].append(rec.video_id)
+        topics[cat_id]["total_views"] += rec.views
         topics[cat_id]["video_count"] += 1
 
         # 키워드 누적
-        title = snippet.get("title", "") or ""
-        desc = snippet.get("description", "") or ""
-        tokens = _tokenize(title + " " + desc)
-        keyword_accumulator[cat_id].update(tokens)
+        keyword_accumulator[cat_id].update(_tokenize(rec.text))
+
+    return state
+
+def merge_topic_states(into: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    other를 into 뒤에 이어 붙인 것과 같은 결과가 되도록 합친다.
+    (카테고리 / 키워드의 첫 등장 순서가 유지되므로 most_common 동률 순서도 직렬과 같다)
+    """
+    for cat_id, topic in other["topics"].items():
+        mine = into["topics"].get(cat_id)
+        if mine is None:
+            into["topics"][cat_id] = topic
+        else:
+            mine["video_ids"].extend(topic["video_ids"])
+            mine["total_views"] += topic["total_views"]
+            mine["video_count"] += topic["video_count"]
+    for cat_id, counter in other["keywords"].items():
+        into["keywords"][cat_id].update(counter)
+    return into
+
+def finalize_topics(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    topics = state["topics"]
+    keyword_accumulator = state["keywords"]
 
     # 각 카테고리 토픽에 top_keywords 채우기
     for cid, topic in topics.items():
@@ -104,19 +133,22 @@ def build_topics() -> List[Dict[str, Any]]:
 
     return list(topics.values())
 
+@profiled("save_topics")
 def save_topics(topics: List[Dict[str, Any]], region_code: str, fetched_at: str) -> Path:
     filename = f"{fetched_at}__topics_{region_code}.json"
+    TOPICS_DIR.mkdir(parents=True, exist_ok=True)
     out_path = TOPICS_DIR / filename
     with out_path.open("w", encoding="utf-8") as f:
         json.dump({"region_code": region_code,
                    "fetched_at_utc": fetched_at,
                    "topics": topics}, f, ensure_ascii=False, indent=2)
+    register(out_path, ts=fetched_at, region=region_code, item_count=len(topics))
     return out_path
 
 if __name__ == "__main__":
     data = _load_latest_trending()
     region = data.get("region_code", "unknown")
     fetched_at = data.get("fetched_at_utc", datetime.utcnow().strftime("%Y%m%dT%H%M%SZ"))
-    topics = build_topics()
+    topics = build_topics(data)
     path = save_topics(topics, region, fetched_at)
     print(f"Saved topics file: {path}")
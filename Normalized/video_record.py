@@ -0,0 +1,116 @@
+"""
+video_record.py
+
+단계 간에 주고받는 compact 영상 레코드.
+
+raw API item(dict)에는 thumbnails, localizations, tags 등 쓰지 않는 필드가 많고,
+단계마다 int(stats.get("viewCount", 0)) 파싱을 반복한다.
+여기서는 필요한 필드만 __slots__ 객체 / NamedTuple로 한 번 변환해 넘긴다.
+
+- VideoRecord : 트렌딩/검색 item → 제목, 설명, 채널, 카테고리, 정수 통계
+                (category_id / channel_id 는 sys.intern 으로 공유)
+- StatsPoint  : 스냅샷 item → (time, views, likes, comments)
+
+raw 파일(raw/)은 원본 그대로 저장하고, 변환은 읽는 쪽에서만 한다.
+"""
+
+import sys
+from typing import Dict, List, Any, Optional, Iterable, NamedTuple
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _video_id(item: Dict[str, Any]) -> Optional[str]:
+    vid = item.get("id")
+    if isinstance(vid, str):
+        return vid
+    if isinstance(vid, dict):  # search.list 응답 형태
+        return vid.get("videoId")
+    return None
+
+
+class VideoRecord:
+    __slots__ = (
+        "video_id", "title", "description", "channel_id", "channel_title",
+        "category_id", "published_at", "views", "likes", "comments",
+    )
+
+    def __init__(
+        self,
+        video_id: Optional[str],
+        title: str = "",
+        description: str = "",
+        channel_id: Optional[str] = None,
+        channel_title: Optional[str] = None,
+        category_id: str = "unknown",
+        published_at: Optional[str] = None,
+        views: int = 0,
+        likes: int = 0,
+        comments: int = 0,
+    ):
+        self.video_id = video_id
+        self.title = title
+        self.description = description
+        self.channel_id = sys.intern(channel_id) if channel_id else None
+        self.channel_title = channel_title
+        self.category_id = sys.intern(category_id)
+        self.published_at = published_at
+        self.views = views
+        self.likes = likes
+        self.comments = comments
+
+    @classmethod
+    def from_api_item(cls, item: Dict[str, Any]) -> "VideoRecord":
+        snippet = item.get("snippet") or {}
+        stats = item.get("statistics") or {}
+        return cls(
+            video_id=_video_id(item),
+            title=snippet.get("title", "") or "",
+            description=snippet.get("description", "") or "",
+            channel_id=snippet.get("channelId"),
+            channel_title=snippet.get("channelTitle"),
+            category_id=snippet.get("categoryId") or item.get("__category_id_from_request") or "unknown",
+            published_at=snippet.get("publishedAt"),
+            views=_int(stats.get("viewCount", 0)),
+            likes=_int(stats.get("likeCount", 0)),
+            comments=_int(stats.get("commentCount", 0)),
+        )
+
+    @property
+    def text(self) -> str:
+        """
+        키워드 토큰화 대상 (제목 + 설명).
+        """
+        return self.title + " " + self.description
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"VideoRecord({self.video_id!r}, views={self.views}, category={self.category_id!r})"
+
+
+class StatsPoint(NamedTuple):
+    time: Optional[str]
+    views: int
+    likes: int
+    comments: int
+
+
+def records_from_items(items: Iterable[Dict[str, Any]]) -> List[VideoRecord]:
+    return [VideoRecord.from_api_item(item) for item in items]
+
+
+def stats_point(item: Dict[str, Any], time: Optional[str]) -> StatsPoint:
+    stats = item.get("statistics") or {}
+    return StatsPoint(
+        time,
+        _int(stats.get("viewCount", 0)),
+        _int(stats.get("likeCount", 0)),
+        _int(stats.get("commentCount", 0)),
+    )
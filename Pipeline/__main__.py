@@ -0,0 +1,9 @@
+"""
+python -m Pipeline <command> ...  (Pipeline.cli)
+"""
+
+import sys
+
+from Pipeline.cli import main
+
+sys.exit(main())
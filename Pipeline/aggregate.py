@@ -0,0 +1,178 @@
+"""
+aggregate.py
+
+여러 트렌딩 파일(수 주치 / 여러 region)에 대한 map-reduce 키워드·카테고리 집계.
+
+- map    : ProcessPoolExecutor worker가 연속된 파일 묶음(shard)을 읽어
+           accumulate_topics / accumulate_insights 로 부분 상태(Counter, 카테고리 합계)를 만든다.
+- reduce : 부분 상태를 shard 순서대로 merge_*_states 로 합친 뒤 finalize.
+
+shard를 파일 순서대로 잘라 순서대로 합치므로, 모든 item을 이어 붙여
+한 번에 build_topics / build_insights 한 결과(aggregate_serial)와 동일하다.
+(카테고리 / 키워드 첫 등장 순서까지 같아서 most_common 동률 순서도 같다)
+
+    python -m Pipeline.aggregate --start 20250101T000000Z --end 20250115T000000Z --workers 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw
+from Sources.Youtube.storage.catalog import paths_between, stem_timestamp
+from Normalized.video_record import records_from_items
+
+import Normalized.trending_topics as trending_topics
+import Insights.trend_insights as trend_insights
+
+HERE = Path(__file__).resolve()
+AGGREGATE_DIR = HERE.parent / "aggregates"
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------
+# map / reduce
+# ------------------------------
+
+def map_files(paths: List[str], label: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    shard 하나(연속된 파일들)의 부분 상태. worker 프로세스에서 실행된다.
+    """
+    topic_state = trending_topics.new_topic_state()
+    insight_state = trend_insights.new_insight_state()
+    for path in paths:
+        records = records_from_items(read_raw(Path(path)).get("items", []))
+        trending_topics.accumulate_topics(records, label, topic_state)
+        trend_insights.accumulate_insights(records, insight_state)
+    return topic_state, insight_state
+
+
+def reduce_states(
+    partials: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    topic_state = trending_topics.new_topic_state()
+    insight_state = trend_insights.new_insight_state()
+    for t_part, i_part in partials:  # shard 순서 유지
+        trending_topics.merge_topic_states(topic_state, t_part)
+        trend_insights.merge_insight_states(insight_state, i_part)
+    return topic_state, insight_state
+
+
+def _label(paths: List[Path]) -> str:
+    first, last = stem_timestamp(paths[0]), stem_timestamp(paths[-1])
+    return first if first == last else f"{first}-{last}"
+
+
+def _finalize(
+    states: Tuple[Dict[str, Any], Dict[str, Any]],
+    label: str,
+    region_code: Optional[str],
+    n_files: int,
+) -> Dict[str, Any]:
+    topic_state, insight_state = states
+    return {
+        "label": label,
+        "region_code": region_code,
+        "file_count": n_files,
+        "topics": trending_topics.finalize_topics(topic_state),
+        "insights": trend_insights.finalize_insights(insight_state, region_code, label),
+    }
+
+
+def split_shards(paths: List[Path], n_shards: int) -> List[List[str]]:
+    """
+    파일 순서를 유지한 채 n_shards 개의 연속 구간으로 나눈다.
+    """
+    n_shards = max(1, min(n_shards, len(paths)))
+    size, extra = divmod(len(paths), n_shards)
+    shards: List[List[str]] = []
+    start = 0
+    for i in range(n_shards):
+        end = start + size + (1 if i < extra else 0)
+        shards.append([str(p) for p in paths[start:end]])
+        start = end
+    return shards
+
+
+@profiled("aggregate_files", count=lambda r: r["file_count"])
+def aggregate_files(
+    paths: List[Path],
+    workers: Optional[int] = None,
+    shards_per_worker: int = 4,
+    region_code: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    paths(시간순)의 토픽 / 인사이트를 map-reduce로 집계한다.
+    """
+    if not paths:
+        raise ValueError("집계할 파일이 없습니다.")
+    workers = workers or os.cpu_count() or 1
+    label = _label(paths)
+
+    if workers <= 1:
+        partials = [map_files([str(p) for p in paths], label)]
+    else:
+        # worker보다 shard를 잘게 나눠 파일 크기 편차로 인한 대기를 줄인다
+        shards = split_shards(paths, workers * shards_per_worker)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(map_files, shards, [label] * len(shards)))
+
+    return _finalize(reduce_states(partials), label, region_code, len(paths))
+
+
+def aggregate_serial(paths: List[Path], region_code: Optional[str] = None) -> Dict[str, Any]:
+    """
+    비교 기준용 직렬 경로: 모든 item을 이어 붙여 build_topics / build_insights 한 번.
+    """
+    label = _label(paths)
+    items: List[Dict[str, Any]] = []
+    for path in paths:
+        items.extend(read_raw(path).get("items", []))
+    data = {"region_code": region_code, "fetched_at_utc": label, "items": items}
+    return {
+        "label": label,
+        "region_code": region_code,
+        "file_count": len(paths),
+        "topics": trending_topics.build_topics(data),
+        "insights": trend_insights.build_insights(data),
+    }
+
+
+def save_aggregate(result: Dict[str, Any]) -> Path:
+    AGGREGATE_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = AGGREGATE_DIR / f"{result['label']}__aggregate_{result['region_code'] or 'ALL'}.json"
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return out_path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="트렌딩 파일 구간 map-reduce 집계")
+    parser.add_argument("--start", help="시작 ts (예: 20250101T000000Z)")
+    parser.add_argument("--end", help="끝 ts (포함)")
+    parser.add_argument("--region")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--verify", action="store_true", help="직렬 집계와 결과 비교")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    files = paths_between(trending_topics.TRENDING_RAW_DIR, args.start, args.end, args.region)
+    result = aggregate_files(files, workers=args.workers, region_code=args.region)
+    print("saved:", save_aggregate(result))
+    if args.verify:
+        same = aggregate_serial(files, region_code=args.region) == result
+        print("serial 결과와 동일:", same)
+        if not same:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+backfill.py
+
+과거 구간 재계산(backfill) 모드.
+
+점수 로직이 바뀌었을 때 스크립트를 timestamp마다 다시 실행하는 대신,
+구간 안의 트렌딩 파일과 스냅샷을 시간순으로 한 번만 훑으면서
+timestamp마다 topics → (video scores) → topic scores (→ insights 리포트)를 계산/저장한다.
+
+- 스냅샷은 rolling window(deque)로 유지: 각 스냅샷 파일은 청크당 한 번만 읽는다.
+- 스냅샷 window가 이전 timestamp와 같으면 run_scoring 결과를 그대로 재사용한다.
+- 구간은 연속된 청크로 나눠 ProcessPoolExecutor로 병렬 처리한다.
+  각 청크는 시작 시점 직전의 스냅샷 window를 미리 채워서(warm start) 시작하므로
+  직렬 실행과 결과가 같다.
+
+    python -m Pipeline.backfill --start 20250101T000000Z --end 20250201T000000Z --workers 4
+"""
+
+import argparse
+import bisect
+import logging
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Deque, Tuple
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw, raw_stem
+from Sources.Youtube.storage.catalog import paths_between, stem_timestamp
+
+import Normalized.trending_topics as trending_topics
+import Scoring.scoring as scoring
+import Scoring.topic_scoring as topic_scoring
+import Insights.trend_insights as trend_insights
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------
+# 청크 처리 (worker)
+# ------------------------------
+
+class _SnapshotWindow:
+    """
+    ts 이하의 최근 limit개 스냅샷을 유지하는 rolling window.
+    """
+
+    def __init__(self, paths: List[Path], limit: int):
+        self.paths = paths
+        self.times = [stem_timestamp(p) for p in paths]
+        self.limit = limit
+        self.next_idx = 0
+        self.window: Deque[Tuple[str, Dict[str, Any]]] = deque(maxlen=limit)
+
+    def advance(self, ts: str) -> bool:
+        """
+        ts 이하 스냅샷을 window에 밀어넣는다. window가 바뀌었으면 True.
+        아직 안 읽은 스냅샷 중 window에 남지 못할 것은 읽지 않고 건너뛴다.
+        """
+        end = self.next_idx
+        while end < len(self.paths) and self.times[end] <= ts:
+            end += 1
+        if end == self.next_idx:
+            return False
+        for i in range(max(self.next_idx, end - self.limit), end):
+            try:
+                self.window.append((self.times[i], read_raw(self.paths[i])))
+            except Exception as e:
+                logger.warning("스냅샷 로드 실패 %s: %s", self.paths[i], e)
+        self.next_idx = end
+        return True
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        return [snap for _, snap in self.window]
+
+    def last_time(self) -> Optional[str]:
+        return self.window[-1][0] if self.window else None
+
+
+@profiled("backfill_chunk", count=len)
+def _process_chunk(
+    trending_paths: List[str],
+    snapshot_paths: List[str],
+    limit_snapshots: int,
+    with_insights: bool,
+) -> List[Dict[str, Any]]:
+    window = _SnapshotWindow([Path(p) for p in snapshot_paths], limit_snapshots)
+    scoring_results: Optional[Dict[str, Any]] = None
+    saved_score_time: Optional[str] = None
+    out: List[Dict[str, Any]] = []
+
+    for path_str in trending_paths:
+        path = Path(path_str)
+        data = read_raw(path)
+        region = data.get("region_code", "unknown")
+        fetched_at = data.get("fetched_at_utc") or raw_stem(path).split("__")[0]
+
+        topics = trending_topics.build_topics(data)
+        topics_path = trending_topics.save_topics(topics, region, fetched_at)
+
+        # window가 바뀐 경우에만 재계산
+        if window.advance(fetched_at) or scoring_results is None:
+            scoring_results = scoring.run_scoring(snapshots=window.snapshots())
+            snapshot_time = window.last_time()
+            if snapshot_time and snapshot_time != saved_score_time:
+                scoring.save_video_scores(scoring_results, snapshot_time)
+                saved_score_time = snapshot_time
+
+        topics_data = {"region_code": region, "fetched_at_utc": fetched_at, "topics": topics}
+        scored = topic_scoring.score_topics(topics_data, scoring_results)
+
+        row = {
+            "ts": fetched_at,
+            "region_code": region,
+            "topics": len(topics),
+            "scored_videos": len(scoring_results),
+            "top_topic": scored[0]["topic_id"] if scored else None,
+            "topics_path": str(topics_path),
+        }
+        if with_insights:
+            row["report_path"] = str(trend_insights.save_markdown_report(
+                trend_insights.build_insights(data)
+            ))
+        out.append(row)
+    return out
+
+
+# ------------------------------
+# 구간 분할 / 실행
+# ------------------------------
+
+def plan_chunks(
+    trending_paths: List[Path],
+    snapshot_paths: List[Path],
+    chunk_size: int,
+    limit_snapshots: int,
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    트렌딩 파일을 연속 청크로 나누고, 청크마다 필요한 스냅샷 범위
+    (청크 시작 직전 limit개 + 청크 구간 안의 스냅샷)를 붙인다.
+    """
+    snap_times = [stem_timestamp(p) for p in snapshot_paths]
+    chunks: List[Tuple[List[str], List[str]]] = []
+    for i in range(0, len(trending_paths), chunk_size):
+        part = trending_paths[i:i + chunk_size]
+        first_ts = stem_timestamp(part[0])
+        last_ts = stem_timestamp(part[-1])
+        # 청크 첫 timestamp 이하의 마지막 limit개부터 (warm start)
+        lo = max(0, bisect.bisect_right(snap_times, first_ts) - limit_snapshots)
+        hi = bisect.bisect_right(snap_times, last_ts)
+        chunks.append(([str(p) for p in part], [str(p) for p in snapshot_paths[lo:hi]]))
+    return chunks
+
+
+def run_backfill(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    region: Optional[str] = None,
+    limit_snapshots: int = 5,
+    workers: int = 1,
+    chunk_size: int = 50,
+    with_insights: bool = False,
+) -> List[Dict[str, Any]]:
+    trending_paths = paths_between(trending_topics.TRENDING_RAW_DIR, start, end, region)
+    if not trending_paths:
+        logger.info("backfill 대상 트렌딩 파일이 없습니다. (%s ~ %s, region=%s)", start, end, region)
+        return []
+    # 스냅샷은 구간 시작 이전 window까지 필요하므로 end만 제한
+    snapshot_paths = paths_between(scoring.SNAPSHOT_DIR, None, end)
+    chunks = plan_chunks(trending_paths, snapshot_paths, max(1, chunk_size), limit_snapshots)
+    logger.info("backfill: trending=%d snapshots=%d chunks=%d workers=%d",
+                len(trending_paths), len(snapshot_paths), len(chunks), workers)
+
+    results: List[Dict[str, Any]] = []
+    if workers <= 1 or len(chunks) == 1:
+        for t_paths, s_paths in chunks:
+            results.extend(_process_chunk(t_paths, s_paths, limit_snapshots, with_insights))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_process_chunk, t_paths, s_paths, limit_snapshots, with_insights)
+            for t_paths, s_paths in chunks
+        ]
+        # 청크 순서대로 모아 시간순 유지
+        for fut in futures:
+            results.extend(fut.result())
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="topics / topic scoring 과거 구간 backfill")
+    parser.add_argument("--start", help="시작 ts (예: 20250101T000000Z)")
+    parser.add_argument("--end", help="끝 ts (포함)")
+    parser.add_argument("--region")
+    parser.add_argument("--limit-snapshots", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--insights", action="store_true", help="트렌딩 리포트도 다시 생성")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    rows = run_backfill(
+        start=args.start,
+        end=args.end,
+        region=args.region,
+        limit_snapshots=args.limit_snapshots,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        with_insights=args.insights,
+    )
+    for row in rows:
+        print(f"{row['ts']} {row['region_code']:4s} topics={row['topics']:3d} "
+              f"scored={row['scored_videos']:5d} top={row['top_topic']}")
+    print(f"backfilled {len(rows)} timestamps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+cli.py
+
+수집기 / 파이프라인 단계를 하나로 묶은 진입점.
+
+    python -m Pipeline --help
+    python -m Pipeline trending --region KR --region US
+    python -m Pipeline --profile run --all-regions
+    python -m Pipeline fulltext search "원피스" --prefix
+
+- 이 모듈은 argparse 외에는 아무것도 import 하지 않는다.
+  각 subcommand 의 모듈(requests, numpy, sqlite 등)은 handler 안에서만 import 하므로
+  --help 나 가벼운 subcommand 는 해당 모듈만 로드한다.
+- 자체 argparse 가 있는 모듈(backfill, aggregate, fulltext, serve ...)은
+  인자를 그대로 넘겨 모듈의 main(argv) 를 호출한다. (PASSTHROUGH, `python -m <module>` 과 같음)
+- 수집기는 각 모듈의 LOG_FILE 로 setup_logging 한 뒤 실행한다.
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# subcommand → (모듈, 설명). 인자는 모듈의 main(argv) argparse 가 해석한다.
+PASSTHROUGH: Dict[str, Tuple[str, str]] = {
+    "insights": ("Insights.trend_insights", "트렌딩 인사이트 리포트 (--window 24h/7d)"),
+    "backfill": ("Pipeline.backfill", "topics / topic scoring 과거 구간 backfill"),
+    "aggregate": ("Pipeline.aggregate", "트렌딩 파일 구간 map-reduce 집계"),
+    "rank-index": ("Normalized.rank_trajectory", "트렌딩 순위 궤적 인덱스"),
+    "keywords": ("Normalized.keyword_sketch", "시간 감쇠 키워드 sketch"),
+    "fulltext": ("Sources.Youtube.storage.fulltext_index", "영상 전문 검색 인덱스 (update / search / topic)"),
+    "catalog-rebuild": ("Sources.Youtube.storage.catalog", "디렉토리의 기존 파일을 catalog 에 등록"),
+    "serve": ("Insights.trend_api_server", "트렌드 결과 read API 서버"),
+    "bench": ("Benchmarks.bench_stages", "파이프라인 단계별 벤치마크"),
+    "fake-server": ("Benchmarks.fake_youtube_server", "로컬 YouTube API fake 서버"),
+    "synth-data": ("Benchmarks.synthetic_data", "합성 raw 데이터셋 생성"),
+}
+
+
+# ------------------------------
+# 수집기
+# ------------------------------
+
+def _search(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.api import search_api
+    setup_logging(search_api.LOG_FILE)
+    for query in args.query:
+        path = search_api.search_and_collect(
+            query=query,
+            max_results=args.max_results,
+            order=args.order,
+            published_after=args.published_after,
+            region_code=args.region,
+        )
+        print(f"saved: {path}")
+
+
+def _trending(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.api import trending_api
+    setup_logging(trending_api.LOG_FILE)
+    for region in args.region or ["KR"]:
+        path = trending_api.collect_trending(
+            region_code=region,
+            category_ids=args.category,
+            max_results_per_cat=args.max_results,
+        )
+        print(f"saved: {path}")
+
+
+def _snapshot(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.api import video_stats_snapshot
+    setup_logging(video_stats_snapshot.LOG_FILE)
+    path = video_stats_snapshot.run_snapshot()
+    print(f"saved: {path}" if path else "중단됨 (체크포인트 유지, 다음 실행이 이어받음)")
+
+
+def _watchlist(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.api import channel_watchlist
+    setup_logging(channel_watchlist.LOG_FILE)
+    path = channel_watchlist.collect_channel_uploads(
+        channel_ids=args.channel or None,
+        max_pages=args.max_pages,
+    )
+    print(f"saved: {path}")
+
+
+def _home_feed(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.scraper import home_feed_scraper
+    setup_logging(home_feed_scraper.LOG_FILE)
+    print("saved:", home_feed_scraper.scrape_home_feed())
+
+
+def _shorts_feed(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.scraper import shorts_feed_scraper
+    setup_logging(shorts_feed_scraper.LOG_FILE)
+    print("saved:", shorts_feed_scraper.scrape_shorts_feed())
+
+
+def _related(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.scraper import related_videos_scraper
+    setup_logging(related_videos_scraper.LOG_FILE)
+    for video_id in args.video_id:
+        print("saved:", related_videos_scraper.scrape_related(video_id))
+
+
+def _related_graph(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Sources.Youtube.scraper import related_graph_crawler
+    setup_logging(related_graph_crawler.LOG_FILE)
+    seeds = args.seed or related_graph_crawler.load_top_spike_seeds(limit=args.seed_limit)
+    path = related_graph_crawler.crawl_related_graph(
+        seeds,
+        max_workers=args.workers,
+        max_depth=args.depth,
+        max_nodes=args.max_nodes,
+    )
+    print("saved:", path)
+
+
+def _yt_dlp(args: argparse.Namespace) -> None:
+    if not args.video_id:
+        # ID 를 주지 않으면 raw/search 의 전체 영상 (batch_metadata_dump)
+        from Sources.Youtube.yt_dlp.batch_metadata_dump import run_batch
+        run_batch()
+        return
+    from Sources.Youtube.yt_dlp.yt_dlp_wrapper import fetch_metadata_json
+    for video_id in args.video_id:
+        meta = fetch_metadata_json(video_id, save=True)
+        print(f"{video_id}: {meta.get('title')}")
+
+
+# ------------------------------
+# 파이프라인 단계
+# ------------------------------
+
+def _topics(args: argparse.Namespace) -> None:
+    from datetime import datetime
+    from Normalized import trending_topics
+    data = trending_topics._load_latest_trending()
+    region = data.get("region_code", "unknown")
+    fetched_at = data.get("fetched_at_utc", datetime.utcnow().strftime("%Y%m%dT%H%M%SZ"))
+    path = trending_topics.save_topics(trending_topics.build_topics(data), region, fetched_at)
+    print(f"Saved topics file: {path}")
+
+
+def _scoring(args: argparse.Namespace) -> None:
+    from Scoring.scoring import run_scoring
+    res = run_scoring(limit_snapshots=args.snapshots)
+    ranked = sorted(res.items(), key=lambda kv: kv[1]["score"], reverse=True)
+    for vid, info in ranked[:args.top]:
+        print(vid, info)
+
+
+def _topic_scores(args: argparse.Namespace) -> None:
+    from Scoring.topic_scoring import score_topics
+    print(f"Scored {len(score_topics())} topics.")
+
+
+def _forecast(args: argparse.Namespace) -> None:
+    from Scoring.scoring import load_recent_snapshots
+    from Scoring.forecasting import run_forecasting
+    res = run_forecasting(
+        load_recent_snapshots(limit=args.snapshots),
+        horizon_hours=args.horizon,
+        threshold=args.threshold,
+    )
+    ranked = sorted(res.items(), key=lambda kv: kv[1]["projected_gain"] * kv[1]["confidence"], reverse=True)
+    for vid, info in ranked[:args.top]:
+        print(vid, info)
+
+
+def _final_report(args: argparse.Namespace) -> None:
+    from Insights.final_trend_report import build_final_report
+    print("saved:", build_final_report())
+
+
+def _run(args: argparse.Namespace) -> None:
+    from Pipeline.log_setup import setup_logging
+    from Pipeline.runner import run_pipeline
+    setup_logging()
+    report = run_pipeline(
+        limit_snapshots=args.snapshots,
+        force=args.force,
+        all_regions=args.all_regions,
+    )
+    for stage, info in report.items():
+        print(f"{stage:14s} {'cached' if info['cached'] else 'ran':6s} {info['key']}")
+
+
+# ------------------------------
+# parser
+# ------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m Pipeline",
+        description="YouTube 트렌드 수집 / 분석 파이프라인",
+    )
+    parser.add_argument("--profile", action="store_true", help="단계별 프로파일 리포트 저장 (Pipeline.profiling)")
+    sub = parser.add_subparsers(dest="command", metavar="<command>")
+
+    # 수집기
+    p = sub.add_parser("search", help="검색 API 수집 (search.list + videos.list)")
+    p.add_argument("query", nargs="+")
+    p.add_argument("--max-results", type=int, default=20)
+    p.add_argument("--order", default="date")
+    p.add_argument("--region")
+    p.add_argument("--published-after", help="RFC 3339 (예: 2025-01-01T00:00:00Z)")
+    p.set_defaults(func=_search)
+
+    p = sub.add_parser("trending", help="지역/카테고리별 mostPopular 수집")
+    p.add_argument("--region", action="append", help="여러 번 지정 가능 (기본 KR)")
+    p.add_argument("--category", action="append", help="카테고리 ID (기본: DEFAULT_CATEGORY_IDS)")
+    p.add_argument("--max-results", type=int, default=20)
+    p.set_defaults(func=_trending)
+
+    p = sub.add_parser("snapshot", help="영상 통계 스냅샷 (중단 시 이어받기)")
+    p.set_defaults(func=_snapshot)
+
+    p = sub.add_parser("watchlist", help="watchlist 채널 신규 업로드 수집")
+    p.add_argument("--channel", action="append", help="채널 ID (기본: watchlist 파일)")
+    p.add_argument("--max-pages", type=int, default=4)
+    p.set_defaults(func=_watchlist)
+
+    p = sub.add_parser("home-feed", help="Innertube 홈피드 수집")
+    p.set_defaults(func=_home_feed)
+
+    p = sub.add_parser("shorts-feed", help="Innertube 쇼츠 피드 수집")
+    p.set_defaults(func=_shorts_feed)
+
+    p = sub.add_parser("related", help="영상별 관련 영상 수집")
+    p.add_argument("video_id", nargs="+")
+    p.set_defaults(func=_related)
+
+    p = sub.add_parser("related-graph", help="관련 영상 그래프 BFS 크롤링")
+    p.add_argument("seed", nargs="*", help="시드 videoId (기본: 스파이크 점수 상위)")
+    p.add_argument("--seed-limit", type=int, default=20)
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--depth", type=int, default=2)
+    p.add_argument("--max-nodes", type=int, default=10000)
+    p.set_defaults(func=_related_graph)
+
+    p = sub.add_parser("yt-dlp", help="yt-dlp 메타데이터 (ID 없으면 raw/search 전체)")
+    p.add_argument("video_id", nargs="*")
+    p.set_defaults(func=_yt_dlp)
+
+    # 단계
+    p = sub.add_parser("topics", help="최신 트렌딩 → 토픽 파일")
+    p.set_defaults(func=_topics)
+
+    p = sub.add_parser("scoring", help="스냅샷 Δviews 스파이크 점수")
+    p.add_argument("--snapshots", type=int, default=5)
+    p.add_argument("--top", type=int, default=20)
+    p.set_defaults(func=_scoring)
+
+    p = sub.add_parser("topic-scores", help="최신 토픽 파일 점수화")
+    p.set_defaults(func=_topic_scores)
+
+    p = sub.add_parser("forecast", help="스냅샷 이력 기반 조회수 성장 예측")
+    p.add_argument("--snapshots", type=int, default=12)
+    p.add_argument("--horizon", type=float, default=24.0, help="예측 시점 (hours)")
+    p.add_argument("--threshold", type=float, default=1_000_000)
+    p.add_argument("--top", type=int, default=20)
+    p.set_defaults(func=_forecast)
+
+    p = sub.add_parser("final-report", help="최신 토픽 + 토픽 점수 최종 리포트")
+    p.set_defaults(func=_final_report)
+
+    p = sub.add_parser("run", help="전체 파이프라인 (단계별 메모이즈)")
+    p.add_argument("--all-regions", action="store_true", help="지역별 최신 트렌딩 전부 + 합본 리포트")
+    p.add_argument("--force", action="store_true", help="캐시 무시")
+    p.add_argument("--snapshots", type=int, default=5)
+    p.set_defaults(func=_run)
+
+    for name, (_, help_text) in PASSTHROUGH.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+
+    return parser
+
+
+def _run_passthrough(name: str, argv: List[str]) -> int:
+    import importlib
+    module_name, _ = PASSTHROUGH[name]
+    # runpy 로 "__main__" 실행하면 ProcessPoolExecutor worker 함수가 pickle 되지 않으므로
+    # (가짜 __main__ 은 sys.modules["__main__"] 이 아님) import 한 모듈의 main(argv) 를 부른다
+    sys.argv = [f"python -m Pipeline {name}"] + argv
+    return importlib.import_module(module_name).main(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    # PASSTHROUGH 는 모듈의 argparse 가 인자를 해석하므로 subcommand 이름만 보고 넘긴다
+    head = 1 if argv[:1] == ["--profile"] else 0
+    if argv[head:head + 1] and argv[head] in PASSTHROUGH:
+        if head:
+            from Pipeline.profiling import enable_profiling
+            enable_profiling()
+        return _run_passthrough(argv[head], argv[head + 1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    if args.profile:
+        from Pipeline.profiling import enable_profiling
+        enable_profiling()
+    args.func(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+log_setup.py
+
+수집기 / 단계 모듈의 로깅 설정.
+
+모듈 import 시점에 logging.basicConfig 와 logs/ 디렉토리 생성을 하면
+import 만 해도 (CLI --help, 다른 모듈에서의 재사용) 부수효과가 생기고,
+먼저 import 된 모듈의 설정이 이겨 로그가 엉뚱한 파일로 간다.
+각 모듈은 LOG_FILE 경로만 정의하고, 실행 진입점(__main__ / Pipeline.cli)에서
+setup_logging(LOG_FILE) 을 호출한다.
+YOUTUBE_METRICS_PORT 가 설정돼 있으면 /metrics 서버도 이때 띄운다. (metrics.py)
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+def setup_logging(
+    log_file: Optional[Path] = None,
+    level: int = logging.INFO,
+    stream: bool = True,
+) -> None:
+    """
+    root logger 에 handler 를 붙인다. 여러 번 호출해도 같은 handler 는 한 번만 붙는다.
+    log_file 의 디렉토리는 이때 만든다.
+    """
+    from Sources.Youtube.api.metrics import start_metrics_server_from_env
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    if stream and not any(
+        type(h) is logging.StreamHandler for h in root.handlers
+    ):
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+    if log_file is not None:
+        log_file = Path(log_file).resolve()
+        if not any(
+            isinstance(h, logging.FileHandler) and Path(h.baseFilename) == log_file
+            for h in root.handlers
+        ):
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(log_file, encoding="utf-8")
+            handler.setFormatter(formatter)
+            root.addHandler(handler)
+
+    # handler 를 붙인 뒤에 띄워야 bind 실패 경고가 로그에 남는다
+    start_metrics_server_from_env()
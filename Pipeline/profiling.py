@@ -0,0 +1,195 @@
+"""
+profiling.py
+
+opt-in 단계 프로파일링 훅.
+
+각 패키지의 주요 함수(build_topics, build_insights, run_scoring, score_topics,
+collector, raw 읽기/쓰기 등)에 @profiled(...)를 붙여두면,
+프로파일링이 켜졌을 때만 호출마다 다음을 기록한다.
+
+- wall time, CPU time(thread_time)
+- tracemalloc peak 메모리 (중첩 호출 간에도 부모 peak 보존)
+- 처리 item 수 (count 콜백)
+
+켜는 방법
+- 환경변수 TREND_PROFILE=1 (또는 출력 디렉토리 경로)
+- 코드/CLI에서 enable_profiling(out_dir)
+
+프로세스 종료 시(또는 write_profile_report 호출 시) 다음 두 파일을 남긴다.
+- profile_{ts}.json       : 호출 스택 경로별 합계
+- profile_{ts}.collapsed  : flamegraph.pl / speedscope 호환 collapsed stack (self wall μs)
+
+꺼져 있을 때 오버헤드는 플래그 확인 한 번뿐이다.
+tracemalloc peak는 프로세스 전역이라 멀티스레드 collector에서는 근사치다.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+
+HERE = Path(__file__).resolve()
+DEFAULT_PROFILE_DIR = HERE.parent / "profiles"
+
+_state: Dict[str, Any] = {
+    "enabled": False,
+    "out_dir": None,
+    "registered": False,
+}
+_lock = threading.Lock()
+_local = threading.local()
+# 스택 경로(tuple) → 합계
+_totals: Dict[tuple, Dict[str, float]] = {}
+
+
+class _Frame:
+    __slots__ = ("name", "t_wall", "t_cpu", "child_wall", "child_peak")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.t_wall = time.perf_counter()
+        self.t_cpu = time.thread_time()
+        self.child_wall = 0.0
+        self.child_peak = 0
+
+
+def profiling_enabled() -> bool:
+    return _state["enabled"]
+
+
+def enable_profiling(out_dir: Optional[Path] = None) -> None:
+    with _lock:
+        _state["enabled"] = True
+        _state["out_dir"] = Path(out_dir) if out_dir else DEFAULT_PROFILE_DIR
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if not _state["registered"]:
+            atexit.register(write_profile_report)
+            _state["registered"] = True
+
+
+def _stack() -> List[_Frame]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record(path: tuple, wall: float, cpu: float, self_wall: float, peak: int, items: Optional[int]) -> None:
+    with _lock:
+        t = _totals.get(path)
+        if t is None:
+            t = _totals[path] = {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                 "self_wall_s": 0.0, "peak_bytes": 0, "items": 0}
+        t["calls"] += 1
+        t["wall_s"] += wall
+        t["cpu_s"] += cpu
+        t["self_wall_s"] += self_wall
+        t["peak_bytes"] = max(t["peak_bytes"], peak)
+        if items is not None:
+            t["items"] += items
+
+
+def profiled(name: Optional[str] = None, count: Optional[Callable[[Any], int]] = None):
+    """
+    함수 데코레이터. count(result)로 처리 item 수를 계산한다.
+    """
+
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return fn(*args, **kwargs)
+
+            stack = _stack()
+            if stack and tracemalloc.is_tracing():
+                # 부모의 지금까지 peak를 보존한 뒤 이 호출 구간용으로 리셋
+                parent = stack[-1]
+                parent.child_peak = max(parent.child_peak, tracemalloc.get_traced_memory()[1])
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+
+            frame = _Frame(label)
+            stack.append(frame)
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - frame.t_wall
+                cpu = time.thread_time() - frame.t_cpu
+                peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+                peak = max(peak, frame.child_peak)
+                path = tuple(f.name for f in stack)
+                stack.pop()
+                if stack:
+                    stack[-1].child_wall += wall
+                    stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            items = None
+            if count is not None:
+                try:
+                    items = count(result)
+                except Exception:
+                    items = None
+            _record(path, wall, cpu, max(0.0, wall - frame.child_wall), peak, items)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def profile_summary() -> List[Dict[str, Any]]:
+    with _lock:
+        rows = [
+            {"stack": ";".join(path), "stage": path[-1], **dict(t)}
+            for path, t in _totals.items()
+        ]
+    return sorted(rows, key=lambda r: r["wall_s"], reverse=True)
+
+
+def write_profile_report(out_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    JSON 리포트와 collapsed stack 파일을 쓰고 JSON 경로를 반환한다.
+    """
+    rows = profile_summary()
+    if not rows:
+        return None
+    out_dir = Path(out_dir or _state["out_dir"] or DEFAULT_PROFILE_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+    json_path = out_dir / f"profile_{ts}.json"
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at_utc": ts,
+            "pid": os.getpid(),
+            "stages": [
+                {**r, "wall_s": round(r["wall_s"], 6), "cpu_s": round(r["cpu_s"], 6),
+                 "self_wall_s": round(r["self_wall_s"], 6),
+                 "peak_mb": round(r["peak_bytes"] / (1024 * 1024), 3)}
+                for r in rows
+            ],
+        }, f, ensure_ascii=False, indent=2)
+
+    collapsed_path = out_dir / f"profile_{ts}.collapsed"
+    with collapsed_path.open("w", encoding="utf-8") as f:
+        for r in sorted(rows, key=lambda r: r["stack"]):
+            us = int(r["self_wall_s"] * 1_000_000)
+            if us > 0:
+                f.write(f"{r['stack']} {us}\n")
+
+    with _lock:
+        _totals.clear()
+    return json_path
+
+
+_env = os.environ.get("TREND_PROFILE")
+if _env and _env.lower() not in ("0", "false", "no"):
+    enable_profiling(None if _env.lower() in ("1", "true", "yes") else Path(_env))
@@ -0,0 +1,387 @@
+"""
+runner.py
+
+sources → Normalized → Scoring → Insights 를 한 프로세스에서 실행하는 파이프라인 러너.
+
+- 단계 사이에는 파일을 다시 읽지 않고 메모리 객체를 그대로 넘긴다.
+- 각 단계의 산출물(토픽 JSON, 토픽 점수 JSON, 리포트 등)은 기존과 동일하게 저장한다.
+- 각 단계는 입력 해시(입력 파일 fingerprint + 상위 단계 키 + 단계 코드 해시)로
+  메모이즈되어, 입력이 바뀌지 않은 단계는 건너뛴다.
+
+수집(sources)은 cron의 collector가 담당하고, 러너는 raw/ 의 최신 입력을 해석한다.
+
+--all-regions : 지역별 최신 트렌딩 파일 전부를 한 번에 처리한다.
+                스냅샷 점수는 한 번만 계산해 공유하고, 최종 리포트는 전 지역 합본 하나.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from Pipeline.profiling import profiled, enable_profiling
+from Sources.Youtube.storage.raw_store import read_raw, raw_stem
+from Sources.Youtube.storage.catalog import latest_path, recent_paths, latest_paths_by_region
+
+import Normalized.trending_topics as trending_topics
+import Normalized.text_tokens as text_tokens
+from Normalized.rank_trajectory import RankTrajectoryIndex
+from Normalized.keyword_sketch import KeywordTracker
+import Normalized.keyword_sketch as keyword_sketch
+import Scoring.scoring as scoring
+import Scoring.forecasting as forecasting
+import Scoring.topic_scoring as topic_scoring
+import Insights.trend_insights as trend_insights
+import Insights.final_trend_report as final_trend_report
+
+HERE = Path(__file__).resolve()
+PROJECT_ROOT = HERE.parents[1]
+CACHE_DIR = HERE.parent / "cache"
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------
+# 해시 유틸
+# ------------------------------
+
+def _hash_parts(*parts: Any) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def file_fingerprint(path: Path) -> List[Any]:
+    """
+    raw 파일은 timestamp 파일명으로 한 번만 쓰이므로
+    내용 전체 대신 (이름, 크기, mtime)으로 식별한다.
+    """
+    st = path.stat()
+    return [path.name, st.st_size, st.st_mtime_ns]
+
+
+_CODE_HASHES: Dict[str, str] = {}
+
+
+def code_hash(module: Any) -> str:
+    """
+    단계 모듈 소스 해시. 점수 로직이 바뀌면 캐시가 자동으로 무효화된다.
+    """
+    path = module.__file__
+    if path not in _CODE_HASHES:
+        _CODE_HASHES[path] = hashlib.blake2b(
+            Path(path).read_bytes(), digest_size=8
+        ).hexdigest()
+    return _CODE_HASHES[path]
+
+
+# ------------------------------
+# 단계 캐시
+# ------------------------------
+
+class StageCache:
+    """
+    {cache_dir}/{stage}/{key}.json 에 단계 출력을 저장한다.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / stage / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        path = self._path(stage, key)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(path)
+
+
+# ------------------------------
+# 러너
+# ------------------------------
+
+class PipelineRunner:
+
+    def __init__(
+        self,
+        limit_snapshots: int = 5,
+        cache_dir: Path = CACHE_DIR,
+        force: bool = False,
+    ):
+        self.limit_snapshots = limit_snapshots
+        self.cache = StageCache(cache_dir)
+        self.force = force
+        self.report: Dict[str, Dict[str, Any]] = {}
+
+    def _stage(self, name: str, key: str, compute: Callable[[], Any]) -> Any:
+        if not self.force:
+            cached = self.cache.get(name, key)
+            if cached is not None:
+                logger.info("[%s] 입력 변화 없음 → 캐시 사용 (key=%s)", name, key)
+                self.report[name] = {"key": key, "cached": True}
+                return cached["value"]
+
+        logger.info("[%s] 실행 (key=%s)", name, key)
+        value = profiled(f"pipeline:{name}")(compute)()
+        self.cache.put(name, key, {"value": value})
+        self.report[name] = {"key": key, "cached": False}
+        return value
+
+    # ------------------------------
+    # 단계 묶음
+    # ------------------------------
+
+    def _scoring_stages(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        스냅샷 기반 단계(스파이크 점수, 성장 예측). 지역과 무관하므로 한 번만 실행한다.
+        """
+        snapshot_paths = recent_paths(scoring.SNAPSHOT_DIR, self.limit_snapshots)
+        snapshots_key = _hash_parts([file_fingerprint(p) for p in snapshot_paths])
+        snapshot_cache: Dict[str, Any] = {}
+
+        def snapshots_data() -> List[Dict[str, Any]]:
+            if "data" not in snapshot_cache:
+                snaps = []
+                for p in snapshot_paths:
+                    try:
+                        snaps.append(read_raw(p))
+                    except Exception as e:
+                        logger.warning("스냅샷 로드 실패 %s: %s", p, e)
+                snapshot_cache["data"] = snaps
+            return snapshot_cache["data"]
+
+        # 영상별 스파이크 점수
+        def compute_scoring() -> Dict[str, Any]:
+            results = scoring.run_scoring(snapshots=snapshots_data())
+            if snapshot_paths:
+                snapshot_time = raw_stem(snapshot_paths[-1]).split("__")[0]
+                scoring.save_video_scores(results, snapshot_time)
+            return results
+
+        scoring_key = _hash_parts(snapshots_key, code_hash(scoring))
+        scoring_results = self._stage("scoring", scoring_key, compute_scoring)
+
+        # 성장 예측 (같은 스냅샷 재사용, 결과는 파일로만 남긴다)
+        def compute_forecasts() -> Dict[str, Any]:
+            results = forecasting.run_forecasting(snapshots_data())
+            if not snapshot_paths:
+                return {"count": 0}
+            snapshot_time = raw_stem(snapshot_paths[-1]).split("__")[0]
+            path = forecasting.save_forecasts(results, snapshot_time)
+            return {"count": len(results), "artifact": str(path)}
+
+        forecasts_key = _hash_parts(snapshots_key, code_hash(forecasting))
+        self._stage("forecasts", forecasts_key, compute_forecasts)
+
+        return scoring_key, scoring_results
+
+    def _region_stages(
+        self,
+        trending_path: Path,
+        scoring_key: str,
+        scoring_results: Dict[str, Any],
+        suffix: str = "",
+        keywords: Optional[KeywordTracker] = None,
+        region: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        트렌딩 파일 하나(= 한 지역)에 대한 토픽 → 토픽 점수 → 인사이트 단계.
+        (topic_scores_key, topics_data, scores_data) 를 반환한다.
+        region 을 모르면(단일 실행) 인사이트 키에 전 지역 sketch 상태를 넣는다.
+        """
+        trending_key = _hash_parts(file_fingerprint(trending_path))
+        trending_cache: Dict[str, Any] = {}
+
+        def trending_data() -> Dict[str, Any]:
+            if "data" not in trending_cache:
+                trending_cache["data"] = read_raw(trending_path)
+            return trending_cache["data"]
+
+        # Normalized: 토픽 생성
+        def compute_topics() -> Dict[str, Any]:
+            data = trending_data()
+            region = data.get("region_code", "unknown")
+            fetched_at = data.get("fetched_at_utc") or raw_stem(trending_path).split("__")[0]
+            topics = trending_topics.build_topics(data)
+            path = trending_topics.save_topics(topics, region, fetched_at)
+            return {
+                "region_code": region,
+                "fetched_at_utc": fetched_at,
+                "topics": topics,
+                "artifact": str(path),
+            }
+
+        # 토큰화 규칙은 text_tokens 에 있으므로 같이 해시한다
+        topics_key = _hash_parts(trending_key, code_hash(trending_topics), code_hash(text_tokens))
+        topics_data = self._stage(f"topics{suffix}", topics_key, compute_topics)
+
+        # Scoring: 토픽 점수 (영상 점수는 지역 간 공유)
+        def compute_topic_scores() -> Dict[str, Any]:
+            scored = topic_scoring.score_topics(topics_data, scoring_results)
+            return {
+                "region_code": topics_data["region_code"],
+                "fetched_at_utc": topics_data["fetched_at_utc"],
+                "topics": scored,
+            }
+
+        topic_scores_key = _hash_parts(topics_key, scoring_key, code_hash(topic_scoring))
+        scores_data = self._stage(f"topic_scores{suffix}", topic_scores_key, compute_topic_scores)
+
+        # Insights: 트렌딩 리포트
+        def compute_insights() -> Dict[str, Any]:
+            # 구간 리포트용 파일 요약도 새 파일이 들어온 이 시점에 만들어 둔다
+            trend_insights.summary_for(trending_path, trending_data())
+            insights = trend_insights.build_insights(trending_data())
+            if keywords is not None and insights.get("region_code"):
+                insights["hot_keywords"] = keywords.top(
+                    insights["region_code"], now=insights.get("fetched_at_utc"),
+                )
+            path = trend_insights.save_markdown_report(insights)
+            return {"insights": insights, "artifact": str(path)}
+
+        insights_parts: List[Any] = [trending_key, code_hash(trend_insights), code_hash(text_tokens)]
+        if keywords is not None:
+            # hot_keywords 는 sketch 상태에 달려 있으므로 같은 지역의 늦은 파일이나
+            # sketch 코드가 바뀌면 다시 계산한다
+            sketch_ts = keywords.last_ts.get(region) if region else keywords.last_ts
+            insights_parts += [sketch_ts, code_hash(keyword_sketch)]
+        insights_key = _hash_parts(*insights_parts)
+        self._stage(f"insights{suffix}", insights_key, compute_insights)
+
+        return topic_scores_key, topics_data, scores_data
+
+    def _rank_index_stage(self) -> None:
+        # 순위 궤적 인덱스 (자체적으로 증분 반영하므로 단계 캐시 대상 아님)
+        with RankTrajectoryIndex() as rank_index:
+            added = profiled("pipeline:rank_index")(rank_index.update_from_catalog)(
+                trending_topics.TRENDING_RAW_DIR
+            )
+        self.report["rank_index"] = {"key": f"+{added} files", "cached": added == 0}
+
+    def _keyword_sketch_stage(self) -> KeywordTracker:
+        # 시간 감쇠 키워드 sketch (rank_index 와 같이 증분 반영)
+        tracker = KeywordTracker.load()
+        added = tracker.update_from_catalog(trending_topics.TRENDING_RAW_DIR)
+        if added:
+            tracker.save()
+        self.report["keyword_sketch"] = {"key": f"+{added} files", "cached": added == 0}
+        return tracker
+
+    # ------------------------------
+    # 실행
+    # ------------------------------
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        최신 트렌딩 파일 하나(지역 무관 최신)에 대해 전 단계를 실행한다.
+        """
+        self.report = {}
+
+        # sources: raw 입력 해석 (내용은 필요할 때만 로드)
+        trending_path = latest_path(trending_topics.TRENDING_RAW_DIR)
+        if trending_path is None:
+            raise FileNotFoundError(f"트렌딩 파일이 없습니다: {trending_topics.TRENDING_RAW_DIR}")
+
+        scoring_key, scoring_results = self._scoring_stages()
+        keywords = self._keyword_sketch_stage()
+        topic_scores_key, topics_data, scores_data = self._region_stages(
+            trending_path, scoring_key, scoring_results, keywords=keywords,
+        )
+        self._rank_index_stage()
+
+        # Insights: 최종 리포트
+        def compute_final_report() -> Dict[str, Any]:
+            path = final_trend_report.build_final_report(topics_data, scores_data)
+            return {"artifact": str(path)}
+
+        final_key = _hash_parts(topic_scores_key, code_hash(final_trend_report))
+        self._stage("final_report", final_key, compute_final_report)
+
+        return self.report
+
+    def run_all_regions(self, regions: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        지역별 최신 트렌딩 파일 전부를 한 번에 처리한다.
+        스냅샷 점수는 한 번만 계산해 모든 지역 토픽 점수에 공유하고,
+        최종 리포트는 전 지역을 합친 파일 하나로 만든다.
+        """
+        self.report = {}
+
+        paths = latest_paths_by_region(trending_topics.TRENDING_RAW_DIR)
+        if regions:
+            paths = {r: p for r, p in paths.items() if r in regions}
+        if not paths:
+            raise FileNotFoundError(f"트렌딩 파일이 없습니다: {trending_topics.TRENDING_RAW_DIR}")
+
+        scoring_key, scoring_results = self._scoring_stages()
+        keywords = self._keyword_sketch_stage()
+        per_region = []
+        for region in sorted(paths):
+            per_region.append(self._region_stages(
+                paths[region], scoring_key, scoring_results,
+                suffix=f"_{region}", keywords=keywords, region=region,
+            ))
+        self._rank_index_stage()
+
+        def compute_final_report() -> Dict[str, Any]:
+            path = final_trend_report.build_multi_region_report(
+                [{"topics": topics_data, "scores": scores_data} for _, topics_data, scores_data in per_region]
+            )
+            return {"artifact": str(path), "regions": sorted(paths)}
+
+        final_key = _hash_parts([key for key, _, _ in per_region], code_hash(final_trend_report))
+        self._stage("final_report_all", final_key, compute_final_report)
+
+        return self.report
+
+
+def run_pipeline(
+    limit_snapshots: int = 5,
+    force: bool = False,
+    all_regions: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    runner = PipelineRunner(limit_snapshots=limit_snapshots, force=force)
+    return runner.run_all_regions() if all_regions else runner.run()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="전체 파이프라인 (단계별 메모이즈)")
+    parser.add_argument("--all-regions", action="store_true", help="지역별 최신 트렌딩 전부 + 합본 리포트")
+    parser.add_argument("--force", action="store_true", help="캐시 무시")
+    parser.add_argument("--snapshots", type=int, default=5, help="스코어링에 쓸 최근 스냅샷 수")
+    parser.add_argument("--profile", action="store_true", help="단계별 프로파일 리포트 저장")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.profile:
+        enable_profiling()
+    report = run_pipeline(
+        limit_snapshots=args.snapshots,
+        force=args.force,
+        all_regions=args.all_regions,
+    )
+    for stage, info in report.items():
+        print(f"{stage:14s} {'cached' if info['cached'] else 'ran':6s} {info['key']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+forecasting.py (in 03_Scoring)
+
+스냅샷 이력으로 영상별 조회수 성장을 예측하는 모듈.
+
+compute_spike_scores 는 마지막 Δviews 만 보므로, 최근 스냅샷 전체에
+간단한 성장 모델을 맞춰 앞으로를 추정한다.
+
+- log-linear : log(1 + views) = a + b·t            (지수 성장)
+- logistic   : views = L / (1 + exp(-(c + k·t)))    (포화 성장)
+  L 은 마지막 조회수의 배수 격자(LOGISTIC_CAPACITY_MULTIPLIERS) 중
+  오차가 가장 작은 값을 고르고, L 이 정해지면 logit 변환으로 선형 최소제곱.
+
+영상별 루프 없이 (영상 × 스냅샷) 배열에 마스크를 씌워
+정규방정식 합계로 모든 영상을 한 번에 푼다. (chunk_size 행씩)
+t 는 마지막 스냅샷 기준 시간(hours, ≤ 0)이다.
+
+출력 (영상별)
+- model               : "log_linear" | "logistic" (AIC가 작은 쪽)
+- projected_views     : horizon_hours 뒤 예측 조회수
+- hours_to_threshold  : threshold 도달까지 남은 시간 (이미 넘었으면 0, 도달 안 하면 None)
+- confidence          : 로그 공간 adjusted R² (0~1, 점이 모자라면 0)
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.catalog import register
+
+HERE = Path(__file__).resolve()
+FORECAST_DIR = HERE.parent / "forecasts"
+
+TIME_FORMAT = "%Y%m%dT%H%M%SZ"
+LOGISTIC_CAPACITY_MULTIPLIERS = (1.05, 1.1, 1.25, 1.5, 2.0, 3.0, 5.0, 10.0)
+MIN_LOGISTIC_POINTS = 4
+
+# ------------------------------
+# 스냅샷 → 배열
+# ------------------------------
+
+@profiled("pack_snapshots", count=lambda r: len(r[0]))
+def pack_snapshots(
+    snapshots: List[Dict[str, Any]],
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    (video_ids, t(K,), views(N, K)) 로 묶는다. 스냅샷에 없는 칸은 NaN.
+    같은 시각의 스냅샷이 여러 개면 뒤의 값이 남는다.
+    """
+    snaps = sorted(
+        (s for s in snapshots if s.get("snapshot_time_utc")),
+        key=lambda s: s["snapshot_time_utc"],
+    )
+    if not snaps:
+        return [], np.zeros(0), np.zeros((0, 0))
+
+    times = [datetime.strptime(s["snapshot_time_utc"], TIME_FORMAT) for s in snaps]
+    t = np.array([(ts - times[-1]).total_seconds() / 3600.0 for ts in times])
+
+    index: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    vals: List[float] = []
+    for k, snap in enumerate(snaps):
+        for item in snap.get("items", []):
+            vid = item.get("id")
+            if not isinstance(vid, str):
+                continue
+            rows.append(index.setdefault(vid, len(index)))
+            cols.append(k)
+            vals.append(float((item.get("statistics") or {}).get("viewCount", 0) or 0))
+
+    views = np.full((len(index), len(snaps)), np.nan)
+    views[np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)] = vals
+    return list(index), t, views
+
+
+# ------------------------------
+# 배치 최소제곱
+# ------------------------------
+
+def _masked_linear_fit(
+    t: np.ndarray, y: np.ndarray, mask: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    마지막 축을 따라 y = a + b·t 를 마스크된 점으로 푼다. (a, b, 유효 여부)
+    t 는 y 에 broadcast 가능한 모양.
+    """
+    m = mask.astype(float)
+    s0 = m.sum(-1)
+    st = (m * t).sum(-1)
+    stt = (m * t * t).sum(-1)
+    sy = (m * y).sum(-1)
+    sty = (m * t * y).sum(-1)
+    den = s0 * stt - st * st
+    ok = (s0 >= 2) & (den > 1e-12)
+    safe_den = np.where(ok, den, 1.0)
+    b = np.where(ok, (s0 * sty - st * sy) / safe_den, 0.0)
+    a = np.where(ok, (sy - b * st) / np.maximum(s0, 1.0), 0.0)
+    return a, b, ok
+
+
+def _sse(pred: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    return np.where(mask, (pred - y) ** 2, 0.0).sum(-1)
+
+
+def _aic(sse: np.ndarray, n: np.ndarray, p: int) -> np.ndarray:
+    return n * np.log(sse / np.maximum(n, 1.0) + 1e-12) + 2 * p
+
+
+def _adjusted_r2(sse: np.ndarray, sst: np.ndarray, n: np.ndarray, p: int) -> np.ndarray:
+    r2 = np.where(sst > 1e-12, 1.0 - sse / np.where(sst > 1e-12, sst, 1.0), 1.0)
+    dof = n - p
+    adj = np.where(dof > 0, 1.0 - (1.0 - r2) * (n - 1) / np.where(dof > 0, dof, 1.0), 0.0)
+    return np.clip(adj, 0.0, 1.0)
+
+
+def _fit_chunk(
+    t: np.ndarray,
+    views: np.ndarray,
+    horizon: float,
+    threshold: float,
+) -> Dict[str, np.ndarray]:
+    mask = ~np.isnan(views)
+    v = np.where(mask, np.maximum(views, 0.0), 0.0)
+    y = np.log1p(v)
+    n = mask.sum(-1).astype(float)
+
+    # 마지막 관측값 (마지막 스냅샷에 빠진 영상은 그 이전 값)
+    last_idx = mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    rows = np.arange(len(v))
+    v_last = v[rows, last_idx]
+    t_last = t[last_idx]
+
+    y_mean = np.where(mask, y, 0.0).sum(-1) / np.maximum(n, 1.0)
+    sst = np.where(mask, (y - y_mean[:, None]) ** 2, 0.0).sum(-1)
+
+    # log-linear
+    a, b, lin_ok = _masked_linear_fit(t, y, mask)
+    lin_sse = _sse(a[:, None] + b[:, None] * t, y, mask)
+    lin_proj = np.expm1(a + b * horizon)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lin_hit = np.where(b > 0, (np.log1p(threshold) - a) / b, np.inf)
+
+    # logistic: L 격자 (N, G) 마다 logit 변환 후 선형 최소제곱
+    mult = np.array(LOGISTIC_CAPACITY_MULTIPLIERS)
+    cap = np.maximum(v_last, 1.0)[:, None] * mult                       # (N, G)
+    v_g = np.minimum(v[:, None, :], cap[:, :, None] * (1.0 - 1e-9))     # (N, G, K)
+    v_g = np.maximum(v_g, 1e-9)
+    mask_g = np.broadcast_to(mask[:, None, :], v_g.shape)
+    z = np.log(v_g / (cap[:, :, None] - v_g))
+    c, k, log_ok = _masked_linear_fit(t, z, mask_g)
+    log_ok &= (k > 0) & (n[:, None] >= MIN_LOGISTIC_POINTS)
+    pred = cap[:, :, None] / (1.0 + np.exp(-(c[:, :, None] + k[:, :, None] * t)))
+    log_sse_g = np.where(log_ok, _sse(np.log1p(pred), y[:, None, :], mask_g), np.inf)
+    best = np.argmin(log_sse_g, axis=1)
+    log_sse = log_sse_g[rows, best]
+    log_ok = log_ok[rows, best]
+    L, c, k = cap[rows, best], c[rows, best], k[rows, best]
+    log_proj = L / (1.0 + np.exp(-(c + k * horizon)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_hit = np.where(
+            threshold < L,
+            (np.log(threshold / np.maximum(L - threshold, 1e-9)) - c) / np.where(k > 0, k, 1.0),
+            np.inf,
+        )
+
+    # 모델 선택 (파라미터 수: log-linear 2, logistic 3)
+    use_log = log_ok & (_aic(log_sse, n, 3) < _aic(lin_sse, n, 2))
+    projected = np.where(use_log, log_proj, lin_proj)
+    projected = np.maximum(projected, v_last)  # 누적 조회수는 줄지 않는다
+    hit = np.where(use_log, log_hit, lin_hit)
+    hit = np.where(v_last >= threshold, 0.0, np.maximum(hit, 0.0))
+    confidence = np.where(
+        use_log,
+        _adjusted_r2(log_sse, sst, n, 3),
+        _adjusted_r2(lin_sse, sst, n, 2),
+    )
+
+    return {
+        "valid": lin_ok,
+        "points": n,
+        "use_logistic": use_log,
+        "current_views": v_last,
+        "last_seen_hours": t_last,
+        "projected_views": projected,
+        "hours_to_threshold": hit,
+        "growth_rate_per_hour": b,
+        "capacity": np.where(use_log, L, np.nan),
+        "confidence": np.where(lin_ok, confidence, 0.0),
+    }
+
+
+@profiled("fit_forecasts", count=lambda r: len(r["valid"]))
+def fit_forecasts(
+    t: np.ndarray,
+    views: np.ndarray,
+    horizon_hours: float = 24.0,
+    threshold: float = 1_000_000,
+    chunk_size: int = 20_000,
+) -> Dict[str, np.ndarray]:
+    """
+    pack_snapshots 결과 배열에 대해 모든 영상을 한 번에 예측한다.
+    (영상 × 격자 × 스냅샷) 임시 배열이 커지지 않도록 chunk_size 행씩 나눠 푼다.
+    """
+    if len(views) == 0:
+        return {"valid": np.zeros(0, dtype=bool)}
+    parts = [
+        _fit_chunk(t, views[i:i + chunk_size], horizon_hours, threshold)
+        for i in range(0, len(views), chunk_size)
+    ]
+    return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+
+# ------------------------------
+# 실행 / 저장
+# ------------------------------
+
+@profiled("run_forecasting", count=len)
+def run_forecasting(
+    snapshots: List[Dict[str, Any]],
+    horizon_hours: float = 24.0,
+    threshold: float = 1_000_000,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    스냅샷 2개 이상에 나온 영상별 예측. run_scoring 과 같은 snapshots 를 받는다.
+    """
+    video_ids, t, views = pack_snapshots(snapshots)
+    if not video_ids:
+        return {}
+    fit = fit_forecasts(t, views, horizon_hours, threshold)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for i in np.flatnonzero(fit["valid"]):
+        hit = fit["hours_to_threshold"][i]
+        current = int(fit["current_views"][i])
+        projected = int(round(fit["projected_views"][i]))
+        results[video_ids[i]] = {
+            "model": "logistic" if fit["use_logistic"][i] else "log_linear",
+            "points": int(fit["points"][i]),
+            "current_views": current,
+            "projected_views": projected,
+            "projected_gain": projected - current,
+            "horizon_hours": horizon_hours,
+            "threshold": threshold,
+            "hours_to_threshold": round(float(hit), 2) if np.isfinite(hit) else None,
+            "growth_rate_per_hour": round(float(fit["growth_rate_per_hour"][i]), 6),
+            "confidence": round(float(fit["confidence"][i]), 4),
+        }
+    return results
+
+
+@profiled("save_forecasts")
+def save_forecasts(results: Dict[str, Any], snapshot_time: str) -> Path:
+    FORECAST_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = FORECAST_DIR / f"{snapshot_time}__forecasts.json"
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump({"snapshot_time_utc": snapshot_time, "videos": results},
+                  f, ensure_ascii=False, indent=2)
+    register(out_path, ts=snapshot_time, item_count=len(results))
+    return out_path
+
+
+if __name__ == "__main__":
+    from Scoring.scoring import load_recent_snapshots
+
+    res = run_forecasting(load_recent_snapshots(limit=12))
+    ranked = sorted(res.items(), key=lambda kv: kv[1]["projected_gain"] * kv[1]["confidence"], reverse=True)
+    for vid, info in ranked[:20]:
+        print(vid, info)
@@ -7,66 +7,67 @@ scoring.py (in 03_Scoring)
 
 import json
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-import numpy as np
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw
+from Sources.Youtube.storage.catalog import recent_paths, register
+from Normalized.video_record import StatsPoint, stats_point
 
 HERE = Path(__file__).resolve()
 # 03_Scoring/scoring.py → parents[2]가 레포 root
 YOUTUBE_ROOT = HERE.parents[2] / "01_Sources" / "Youtube"
 SNAPSHOT_DIR = YOUTUBE_ROOT / "raw" / "stats_snapshots"
+VIDEO_SCORE_DIR = HERE.parent / "video_scores"
 
+@profiled("load_recent_snapshots", count=len)
 def load_recent_snapshots(limit: int = 5) -> List[Dict[str, Any]]:
-    files = sorted(SNAPSHOT_DIR.glob("*.json"))
     snapshots = []
-    for path in files[-limit:]:
+    for path in recent_paths(SNAPSHOT_DIR, limit):
         try:
-            with path.open("r", encoding="utf-8") as f:
-                snapshots.append(json.load(f))
+            snapshots.append(read_raw(path))
         except Exception:
             continue
     return snapshots
 
-def build_time_series(snapshots: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    series: Dict[str, List[Dict[str, Any]]] = {}
+@profiled("build_time_series", count=len)
+def build_time_series(snapshots: List[Dict[str, Any]]) -> Dict[str, List[StatsPoint]]:
+    series: Dict[str, List[StatsPoint]] = {}
     for snap in snapshots:
         timestamp = snap.get("snapshot_time_utc")
         for item in snap.get("items", []):
             vid = item.get("id")
             if isinstance(vid, str):
-                stats = item.get("statistics", {})
-                row = {
-                    "time": timestamp,
-                    "views": int(stats.get("viewCount", 0)),
-                    "likes": int(stats.get("likeCount", 0)),
-                    "comments": int(stats.get("commentCount", 0)),
-                }
-                series.setdefault(vid, []).append(row)
+                series.setdefault(vid, []).append(stats_point(item, timestamp))
     # 시간순 정렬
     for vid in series:
-        series[vid] = sorted(series[vid], key=lambda x: x["time"])
+        series[vid] = sorted(series[vid], key=lambda x: x.time)
     return series
 
-def compute_deltas(ts: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+@profiled("compute_deltas", count=len)
+def compute_deltas(ts: Dict[str, List[StatsPoint]]) -> Dict[str, Dict[str, Any]]:
     out: Dict[str, Dict[str, Any]] = {}
     for vid, rows in ts.items():
         if len(rows) < 2:
             continue
         prev, curr = rows[-2], rows[-1]
-        dv = curr["views"] - prev["views"]
-        dl = curr["likes"] - prev["likes"]
-        dc = curr["comments"] - prev["comments"]
+        dv = curr.views - prev.views
+        dl = curr.likes - prev.likes
+        dc = curr.comments - prev.comments
         out[vid] = {
             "delta_views": dv,
             "delta_likes": dl,
             "delta_comments": dc,
-            "current_views": curr["views"],
+            "current_views": curr.views,
         }
     return out
 
+@profiled("compute_spike_scores", count=len)
 def compute_spike_scores(delta_map: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
     if not delta_map:
         return {}
+    # numpy 는 여기서만 쓰므로 import 비용을 점수 계산 시점으로 미룬다
+    import numpy as np
     values = np.array([v["delta_views"] for v in delta_map.values()])
     mean = float(np.mean(values))
     std = float(np.std(values)) or 1.0
@@ -77,8 +78,12 @@ def compute_spike_scores(delta_map: Dict[str, Dict[str, Any]]) -> Dict[str, floa
         scores[vid] = round(score, 2)
     return scores
 
-def run_scoring(limit_snapshots: int = 5) -> Dict[str, Any]:
-    snaps = load_recent_snapshots(limit_snapshots)
+@profiled("run_scoring", count=len)
+def run_scoring(
+    limit_snapshots: int = 5,
+    snapshots: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    snaps = snapshots if snapshots is not None else load_recent_snapshots(limit_snapshots)
     ts = build_time_series(snaps)
     delta_map = compute_deltas(ts)
     spike_scores = compute_spike_scores(delta_map)
@@ -94,6 +99,16 @@ def run_scoring(limit_snapshots: int = 5) -> Dict[str, Any]:
         }
     return results
 
+@profiled("save_video_scores")
+def save_video_scores(results: Dict[str, Any], snapshot_time: str) -> Path:
+    VIDEO_SCORE_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = VIDEO_SCORE_DIR / f"{snapshot_time}__video_scores.json"
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump({"snapshot_time_utc": snapshot_time, "videos": results},
+                  f, ensure_ascii=False, indent=2)
+    register(out_path, ts=snapshot_time, item_count=len(results))
+    return out_path
+
 if __name__ == "__main__":
     res = run_scoring(limit_snapshots=5)
     for vid, info in res.items():
@@ -7,34 +7,44 @@ topic_scoring.py
 
 import json
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 # 기존 scoring 모듈에서 스파이크 점수를 로딩
-from scoring import run_scoring
+from Scoring.scoring import run_scoring
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.catalog import latest_path, register
 
 HERE = Path(__file__).resolve()
 PROJECT_ROOT = HERE.parents[1]   # .../03_Scoring
 NORMALIZED_DIR = PROJECT_ROOT.parents[1] / "02_Normalized" / "trending_topics"
 TOPIC_SCORE_DIR = PROJECT_ROOT / "topic_scores"
-TOPIC_SCORE_DIR.mkdir(parents=True, exist_ok=True)
 
 def _load_latest_topics() -> Dict[str, Any]:
-    files = sorted(NORMALIZED_DIR.glob("*.json"))
-    if not files:
+    latest = latest_path(NORMALIZED_DIR)
+    if latest is None:
         raise FileNotFoundError(f"토픽 파일이 없습니다: {NORMALIZED_DIR}")
-    latest = files[-1]
     with latest.open("r", encoding="utf-8") as f:
         return json.load(f)
 
-def score_topics() -> List[Dict[str, Any]]:
+@profiled("score_topics", count=len)
+def score_topics(
+    data: Optional[Dict[str, Any]] = None,
+    scoring_results: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    data(토픽 파일 payload) / scoring_results(run_scoring 결과)를 주면
+    파일을 다시 읽거나 run_scoring을 재실행하지 않는다.
+    """
     # 최근 토픽 로딩
-    data = _load_latest_topics()
+    if data is None:
+        data = _load_latest_topics()
     region = data.get("region_code", "unknown")
     fetched_at = data.get("fetched_at_utc", "")
     topics = data.get("topics", [])
     
     # 스파이크 점수 로딩: videoId -> {score, delta_views, delta_likes, ...}
-    scoring_results: Dict[str, Dict[str, Any]] = run_scoring(limit_snapshots=5)
+    if scoring_results is None:
+        scoring_results = run_scoring(limit_snapshots=5)
     
     scored_topics: List[Dict[str, Any]] = []
     for t in topics:
@@ -69,6 +79,7 @@ def score_topics() -> List[Dict[str, Any]]:
     
     # 결과 저장
     filename = f"{fetched_at}__topic_scores_{region}.json"
+    TOPIC_SCORE_DIR.mkdir(parents=True, exist_ok=True)
     out_path = TOPIC_SCORE_DIR / filename
     with out_path.open("w", encoding="utf-8") as f:
         json.dump({
@@ -76,6 +87,7 @@ def score_topics() -> List[Dict[str, Any]]:
             "fetched_at_utc": fetched_at,
             "topics": scored_topics,
         }, f, ensure_ascii=False, indent=2)
+    register(out_path, ts=fetched_at, region=region, item_count=len(scored_topics))
     
     return scored_topics
 
@@ -0,0 +1,213 @@
+"""
+channel_watchlist.py
+
+채널 watchlist 기반 신규 업로드 수집기.
+
+search.list(100 units)로 채널 신작을 찾는 대신
+- 채널별 업로드 재생목록 ID를 channels.list 로 한 번만 조회해 state에 저장하고
+- 매 사이클 playlistItems.list(페이지당 1 unit)를 최신순으로 읽다가
+  이미 본 videoId가 나오면 그 채널은 페이징을 멈춘다.
+
+새 videoId는 raw/channel_uploads/ 에 저장되고,
+video_stats_snapshot.run_snapshot 이 검색 결과와 함께 스냅샷 대상으로 읽는다.
+
+watchlist: config/channel_watchlist.json  ({"channels": ["UC...", ...]})
+state    : raw/channel_uploads/_watch_state.json
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from Sources.Youtube.api.youtube_client import YouTubeChannelClient  # 🔹 공통 클라이언트 사용
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Pipeline.log_setup import setup_logging
+from Sources.Youtube.storage.raw_store import write_raw
+
+
+# ------------------------------
+# 디렉토리 설정
+# ------------------------------
+
+HERE = Path(__file__).resolve()
+PROJECT_ROOT = HERE.parents[1]   # .../01_Sources/Youtube
+UPLOADS_DIR = PROJECT_ROOT / "raw" / "channel_uploads"
+STATE_PATH = UPLOADS_DIR / "_watch_state.json"
+WATCHLIST_PATH = PROJECT_ROOT / "config" / "channel_watchlist.json"
+
+# 채널별로 기억하는 최근 videoId 수 (삭제/비공개로 최신 영상이 빠져도 멈출 수 있도록 여유)
+SEEN_PER_CHANNEL = 200
+
+
+# ------------------------------
+# 로깅 설정
+# ------------------------------
+
+LOG_DIR = PROJECT_ROOT / "logs"
+LOG_FILE = LOG_DIR / "youtube_channel_watchlist.log"
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------
+# watchlist / state
+# ------------------------------
+
+def load_watchlist(path: Path = WATCHLIST_PATH) -> List[str]:
+    if not path.exists():
+        raise FileNotFoundError(f"watchlist 파일이 없습니다: {path}")
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    channels = data.get("channels", []) if isinstance(data, dict) else data
+    # 순서 유지 중복 제거
+    return list(dict.fromkeys(c for c in channels if isinstance(c, str) and c))
+
+
+def _load_state() -> Dict[str, Dict[str, Any]]:
+    try:
+        with STATE_PATH.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: Dict[str, Dict[str, Any]]) -> None:
+    UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_name(f".{STATE_PATH.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, STATE_PATH)
+
+
+# ------------------------------
+# 수집
+# ------------------------------
+
+def resolve_uploads_playlists(
+    client: YouTubeChannelClient,
+    channel_ids: List[str],
+    state: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    state에 업로드 재생목록이 없는 채널만 50개씩 channels.list 로 조회한다.
+    """
+    unresolved = [c for c in channel_ids if not state.get(c, {}).get("uploads_playlist")]
+    for i in range(0, len(unresolved), 50):
+        batch = unresolved[i:i + 50]
+        found = client.get_uploads_playlists(batch)
+        for cid in batch:
+            if cid in found:
+                state.setdefault(cid, {"seen": []})["uploads_playlist"] = found[cid]
+            else:
+                logger.warning("업로드 재생목록을 찾지 못한 채널: %s", cid)
+
+
+def poll_channel(
+    client: YouTubeChannelClient,
+    channel_id: str,
+    entry: Dict[str, Any],
+    max_pages: int = 4,
+    initial_pages: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    최신순으로 읽다가 이미 본 videoId가 나오면 멈춘다.
+    처음 보는 채널은 과거 업로드 전체를 긁지 않도록 initial_pages 만 읽는다.
+    entry["seen"] 은 건드리지 않는다. 결과를 저장한 뒤 mark_seen 으로 갱신한다.
+    """
+    seen = set(entry.get("seen", []))
+    pages = initial_pages if not seen else max_pages
+    new_items: List[Dict[str, Any]] = []
+    page_token: Optional[str] = None
+
+    for _ in range(pages):
+        data = client.list_playlist_items(entry["uploads_playlist"], page_token=page_token)
+        stop = False
+        for item in data.get("items", []):
+            details = item.get("contentDetails", {})
+            vid = details.get("videoId")
+            if not vid:
+                continue
+            if vid in seen:
+                stop = True
+                break
+            new_items.append({
+                "id": vid,
+                "channel_id": channel_id,
+                "published_at": details.get("videoPublishedAt"),
+            })
+        page_token = data.get("nextPageToken")
+        if stop or not page_token:
+            break
+    return new_items
+
+
+def mark_seen(entry: Dict[str, Any], items: List[Dict[str, Any]]) -> None:
+    # 최신 videoId가 앞에 오도록 seen 갱신
+    entry["seen"] = ([it["id"] for it in items] + entry.get("seen", []))[:SEEN_PER_CHANNEL]
+
+
+@profiled("collect_channel_uploads", count=lambda p: 0 if p is None else 1)
+def collect_channel_uploads(
+    channel_ids: Optional[List[str]] = None,
+    max_pages: int = 4,
+    initial_pages: int = 1,
+) -> Optional[Path]:
+    """
+    watchlist 채널들의 신규 업로드를 raw/channel_uploads/ 에 저장하고 경로를 반환.
+    새 영상이 없으면 저장하지 않고 None.
+    """
+    if channel_ids is None:
+        channel_ids = load_watchlist()
+
+    client = YouTubeChannelClient()
+    state = _load_state()
+    polled: Dict[str, List[Dict[str, Any]]] = {}
+    out_path: Optional[Path] = None
+
+    try:
+        resolve_uploads_playlists(client, channel_ids, state)
+
+        for cid in channel_ids:
+            entry = state.get(cid)
+            if not entry or not entry.get("uploads_playlist"):
+                continue
+            items = poll_channel(client, cid, entry, max_pages=max_pages, initial_pages=initial_pages)
+            if items:
+                logger.info("신규 업로드: channel=%s, %d개", cid, len(items))
+            polled[cid] = items
+    finally:
+        # 중간에 실패해도(쿼타 초과 등) 끝까지 읽은 채널의 영상은 먼저 저장하고,
+        # 저장된 채널의 seen 만 갱신한다. 확인한 재생목록은 저장 실패와 무관하게 남긴다.
+        try:
+            all_items = [it for items in polled.values() for it in items]
+            if all_items:
+                out_path = _write_uploads(all_items, len(channel_ids))
+            for cid, items in polled.items():
+                mark_seen(state[cid], items)
+        finally:
+            _save_state(state)
+
+    logger.info("watchlist 채널 %d개, 신규 영상 %d개", len(channel_ids), len(all_items))
+    log_run_summary(logger)
+    return out_path
+
+
+def _write_uploads(items: List[Dict[str, Any]], channel_count: int) -> Path:
+    now_utc = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    payload = {
+        "fetched_at_utc": now_utc,
+        "channel_count": channel_count,
+        "items": items,
+    }
+    out_path = write_raw(UPLOADS_DIR, f"{now_utc}__channel_uploads", payload)
+    logger.info("채널 업로드 저장 완료: %s", out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    setup_logging(LOG_FILE)
+    collect_channel_uploads()
@@ -0,0 +1,307 @@
+"""
+metrics.py
+
+API / Innertube / yt-dlp 호출 지표를 모으는 in-process 레지스트리.
+
+- endpoint·caller별 요청 수(status별), 재시도 수, 응답 bytes, 쿼타 units
+- endpoint·caller별 latency 히스토그램 (p50/p90/p99 추정)
+- Prometheus text 포맷으로 파일 저장 / 로컬 포트 노출
+- collector 실행 종료 시 log_run_summary()로 요약 로그
+
+환경변수
+- YOUTUBE_METRICS_FILE : 설정 시 log_run_summary()가 이 경로에 Prometheus text 저장
+- YOUTUBE_METRICS_PORT : 설정 시 실행 진입점(Pipeline.log_setup.setup_logging)에서
+                         /metrics HTTP 서버 시작. 포트를 다른 프로세스가 쓰고 있으면
+                         (겹쳐 도는 cron collector 등) 경고만 남기고 계속한다.
+"""
+
+import bisect
+import contextvars
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# YouTube Data API v3 호출당 쿼타 비용
+QUOTA_COSTS: Dict[str, int] = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+}
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_caller: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("metrics_caller", default=None)
+
+
+def current_caller() -> str:
+    """
+    caller_scope()로 지정한 이름, 없으면 실행 스크립트 이름.
+    """
+    name = _caller.get()
+    if name:
+        return name
+    main = sys.argv[0] if sys.argv and sys.argv[0] else "interactive"
+    return Path(main).stem or "interactive"
+
+
+@contextmanager
+def caller_scope(name: str):
+    token = _caller.set(name)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+# ------------------------------
+# 지표 타입
+# ------------------------------
+
+class Counter:
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, v in sorted(self.values.items()):
+                lines.append(f"{self.name}{_fmt_labels(key)} {v:g}")
+        return lines
+
+
+class Histogram:
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        # key → [bucket별 count..., +Inf count], sum, count
+        self.counts: Dict[LabelKey, List[int]] = {}
+        self.sums: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self.counts.get(key)
+            if counts is None:
+                counts = self.counts[key] = [0] * (len(self.buckets) + 1)
+                self.sums[key] = 0.0
+            counts[idx] += 1
+            self.sums[key] += value
+
+    def quantile(self, key: LabelKey, q: float) -> float:
+        """
+        버킷 내부 선형 보간으로 분위수 추정 (Prometheus histogram_quantile과 동일 방식).
+        """
+        counts = self.counts.get(key)
+        if not counts:
+            return 0.0
+        total = sum(counts)
+        rank = q * total
+        cum = 0
+        lower = 0.0
+        for i, c in enumerate(counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if cum + c >= rank and c:
+                return lower + (upper - lower) * (rank - cum) / c
+            cum += c
+            lower = upper
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key in sorted(self.counts):
+                cum = 0
+                for bound, c in zip(self.buckets, self.counts[key]):
+                    cum += c
+                    lines.append(f"{self.name}_bucket{_fmt_labels(key, ('le', f'{bound:g}'))} {cum}")
+                cum += self.counts[key][-1]
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, ('le', '+Inf'))} {cum}")
+                lines.append(f"{self.name}_sum{_fmt_labels(key)} {self.sums[key]:.6f}")
+                lines.append(f"{self.name}_count{_fmt_labels(key)} {cum}")
+        return lines
+
+
+# ------------------------------
+# 레지스트리
+# ------------------------------
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.requests = Counter("youtube_requests_total", "HTTP/subprocess calls by endpoint, caller and status.")
+        self.retries = Counter("youtube_retries_total", "Retried attempts by endpoint, caller and reason.")
+        self.bytes = Counter("youtube_response_bytes_total", "Response bytes received.")
+        self.quota = Counter("youtube_quota_units_total", "YouTube Data API quota units consumed.")
+        self.latency = Histogram("youtube_request_latency_seconds", "Per-attempt latency in seconds.")
+
+    def record_call(
+        self,
+        endpoint: str,
+        status: str,
+        seconds: float,
+        nbytes: int = 0,
+        quota_units: int = 0,
+        caller: Optional[str] = None,
+    ) -> None:
+        caller = caller or current_caller()
+        self.requests.inc(endpoint=endpoint, caller=caller, status=status)
+        self.latency.observe(seconds, endpoint=endpoint, caller=caller)
+        if nbytes:
+            self.bytes.inc(nbytes, endpoint=endpoint, caller=caller)
+        if quota_units:
+            self.quota.inc(quota_units, endpoint=endpoint, caller=caller)
+
+    def record_retry(self, endpoint: str, reason: str, caller: Optional[str] = None) -> None:
+        self.retries.inc(endpoint=endpoint, caller=caller or current_caller(), reason=reason)
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for metric in (self.requests, self.retries, self.bytes, self.quota, self.latency):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(self.render_prometheus(), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        endpoint·caller별 요약 행 (요청 수, 에러 수, 재시도, p50/p90/p99, bytes, units).
+        """
+        rows: Dict[LabelKey, Dict[str, Any]] = {}
+        for key, n in self.requests.values.items():
+            labels = dict(key)
+            row_key = _key({"endpoint": labels["endpoint"], "caller": labels["caller"]})
+            row = rows.setdefault(row_key, {
+                "endpoint": labels["endpoint"], "caller": labels["caller"],
+                "requests": 0, "errors": 0, "retries": 0, "bytes": 0, "quota_units": 0,
+            })
+            row["requests"] += int(n)
+            if labels["status"] not in ("200", "ok"):
+                row["errors"] += int(n)
+        for key, n in self.retries.values.items():
+            labels = dict(key)
+            row = rows.get(_key({"endpoint": labels["endpoint"], "caller": labels["caller"]}))
+            if row:
+                row["retries"] += int(n)
+        for counter, field in ((self.bytes, "bytes"), (self.quota, "quota_units")):
+            for key, n in counter.values.items():
+                if key in rows:
+                    rows[key][field] += int(n)
+        for key, row in rows.items():
+            for q in (0.5, 0.9, 0.99):
+                row[f"p{int(q * 100)}_ms"] = round(self.latency.quantile(key, q) * 1000, 1)
+        return sorted(rows.values(), key=lambda r: (r["caller"], r["endpoint"]))
+
+
+METRICS = MetricsRegistry()
+
+
+# ------------------------------
+# export
+# ------------------------------
+
+def log_run_summary(log: Optional[logging.Logger] = None) -> None:
+    """
+    collector 실행 종료 시 호출. 요약을 로그로 남기고,
+    YOUTUBE_METRICS_FILE이 설정돼 있으면 Prometheus text 파일도 갱신한다.
+    """
+    log = log or logger
+    rows = METRICS.summary()
+    if not rows:
+        return
+    for r in rows:
+        log.info(
+            "[metrics] %s %s: req=%d err=%d retry=%d p50=%.1fms p90=%.1fms p99=%.1fms bytes=%d units=%d",
+            r["caller"], r["endpoint"], r["requests"], r["errors"], r["retries"],
+            r["p50_ms"], r["p90_ms"], r["p99_ms"], r["bytes"], r["quota_units"],
+        )
+    path = os.environ.get("YOUTUBE_METRICS_FILE")
+    if path:
+        METRICS.write_prometheus(Path(path))
+        log.info("[metrics] Prometheus text 저장: %s", path)
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            data = METRICS.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info("metrics 서버 시작: http://%s:%d/metrics", host, port)
+    return server
+
+
+_ENV_SERVER: Optional[ThreadingHTTPServer] = None
+_ENV_SERVER_TRIED = False
+
+
+def start_metrics_server_from_env() -> Optional[ThreadingHTTPServer]:
+    """
+    YOUTUBE_METRICS_PORT 가 있으면 프로세스당 한 번만 서버 시작을 시도한다. bind 실패 시 None.
+    """
+    global _ENV_SERVER, _ENV_SERVER_TRIED
+    port = os.environ.get("YOUTUBE_METRICS_PORT")
+    if not port or _ENV_SERVER_TRIED:
+        return _ENV_SERVER
+    _ENV_SERVER_TRIED = True
+    try:
+        _ENV_SERVER = start_metrics_server(int(port))
+    except (OSError, ValueError) as e:
+        logger.warning("metrics 서버를 시작하지 못함 (YOUTUBE_METRICS_PORT=%s): %s", port, e)
+    return _ENV_SERVER
@@ -4,19 +4,25 @@ search_api.py
 YouTube Data API v3 기반 기본 수집기.
 - 키워드로 영상 검색 (search.list)
 - videoId 리스트에 대해 상세 정보(statistics 포함) 조회 (videos.list)
+  (정적 필드가 metadata_cache 에 있으면 statistics 만 요청)
 - raw/search/ 아래에 날짜+키워드 기준으로 JSON 저장
 
 필터(카테고리/IP 등)는 교차검증 전에 사용하지 않기 위해
 함수 틀만 남겨두고 실제 호출은 하지 않는다.
 """
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-from youtube_client import YouTubeSearchClient, YouTubeStatsClient  # 🔹 공통 클라이언트 사용
+from Sources.Youtube.api.youtube_client import YouTubeSearchClient, YouTubeStatsClient  # 🔹 공통 클라이언트 사용
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Pipeline.log_setup import setup_logging
+from Sources.Youtube.storage.raw_store import write_raw
+from Sources.Youtube.storage.metadata_cache import MetadataCache
+from Sources.Youtube.storage.fulltext_index import index_raw_file
 
 # ------------------------------
 # 설정
@@ -31,18 +37,8 @@ RAW_DIR = PROJECT_ROOT / "raw" / "search"
 # ------------------------------
 
 LOG_DIR = PROJECT_ROOT / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "youtube_search_api.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +65,7 @@ def _filter_by_category_example(items: List[Dict[str, Any]], allowed_categories:
 # 검색 → 상세조회 → 저장 플로우
 # ------------------------------
 
+@profiled("search_and_collect")
 def search_and_collect(
     query: str,
     max_results: int = 50,
@@ -80,7 +77,7 @@ def search_and_collect(
     """
     1. search.list로 영상 리스트 조회
     2. videos.list로 상세 정보 조회
-    3. raw/search/에 JSON 저장
+    3. raw/search/에 압축 JSON 저장 (raw_store)
     4. 저장된 파일 경로 반환
 
     필터(category/IP)는 현재 단계에서는 적용하지 않는다.
@@ -109,8 +106,8 @@ def search_and_collect(
     logger.info("검색 결과 영상 수: %d", len(video_ids))
 
     # 2) 상세 조회
-    details_data = stats_client.get_video_details(video_ids)
-    detail_items = details_data.get("items", [])
+    with MetadataCache() as cache:
+        detail_items = cache.fetch_details(stats_client, video_ids)
 
     logger.info("상세 정보 수신 영상 수: %d", len(detail_items))
 
@@ -127,8 +124,6 @@ def search_and_collect(
 
     today_str = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
     safe_query = "".join(c if c.isalnum() else "_" for c in query)[:50]
-    filename = f"{today_str}__{safe_query}.json"
-    output_path = output_dir / filename
 
     payload: Dict[str, Any] = {
         "query": query,
@@ -141,8 +136,8 @@ def search_and_collect(
         "raw_search_response": search_data,   # 필요하면 추후 제거 가능
     }
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    output_path = write_raw(output_dir, f"{today_str}__{safe_query}", payload)
+    index_raw_file(output_path, payload)
 
     logger.info("검색 결과 저장 완료: %s", output_path)
     return output_path
@@ -153,6 +148,7 @@ def search_and_collect(
 # ------------------------------
 
 if __name__ == "__main__":
+    setup_logging(LOG_FILE)
     test_queries = [
         "Attack on Titan"
     ]
@@ -168,3 +164,5 @@ if __name__ == "__main__":
             print(f"saved: {path}")
         except Exception as e:
             logger.exception("쿼리 실행 중 예외 발생: %s", e)
+
+    log_run_summary(logger)
@@ -5,29 +5,25 @@ YouTube Data API v3의 videos.list(chart=mostPopular)를 이용해
 지역/카테고리별 트렌딩 영상을 수집한다.
 """
 
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from youtube_client import YouTubeTrendingClient
+from Sources.Youtube.api.youtube_client import YouTubeTrendingClient
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Pipeline.log_setup import setup_logging
+from Sources.Youtube.storage.raw_store import write_raw
+from Sources.Youtube.storage.metadata_cache import MetadataCache
+from Sources.Youtube.storage.fulltext_index import index_raw_file
 
 HERE = Path(__file__).resolve()
 PROJECT_ROOT = HERE.parents[1]
 TRENDING_DIR = PROJECT_ROOT / "raw" / "trending"
 
 LOG_DIR = PROJECT_ROOT / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "youtube_trending.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # 기본 카테고리 목록 (필요에 따라 수정 가능)
@@ -45,6 +41,7 @@ DEFAULT_CATEGORY_IDS: List[str] = [
     "28",  # Science & Technology
 ]
 
+@profiled("collect_trending")
 def collect_trending(
     region_code: str = "KR",
     category_ids: Optional[List[str]] = None,
@@ -73,18 +70,22 @@ def collect_trending(
         all_items.extend(items)
 
     now_utc = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    filename = f"{now_utc}__trending_{region_code}.json"
-    out_path = TRENDING_DIR / filename
     payload = {
         "region_code": region_code,
         "fetched_at_utc": now_utc,
         "items": all_items,
     }
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    out_path = write_raw(TRENDING_DIR, f"{now_utc}__trending_{region_code}", payload)
+
+    # mostPopular는 ID를 미리 알 수 없어 정적 필드까지 받아야 하므로, 받은 김에 캐시를 채운다
+    with MetadataCache() as cache:
+        cache.put_items(all_items)
+    index_raw_file(out_path, payload)
 
     logger.info("트렌딩 저장 완료: %s (items=%d)", out_path, len(all_items))
+    log_run_summary(logger)
     return out_path
 
 if __name__ == "__main__":
+    setup_logging(LOG_FILE)
     collect_trending(region_code="KR", max_results_per_cat=20)
@@ -2,21 +2,34 @@
 video_stats_snapshot.py
 
 YouTube Data API 기반 조회수/좋아요/댓글 스냅샷 수집기.
-- raw/search/*.json 에서 videoId 목록 로드
+- raw/search/*.json, raw/channel_uploads/ (channel_watchlist) 에서 videoId 목록 로드
 - videos.list 로 현재 통계 조회
 - raw/stats_snapshots/ 에 timestamp 기반으로 저장
+- 응답에서 계속 빠지는 영상은 tombstone 처리 후 주기적으로만 재확인
+  (raw/stats_snapshots/_tombstones.json)
+- 정적 필드(snippet/contentDetails)는 metadata_cache 에서 채우고
+  캐시된 영상은 statistics 만 요청
+- 배치 응답은 받는 대로 part 파일에 append + 체크포인트 → 중단 시 다음 실행이 이어받음
+  (raw/stats_snapshots/_snapshot_{part.jsonl,plan.json,checkpoint.json})
 
 이 스냅샷들이 Δviews/Δt, 스파이크 탐지, 알고리즘 감지의 핵심 데이터가 된다.
 """
 
 import json
-import time
 import logging
+import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 
-from youtube_client import YouTubeStatsClient  # 🔹 공통 클라이언트 사용
+from Sources.Youtube.api.youtube_client import YouTubeStatsClient, QuotaExceededError  # 🔹 공통 클라이언트 사용
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Pipeline.log_setup import setup_logging
+from Sources.Youtube.storage.raw_store import write_raw_stream, read_raw, list_raw_files
+from Sources.Youtube.storage.tombstones import TombstoneStore
+from Sources.Youtube.storage.metadata_cache import MetadataCache
 
 
 # ------------------------------
@@ -26,6 +39,7 @@ from youtube_client import YouTubeStatsClient  # 🔹 공통 클라이언트 사
 HERE = Path(__file__).resolve()
 PROJECT_ROOT = HERE.parents[1]   # .../01_Sources/Youtube
 SEARCH_RAW_DIR = PROJECT_ROOT / "raw" / "search"
+CHANNEL_UPLOADS_DIR = PROJECT_ROOT / "raw" / "channel_uploads"
 SNAPSHOT_DIR = PROJECT_ROOT / "raw" / "stats_snapshots"
 
 
@@ -34,41 +48,43 @@ SNAPSHOT_DIR = PROJECT_ROOT / "raw" / "stats_snapshots"
 # ------------------------------
 
 LOG_DIR = PROJECT_ROOT / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "youtube_stats_snapshot.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 
 # ------------------------------
-# raw/search → videoId 로드
+# raw/search, raw/channel_uploads → videoId 로드
 # ------------------------------
 
+@profiled("load_video_ids_from_details", count=len)
 def load_video_ids_from_details() -> List[str]:
     """
     search_api.py는 detail_items만 저장하므로
     실제 videoId는 item["id"]에 string으로 저장됨.
 
-    raw/search/*.json → payload["items"] → item["id"]
+    raw/search/*.json(.gz|.zst) → payload["items"] → item["id"]
     """
     if not SEARCH_RAW_DIR.exists():
         raise FileNotFoundError(f"검색 결과 폴더가 없습니다: {SEARCH_RAW_DIR}")
+    return _load_item_ids(SEARCH_RAW_DIR)
 
+
+@profiled("load_video_ids_from_watchlist", count=len)
+def load_video_ids_from_watchlist() -> List[str]:
+    """
+    channel_watchlist.py 가 저장한 신규 업로드 videoId.
+    watchlist를 쓰지 않으면 빈 리스트.
+    """
+    return _load_item_ids(CHANNEL_UPLOADS_DIR)
+
+
+def _load_item_ids(dir_path: Path) -> List[str]:
     video_ids: List[str] = []
 
-    for json_path in SEARCH_RAW_DIR.glob("*.json"):
+    for json_path in list_raw_files(dir_path):
         try:
-            with json_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_raw(json_path)
 
             items = data.get("items", [])
             for item in items:
@@ -79,65 +95,224 @@ def load_video_ids_from_details() -> List[str]:
         except Exception as e:
             logger.warning("로드 실패 %s: %s", json_path, e)
 
-    # 중복 제거
-    return list(set(video_ids))
+    # 중복 제거 + 고정 순서 (실행마다 배치 구성이 같도록)
+    return sorted(set(video_ids))
 
 
 # ------------------------------
-# 스냅샷 저장
+# 스냅샷 저장 (스트리밍 + 체크포인트)
 # ------------------------------
+#
+# 배치 응답은 받는 즉시 _snapshot_part.jsonl 에 한 줄씩 append 하고,
+# 몇 번째 배치까지 / part 파일 몇 바이트까지 유효한지를 _snapshot_checkpoint.json 에 남긴다.
+# 요청 계획(배치별 parts / ids)은 시작할 때 _snapshot_plan.json 에 한 번만 쓴다.
+# 중간에 끊기면(쿼타 초과, 프로세스 종료) 다음 실행이 다음 배치부터 이어서 받고,
+# 모든 배치가 끝나면 part 파일을 스트리밍으로 읽어 raw 스냅샷 파일 하나로 만든다.
+
+PART_PATH = SNAPSHOT_DIR / "_snapshot_part.jsonl"
+PLAN_PATH = SNAPSHOT_DIR / "_snapshot_plan.json"
+CHECKPOINT_PATH = SNAPSHOT_DIR / "_snapshot_checkpoint.json"
+
+# 이보다 오래된 미완료 실행은 이어받지 않고 받은 만큼만 partial 스냅샷으로 저장한다
+# (수집 시각이 크게 벌어진 item이 한 스냅샷에 섞이지 않도록)
+RESUME_MAX_AGE_SEC = 6 * 3600
+
+
+def _write_json_atomic(path: Path, obj: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _load_json(path: Path) -> Optional[Any]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _clear_checkpoint() -> None:
+    for path in (CHECKPOINT_PATH, PLAN_PATH, PART_PATH):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
 
-def save_snapshot(stats_items: List[Dict[str, Any]]) -> Path:
-    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    filename = f"{timestamp}__snapshot.json"
-
-    out_path = SNAPSHOT_DIR / filename
 
-    payload = {
-        "snapshot_time_utc": timestamp,
-        "items": stats_items
-    }
+def _iter_part_items(limit_bytes: int) -> Iterator[Dict[str, Any]]:
+    """
+    part 파일의 앞 limit_bytes(체크포인트로 확정된 부분)만 한 줄씩 읽는다.
+    """
+    with PART_PATH.open("rb") as f:
+        while f.tell() < limit_bytes:
+            line = f.readline()
+            if not line:
+                break
+            yield json.loads(line)
 
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
 
-    logger.info("스냅샷 저장 완료: %s", out_path)
+@profiled("finalize_snapshot")
+def finalize_snapshot(checkpoint: Dict[str, Any], partial: bool = False) -> Path:
+    """
+    체크포인트까지의 part 파일을 raw 스냅샷으로 저장하고 체크포인트를 지운다.
+    저장 후 지우기 전에 죽어도 다음 실행이 같은 파일을 다시 만들 뿐이다.
+    """
+    timestamp = checkpoint["snapshot_time_utc"]
+    header: Dict[str, Any] = {"snapshot_time_utc": timestamp}
+    if partial:
+        header["partial"] = True
+        header["batches_done"] = checkpoint["done"]
+        header["batches_planned"] = checkpoint["batches"]
+
+    items = _iter_part_items(checkpoint["part_bytes"]) if PART_PATH.exists() else iter(())
+    out_path = write_raw_stream(SNAPSHOT_DIR, f"{timestamp}__snapshot", header, items)
+    _clear_checkpoint()
+
+    logger.info("스냅샷 저장 완료%s: %s", " (partial)" if partial else "", out_path)
     return out_path
 
 
-# ------------------------------
-# 실행 플로우
-# ------------------------------
+def _load_resumable(now: float) -> Optional[Tuple[Dict[str, Any], List[Any]]]:
+    """
+    이어받을 (체크포인트, 요청 계획). 너무 오래된 것은 partial 로 마무리하고 None.
+    """
+    checkpoint = _load_json(CHECKPOINT_PATH)
+    if not isinstance(checkpoint, dict):
+        _clear_checkpoint()
+        return None
+
+    if checkpoint["done"] >= checkpoint["batches"]:
+        # 모든 배치를 받고 저장 직전에 끊긴 경우
+        finalize_snapshot(checkpoint)
+        return None
+
+    if now - checkpoint["started_at"] > RESUME_MAX_AGE_SEC:
+        logger.warning("오래된 미완료 스냅샷(%s, %d/%d 배치): partial 로 저장하고 새로 시작",
+                       checkpoint["snapshot_time_utc"], checkpoint["done"], checkpoint["batches"])
+        if checkpoint["done"]:
+            finalize_snapshot(checkpoint, partial=True)
+        else:
+            _clear_checkpoint()
+        return None
+
+    plan = _load_json(PLAN_PATH)
+    if not isinstance(plan, list) or len(plan) != checkpoint["batches"] or not PART_PATH.exists():
+        logger.warning("스냅샷 체크포인트가 깨져 있어 새로 시작합니다.")
+        _clear_checkpoint()
+        return None
+
+    return checkpoint, plan
+
+
+def _start_checkpoint(plan: List[Tuple[str, List[str]]], now: float) -> Dict[str, Any]:
+    _write_json_atomic(PLAN_PATH, plan)
+    PART_PATH.write_bytes(b"")
+    checkpoint = {
+        "snapshot_time_utc": datetime.utcfromtimestamp(now).strftime("%Y%m%dT%H%M%SZ"),
+        "started_at": now,
+        "batches": len(plan),
+        "done": 0,
+        "part_bytes": 0,
+    }
+    _write_json_atomic(CHECKPOINT_PATH, checkpoint)
+    return checkpoint
 
-def run_snapshot():
-    logger.info("=== 스냅샷 수집 시작 ===")
 
-    video_ids = load_video_ids_from_details()
+def _plan_targets(cache: MetadataCache, tombstones: TombstoneStore) -> Optional[List[Tuple[str, List[str]]]]:
+    try:
+        search_ids = load_video_ids_from_details()
+    except FileNotFoundError as e:
+        logger.warning("%s", e)
+        search_ids = []
+    watch_ids = load_video_ids_from_watchlist()
+    video_ids = sorted(set(search_ids) | set(watch_ids))
 
     if not video_ids:
-        logger.warning("videoId가 없음. raw/search 폴더 확인 필요.")
-        return
+        logger.warning("videoId가 없음. raw/search, raw/channel_uploads 폴더 확인 필요.")
+        return None
 
-    logger.info("대상 영상 수: %d", len(video_ids))
+    live, recheck, skipped = tombstones.partition(video_ids)
+    # tombstone을 뺀 뒤 plan_batches 로 묶으므로 마지막 배치를 빼고는 50개가 꽉 찬다
+    targets = sorted(live + recheck)
 
-    client = YouTubeStatsClient()
+    logger.info("대상 영상 수: %d (live=%d, 재확인=%d, tombstone 건너뜀=%d)",
+                len(targets), len(live), len(recheck), skipped)
 
     # YouTube API는 id 최대 50개 제한
-    batch_size = 50
-    all_items: List[Dict[str, Any]] = []
+    return cache.plan_batches(targets, batch_size=50)
 
-    for i in range(0, len(video_ids), batch_size):
-        batch = video_ids[i:i+batch_size]
-        data = client.get_video_details(batch)
-        items = data.get("items", [])
-        all_items.extend(items)
-        time.sleep(1.0)  # API 부담 완화용 딜레이
 
-    save_snapshot(all_items)
+# ------------------------------
+# 실행 플로우
+# ------------------------------
+
+@profiled("run_snapshot", count=lambda p: 0 if p is None else 1)
+def run_snapshot() -> Optional[Path]:
+    """
+    스냅샷 하나를 수집해 저장 경로를 반환한다.
+    쿼타 초과로 중단되면 체크포인트를 남기고 None (다음 실행이 이어받는다).
+    메모리에는 배치 하나 분량의 item과 요청 계획(ID 목록)만 올라간다.
+    """
+    logger.info("=== 스냅샷 수집 시작 ===")
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
 
+    now = time.time()
+    tombstones = TombstoneStore.for_dir(SNAPSHOT_DIR)
+    newly_dead = 0
+    out_path: Optional[Path] = None
+
+    with MetadataCache() as cache:
+        resumed = _load_resumable(now)
+        if resumed is not None:
+            checkpoint, plan = resumed
+            logger.info("미완료 스냅샷 이어받기: %s (%d/%d 배치 완료)",
+                        checkpoint["snapshot_time_utc"], checkpoint["done"], checkpoint["batches"])
+            # 체크포인트 이후에 쓰다 만 줄은 버린다
+            with PART_PATH.open("r+b") as f:
+                f.truncate(checkpoint["part_bytes"])
+        else:
+            plan = _plan_targets(cache, tombstones)
+            if plan is None:
+                return None
+            checkpoint = _start_checkpoint(plan, now)
+
+        client = YouTubeStatsClient()
+        try:
+            with PART_PATH.open("ab") as part:
+                # 배치 사이 1초 딜레이 (API 부담 완화)
+                for n, batch, items in cache.iter_batches(
+                    client, plan, start=checkpoint["done"], delay_sec=1.0,
+                ):
+                    newly_dead += tombstones.observe(batch, (item.get("id") for item in items))
+                    for item in items:
+                        part.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                        part.write(b"\n")
+                    part.flush()
+                    os.fsync(part.fileno())
+                    checkpoint["done"] = n + 1
+                    checkpoint["part_bytes"] = part.tell()
+                    _write_json_atomic(CHECKPOINT_PATH, checkpoint)
+        except QuotaExceededError as e:
+            logger.warning("쿼타 초과로 중단 (%d/%d 배치 완료, 다음 실행에서 이어받음): %s",
+                           checkpoint["done"], checkpoint["batches"], e)
+        finally:
+            tombstones.save()
+        cache.evict()
+
+    logger.info("응답 누락: 신규 tombstone=%d, 누적 tombstone=%d, 관찰 중=%d",
+                newly_dead, len(tombstones.dead), len(tombstones.pending))
+
+    if checkpoint["done"] >= checkpoint["batches"]:
+        out_path = finalize_snapshot(checkpoint)
+
+    log_run_summary(logger)
     logger.info("=== 스냅샷 수집 종료 ===")
+    return out_path
 
 
 # ------------------------------
@@ -145,4 +320,5 @@ def run_snapshot():
 # ------------------------------
 
 if __name__ == "__main__":
+    setup_logging(LOG_FILE)
     run_snapshot()
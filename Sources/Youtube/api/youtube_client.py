@@ -11,13 +11,19 @@ search_api.py, video_stats_snapshot.py, scraper 계열 모두 이 파일을 impo
 """
 
 import json
+import os
+import random
+import threading
 import time
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
 
 import requests
 
+from Sources.Youtube.api.metrics import METRICS, QUOTA_COSTS
+
 
 # --------------------------------
 # 디렉토리 설정
@@ -28,7 +34,9 @@ PROJECT_ROOT = HERE.parents[1]  # .../01_Sources/Youtube
 CONFIG_DIR = PROJECT_ROOT / "config"
 YOUTUBE_KEYS_PATH = CONFIG_DIR / "youtube_keys.json"
 
-YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+# 로컬 fake 서버(Benchmarks/fake_youtube_server.py) 등으로 돌릴 때 env로 override
+YOUTUBE_API_BASE = os.environ.get("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3")
+INNERTUBE_API_BASE = os.environ.get("INNERTUBE_API_BASE", "https://www.youtube.com/youtubei/v1")
 
 
 # --------------------------------
@@ -36,17 +44,8 @@ YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
 # --------------------------------
 
 LOG_DIR = PROJECT_ROOT / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "youtube_client.log"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
+# handler 는 import 시점이 아니라 실행 진입점에서 붙인다 (Pipeline.log_setup.setup_logging)
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +57,12 @@ logger = logging.getLogger(__name__)
 def load_api_key() -> str:
     """
     config/youtube_keys.json에서 YouTube Data API 키 로드
+    (YOUTUBE_API_KEY 환경변수가 있으면 우선 사용 — fake 서버 부하 테스트용)
     """
+    env_key = os.environ.get("YOUTUBE_API_KEY")
+    if env_key:
+        return env_key
+
     if not YOUTUBE_KEYS_PATH.exists():
         raise FileNotFoundError(f"API 키 파일이 없습니다: {YOUTUBE_KEYS_PATH}")
 
@@ -72,47 +76,247 @@ def load_api_key() -> str:
     return api_key
 
 
+# --------------------------------
+# 에러 분류 / 백오프 / 서킷 브레이커
+# --------------------------------
+
+# 재시도해도 절대 성공하지 않는 쿼타 소진 사유
+HARD_QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+# 잠시 후 재시도하면 되는 사유
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "servingLimitExceeded"}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 쿼타 소진이 확인되면 해당 host 호출을 이 시간 동안 바로 실패시킨다
+QUOTA_COOLDOWN_SEC = 3600.0
+
+
+class YouTubeAPIError(RuntimeError):
+    """
+    기존 RuntimeError를 잡던 호출부와 호환되도록 RuntimeError를 상속.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, reason: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class QuotaExceededError(YouTubeAPIError):
+    """403 quotaExceeded / dailyLimitExceeded — 재시도하지 않는다."""
+
+
+class YouTubeClientError(YouTubeAPIError):
+    """400/401/404 등 요청 자체가 잘못된 경우 — 재시도하지 않는다."""
+
+
+class CircuitOpenError(YouTubeAPIError):
+    """host 서킷이 열려 있어 요청을 보내지 않은 경우."""
+
+
+def parse_error_reason(resp: "requests.Response") -> Optional[str]:
+    """
+    {"error": {"errors": [{"reason": "quotaExceeded", ...}], "status": ...}} 에서 reason 추출.
+    """
+    try:
+        err = resp.json().get("error", {})
+    except ValueError:
+        return None
+    if not isinstance(err, dict):
+        return None
+    errors = err.get("errors") or []
+    if errors and isinstance(errors[0], dict) and errors[0].get("reason"):
+        return errors[0]["reason"]
+    return err.get("status")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After: 초 단위 숫자 또는 HTTP-date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def decorrelated_jitter(prev_sleep: float, base: float, cap: float) -> float:
+    """
+    AWS 'decorrelated jitter': sleep = min(cap, U(base, prev * 3)).
+    워커들이 같은 시점에 재시도하지 않도록 흩어준다.
+    """
+    return min(cap, random.uniform(base, max(base, prev_sleep * 3)))
+
+
+class CircuitBreaker:
+    """
+    host별 서킷 브레이커.
+    - 연속 실패 failure_threshold회 → open (cooldown 동안 즉시 실패)
+    - cooldown 이후 half-open: 요청 하나만 통과, 성공하면 close
+      (시험 요청은 record_success / record_failure / trip 중 하나로 반드시 풀어준다)
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self.half_open_inflight = False
+        self.open_reason: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now < self.open_until:
+                return False
+            if self.failures >= self.failure_threshold:
+                # half-open: 한 요청만 시험
+                if self.half_open_inflight:
+                    return False
+                self.half_open_inflight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+            self.half_open_inflight = False
+            self.open_reason = None
+
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            self.failures += 1
+            self.half_open_inflight = False
+            if self.failures >= self.failure_threshold:
+                self.open_until = time.monotonic() + self.cooldown
+                self.open_reason = reason
+
+    def trip(self, seconds: float, reason: str) -> None:
+        with self._lock:
+            self.failures = max(self.failures, self.failure_threshold)
+            self.open_until = time.monotonic() + seconds
+            self.half_open_inflight = False
+            self.open_reason = reason
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(host)
+        if breaker is None:
+            breaker = _BREAKERS[host] = CircuitBreaker()
+        return breaker
+
+
 def request_with_retry(
     url: str,
     params: Dict[str, Any],
     max_retries: int = 3,
-    wait: float = 1.5
+    wait: float = 1.5,
+    max_wait: float = 30.0,
 ) -> Dict[str, Any]:
     """
     공통 retry 로직.
     search_api.py / snapshot 모듈에서 중복되던 코드 제거.
+    매 시도마다 latency / bytes / 쿼타 units / 재시도를 METRICS에 기록한다.
+
+    - 응답 body의 error reason으로 분류
+      · quotaExceeded/dailyLimitExceeded → QuotaExceededError (재시도 없음, host 서킷 open)
+      · rateLimitExceeded, 429, 5xx(backendError), 네트워크 예외 → 재시도
+      · 그 외 4xx → YouTubeClientError (재시도 없음)
+    - 재시도 간격: decorrelated jitter 지수 백오프 (wait ~ max_wait), Retry-After 우선
+    - host별 서킷 브레이커: 연속 실패 시 일정 시간 즉시 실패
     """
+    endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+    units = QUOTA_COSTS.get(endpoint, 0)
+    breaker = get_breaker(url)
+    sleep = wait
+    last_reason = "unknown"
+
     for attempt in range(1, max_retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"서킷 open 상태로 요청 생략: url={url} (reason={breaker.open_reason})",
+                reason=breaker.open_reason,
+            )
+
+        retry_after: Optional[float] = None
+        t0 = time.perf_counter()
         try:
             resp = requests.get(url, params=params, timeout=10)
+            METRICS.record_call(
+                endpoint, str(resp.status_code), time.perf_counter() - t0,
+                nbytes=len(resp.content), quota_units=units,
+            )
 
             if resp.status_code == 200:
+                breaker.record_success()
                 return resp.json()
 
-            # quotaExceeded, rate limit
-            if resp.status_code in (403, 429):
+            reason = parse_error_reason(resp) or str(resp.status_code)
+            last_reason = reason
+
+            if reason in HARD_QUOTA_REASONS:
+                breaker.trip(QUOTA_COOLDOWN_SEC, reason)
+                logger.error("YouTube API 쿼타 소진(status=%s, reason=%s) — 재시도하지 않음",
+                             resp.status_code, reason)
+                raise QuotaExceededError(
+                    f"API 쿼타 소진: url={url}, reason={reason}",
+                    status=resp.status_code, reason=reason,
+                )
+
+            retryable = resp.status_code in RETRYABLE_STATUS or reason in RATE_LIMIT_REASONS
+            if not retryable:
+                # 요청 자체 문제 → host 는 정상 응답했으므로 성공으로 친다 (half-open 시험 요청 해제)
+                breaker.record_success()
                 logger.warning(
-                    "YouTube API 쿼타/리밋(status=%s), 재시도 %d/%d",
-                    resp.status_code, attempt, max_retries
+                    "YouTube 클라이언트 에러(status=%s, reason=%s): %s",
+                    resp.status_code, reason, resp.text[:500]
+                )
+                raise YouTubeClientError(
+                    f"API 요청 실패(status={resp.status_code}, reason={reason}): url={url}",
+                    status=resp.status_code, reason=reason,
                 )
-                time.sleep(wait * attempt)
-                continue
 
-            # 그 외 에러
+            breaker.record_failure(reason)
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
             logger.warning(
-                "YouTube 비정상 응답(status=%s): %s",
-                resp.status_code, resp.text[:500]
+                "YouTube API 일시 오류(status=%s, reason=%s), 재시도 %d/%d",
+                resp.status_code, reason, attempt, max_retries
             )
-            time.sleep(wait * attempt)
 
         except requests.RequestException as e:
+            METRICS.record_call(endpoint, "error", time.perf_counter() - t0)
+            last_reason = type(e).__name__
+            breaker.record_failure(last_reason)
             logger.warning(
                 "요청 예외 발생 %s — 재시도 %d/%d",
                 e, attempt, max_retries
             )
-            time.sleep(wait * attempt)
 
-    raise RuntimeError(f"API 요청 실패: url={url}, params={params}")
+        if attempt < max_retries:
+            METRICS.record_retry(endpoint, last_reason)
+            sleep = decorrelated_jitter(sleep, wait, max_wait)
+            if retry_after is not None:
+                sleep = max(sleep, retry_after)
+            time.sleep(sleep)
+
+    safe_params = {k: v for k, v in params.items() if k != "key"}
+    raise YouTubeAPIError(
+        f"API 요청 실패: url={url}, params={safe_params}, reason={last_reason}",
+        reason=last_reason,
+    )
 
 
 # --------------------------------
@@ -124,14 +328,15 @@ class YouTubeBaseClient:
     검색/상세 조회 공통 요소 담당
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         self.api_key = api_key or load_api_key()
+        self.base_url = (base_url or YOUTUBE_API_BASE).rstrip("/")
 
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         모든 API는 이 경로로 통일해서 들어간다.
         """
-        url = f"{YOUTUBE_API_BASE}/{endpoint}"
+        url = f"{self.base_url}/{endpoint}"
         params["key"] = self.api_key
         return request_with_retry(url, params)
 
@@ -184,15 +389,20 @@ class YouTubeStatsClient(YouTubeBaseClient):
     videos.list 조회 (statistics/snippet/contentDetails)
     """
 
-    def get_video_details(self, video_ids: List[str]) -> Dict[str, Any]:
+    def get_video_details(
+        self,
+        video_ids: List[str],
+        parts: str = "snippet,statistics,contentDetails",
+    ) -> Dict[str, Any]:
         """
         videoIds는 1~50개 단위로 처리
+        정적 필드를 캐시에서 채우는 경우 parts="statistics" 만 요청한다.
         """
         if not video_ids:
             return {"items": []}
 
         params: Dict[str, Any] = {
-            "part": "snippet,statistics,contentDetails",
+            "part": parts,
             "id": ",".join(video_ids),
             "maxResults": len(video_ids)
         }
@@ -200,6 +410,46 @@ class YouTubeStatsClient(YouTubeBaseClient):
         return self._make_request("videos", params)
     
 
+class YouTubeChannelClient(YouTubeBaseClient):
+    """
+    channels.list / playlistItems.list 조회 (채널 업로드 추적용, 호출당 1 unit)
+    """
+
+    def get_uploads_playlists(self, channel_ids: List[str]) -> Dict[str, str]:
+        """
+        channelId(최대 50개) → 업로드 재생목록 ID
+        """
+        if not channel_ids:
+            return {}
+        params: Dict[str, Any] = {
+            "part": "contentDetails",
+            "id": ",".join(channel_ids),
+            "maxResults": len(channel_ids),
+        }
+        data = self._make_request("channels", params)
+        out: Dict[str, str] = {}
+        for item in data.get("items", []):
+            uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            if uploads:
+                out[item["id"]] = uploads
+        return out
+
+    def list_playlist_items(
+        self,
+        playlist_id: str,
+        max_results: int = 50,
+        page_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "part": "contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": max(1, min(max_results, 50)),
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        return self._make_request("playlistItems", params)
+
+
 class YouTubeTrendingClient(YouTubeBaseClient):
     """
     videos.list + chart=mostPopular 전용 클라이언트
@@ -229,17 +479,27 @@ class InnertubeClient:
     비공식 Innertube API를 호출하는 클라이언트.
     INNERTUBE_API_KEY와 context는 config에 저장해두었다고 가정합니다.
     """
-    BASE_URL = "https://www.youtube.com/youtubei/v1"
+    BASE_URL = INNERTUBE_API_BASE
 
-    def __init__(self, api_key: str, context: dict):
+    def __init__(self, api_key: str, context: dict, base_url: Optional[str] = None):
         self.api_key = api_key
         self.context = context
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
 
     def _post(self, endpoint: str, body: dict) -> dict:
-        import requests, json
-        url = f"{self.BASE_URL}/{endpoint}?key={self.api_key}"
+        url = f"{self.base_url}/{endpoint}?key={self.api_key}"
         body["context"] = self.context
-        resp = requests.post(url, json=body, timeout=10)
+        metric_name = f"innertube/{endpoint}"
+        t0 = time.perf_counter()
+        try:
+            resp = requests.post(url, json=body, timeout=10)
+        except requests.RequestException:
+            METRICS.record_call(metric_name, "error", time.perf_counter() - t0)
+            raise
+        METRICS.record_call(
+            metric_name, str(resp.status_code), time.perf_counter() - t0,
+            nbytes=len(resp.content),
+        )
         resp.raise_for_status()
         return resp.json()
 
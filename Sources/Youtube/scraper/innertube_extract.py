@@ -0,0 +1,233 @@
+# 01_Sources/Youtube/scraper/innertube_extract.py
+
+"""
+innertube_extract.py
+
+Innertube browse / next 응답에서 영상 정보만 뽑아
+작은 레코드 리스트로 변환한다.
+
+응답의 대부분은 renderer 보일러플레이트라서 그대로 저장하면
+용량만 크고 후속 단계(Normalized / Scoring)에서 읽을 수 없다.
+응답을 재귀 없이(명시적 스택) 한 번만 순회하며 다음 필드를 만든다.
+
+    {
+      "video_id": "dQw4w9WgXcQ",
+      "title": "...",
+      "channel": "...",
+      "views": 1234567,        # 파싱 실패 시 None
+      "position": 0,           # 응답 내 등장 순서
+      "shelf": "Trending"      # 소속 shelf 제목 (없으면 None)
+    }
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Any, Optional
+
+# 영상 하나를 나타내는 renderer 키
+VIDEO_RENDERER_KEYS = (
+    "videoRenderer",
+    "compactVideoRenderer",
+    "gridVideoRenderer",
+    "reelItemRenderer",
+)
+
+# 하위 영상들을 묶는 shelf 계열 renderer 키
+SHELF_RENDERER_KEYS = (
+    "richShelfRenderer",
+    "shelfRenderer",
+    "reelShelfRenderer",
+    "horizontalCardListRenderer",
+)
+
+VIEW_MULTIPLIERS: Dict[str, int] = {
+    "k": 1_000,
+    "m": 1_000_000,
+    "b": 1_000_000_000,
+    "천": 1_000,
+    "만": 10_000,
+    "억": 100_000_000,
+}
+
+_VIEW_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([kmb천만억])?", re.IGNORECASE)
+
+
+# ------------------------------
+# 텍스트 유틸
+# ------------------------------
+
+def _text(value: Any) -> Optional[str]:
+    """
+    {"simpleText": ...} / {"runs": [{"text": ...}]} / {"content": ...} 를 문자열로.
+    """
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, dict):
+        return None
+    if "simpleText" in value:
+        return value["simpleText"]
+    if "content" in value:
+        return value["content"]
+    runs = value.get("runs")
+    if isinstance(runs, list):
+        return "".join(r.get("text", "") for r in runs if isinstance(r, dict))
+    return None
+
+
+def parse_view_count(text: Optional[str]) -> Optional[int]:
+    """
+    "1,234,567 views", "1.2M views", "조회수 1.2만회", "No views" 등을 정수로 변환.
+    """
+    if not text:
+        return None
+    normalized = text.replace(",", "").strip()
+    if normalized.lower().startswith("no view") or normalized == "조회수 없음":
+        return 0
+    m = _VIEW_RE.search(normalized)
+    if not m:
+        return None
+    try:
+        number = Decimal(m.group(1))
+    except InvalidOperation:
+        return None
+    suffix = (m.group(2) or "").lower()
+    return int(number * VIEW_MULTIPLIERS.get(suffix, 1))
+
+
+# ------------------------------
+# renderer → 레코드
+# ------------------------------
+
+def _record_from_renderer(key: str, r: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    video_id = r.get("videoId")
+    if not isinstance(video_id, str):
+        return None
+
+    if key == "reelItemRenderer":
+        title = _text(r.get("headline"))
+    else:
+        title = _text(r.get("title"))
+
+    channel = (
+        _text(r.get("ownerText"))
+        or _text(r.get("shortBylineText"))
+        or _text(r.get("longBylineText"))
+    )
+    view_text = _text(r.get("viewCountText")) or _text(r.get("shortViewCountText"))
+    return {
+        "video_id": video_id,
+        "title": title,
+        "channel": channel,
+        "views": parse_view_count(view_text),
+    }
+
+
+def _record_from_shorts_lockup(r: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    video_id = (
+        r.get("onTap", {})
+        .get("innertubeCommand", {})
+        .get("reelWatchEndpoint", {})
+        .get("videoId")
+    )
+    if not isinstance(video_id, str):
+        return None
+    overlay = r.get("overlayMetadata", {})
+    return {
+        "video_id": video_id,
+        "title": _text(overlay.get("primaryText")),
+        "channel": None,
+        "views": parse_view_count(_text(overlay.get("secondaryText"))),
+    }
+
+
+def _record_from_lockup(r: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if r.get("contentType") not in (None, "LOCKUP_CONTENT_TYPE_VIDEO"):
+        return None
+    video_id = r.get("contentId")
+    if not isinstance(video_id, str):
+        return None
+
+    meta = r.get("metadata", {}).get("lockupMetadataViewModel", {})
+    rows = (
+        meta.get("metadata", {})
+        .get("contentMetadataViewModel", {})
+        .get("metadataRows", [])
+    )
+    parts: List[str] = []
+    for row in rows:
+        for part in row.get("metadataParts", []):
+            t = _text(part.get("text"))
+            if t:
+                parts.append(t)
+
+    views = None
+    for t in parts:
+        if "view" in t.lower() or "조회수" in t:
+            views = parse_view_count(t)
+            break
+    return {
+        "video_id": video_id,
+        "title": _text(meta.get("title")),
+        "channel": parts[0] if parts else None,
+        "views": views,
+    }
+
+
+def _shelf_title(key: str, r: Dict[str, Any]) -> Optional[str]:
+    if key == "horizontalCardListRenderer":
+        return _text(r.get("header", {}).get("richListHeaderRenderer", {}).get("title"))
+    return _text(r.get("title"))
+
+
+# ------------------------------
+# 순회
+# ------------------------------
+
+def extract_video_records(data: Any) -> List[Dict[str, Any]]:
+    """
+    browse / next 응답을 한 번 순회해 영상 레코드 리스트를 반환한다.
+    같은 videoId가 여러 번 나오면 첫 등장만 남긴다.
+    """
+    records: List[Dict[str, Any]] = []
+    seen = set()
+    # (node, 현재 shelf 제목)
+    stack: List[Any] = [(data, None)]
+
+    while stack:
+        node, shelf = stack.pop()
+
+        if isinstance(node, list):
+            stack.extend((child, shelf) for child in reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        record = None
+        for key in VIDEO_RENDERER_KEYS:
+            if isinstance(node.get(key), dict):
+                record = _record_from_renderer(key, node[key])
+                break
+        else:
+            if isinstance(node.get("shortsLockupViewModel"), dict):
+                record = _record_from_shorts_lockup(node["shortsLockupViewModel"])
+            elif isinstance(node.get("lockupViewModel"), dict):
+                record = _record_from_lockup(node["lockupViewModel"])
+
+        if record is not None:
+            if record["video_id"] not in seen:
+                seen.add(record["video_id"])
+                record["position"] = len(records)
+                record["shelf"] = shelf
+                records.append(record)
+            # 영상 renderer 내부는 더 내려가지 않는다
+            continue
+
+        for key in SHELF_RENDERER_KEYS:
+            if isinstance(node.get(key), dict):
+                shelf = _shelf_title(key, node[key]) or shelf
+                break
+
+        # 등장 순서를 유지하기 위해 역순으로 push
+        stack.extend((child, shelf) for child in reversed(list(node.values())))
+
+    return records
@@ -0,0 +1,216 @@
+# 01_Sources/Youtube/scraper/related_graph_crawler.py
+
+"""
+related_graph_crawler.py
+
+시드 videoId에서 출발해 Innertube /next 응답의 관련 영상 그래프를
+BFS(너비 우선)로 확장 수집한다.
+
+- 동시 요청 수 제한 (max_workers)
+- depth / 노드 수 예산 (max_depth, max_nodes)
+- visited set 기반 중복 방문 방지
+- 엣지는 raw JSON 대신 CSR(indptr / indices) 정수 배열로 저장
+
+추천 그래프를 따라 트렌드가 얼마나 빠르게 퍼지는지 측정하기 위한 용도.
+"""
+
+import logging
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+from Sources.Youtube.api.youtube_client import InnertubeClient
+from Sources.Youtube.scraper.innertube_extract import extract_video_records
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Pipeline.log_setup import setup_logging
+from Sources.Youtube.storage.raw_store import write_raw
+
+HERE = Path(__file__).resolve()
+PROJECT_ROOT = HERE.parents[1]
+RAW_DIR = PROJECT_ROOT / "raw" / "related_graph"
+LOG_DIR = PROJECT_ROOT / "logs"
+
+LOG_FILE = LOG_DIR / "related_graph_crawler.log"
+
+
+def _build_client() -> InnertubeClient:
+    from Sources.Youtube.config.config_loader import load_innertube_config
+    config = load_innertube_config()
+    return InnertubeClient(api_key=config["api_key"], context=config["context"])
+
+
+def _extract_related_ids(data: Dict[str, Any], video_id: str) -> List[str]:
+    """
+    /next 응답에서 관련 영상 videoId를 등장 순서대로 추출한다.
+    """
+    secondary = (
+        data.get("contents", {})
+        .get("twoColumnWatchNextResults", {})
+        .get("secondaryResults")
+    )
+    root = secondary if secondary is not None else data
+    return [
+        r["video_id"]
+        for r in extract_video_records(root)
+        if r["video_id"] != video_id
+    ]
+
+
+# ------------------------------
+# 크롤러
+# ------------------------------
+
+class RelatedGraphCrawler:
+    """
+    관련 영상 그래프 BFS 크롤러.
+
+    노드는 등장 순서대로 0부터 정수 ID가 부여되고,
+    엣지는 source 노드별 인접 리스트(array)로 누적된 뒤 CSR로 변환된다.
+    """
+
+    def __init__(
+        self,
+        client: Optional[InnertubeClient] = None,
+        max_workers: int = 8,
+        max_depth: int = 2,
+        max_nodes: int = 10000,
+        max_related_per_video: int = 20,
+    ):
+        self.client = client or _build_client()
+        self.max_workers = max(1, max_workers)
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_related_per_video = max_related_per_video
+
+        self.node_index: Dict[str, int] = {}
+        self.node_video_ids: List[str] = []
+        self.node_depth = array("H")
+        self.adjacency: Dict[int, array] = {}
+        self.failed: List[str] = []
+
+    def _add_node(self, video_id: str, depth: int) -> Optional[int]:
+        idx = self.node_index.get(video_id)
+        if idx is not None:
+            return idx
+        if len(self.node_video_ids) >= self.max_nodes:
+            return None
+        idx = len(self.node_video_ids)
+        self.node_index[video_id] = idx
+        self.node_video_ids.append(video_id)
+        self.node_depth.append(depth)
+        return idx
+
+    def _fetch(self, video_id: str) -> Optional[List[str]]:
+        try:
+            data = self.client.get_related_videos(video_id)
+        except Exception as e:
+            logging.warning("관련 영상 조회 실패 %s: %s", video_id, e)
+            return None
+        return _extract_related_ids(data, video_id)[: self.max_related_per_video]
+
+    def crawl(self, seed_video_ids: Iterable[str]) -> Dict[str, Any]:
+        seeds: List[str] = []
+        frontier: List[int] = []
+        for vid in seed_video_ids:
+            idx = self._add_node(vid, 0)
+            if idx is not None and vid not in seeds:
+                seeds.append(vid)
+                frontier.append(idx)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for depth in range(self.max_depth):
+                if not frontier:
+                    break
+                logging.info("depth=%d 확장: frontier=%d, nodes=%d",
+                             depth, len(frontier), len(self.node_video_ids))
+
+                frontier_ids = [self.node_video_ids[i] for i in frontier]
+                next_frontier: List[int] = []
+                # map은 입력 순서를 유지 → 노드 ID 부여가 결정적
+                for src, related in zip(frontier, pool.map(self._fetch, frontier_ids)):
+                    if related is None:
+                        self.failed.append(self.node_video_ids[src])
+                        continue
+                    row = array("I")
+                    for vid in related:
+                        is_new = vid not in self.node_index
+                        dst = self._add_node(vid, depth + 1)
+                        if dst is None:
+                            continue
+                        row.append(dst)
+                        if is_new:
+                            next_frontier.append(dst)
+                    self.adjacency[src] = row
+                frontier = next_frontier
+
+        return self.to_csr(seeds)
+
+    def to_csr(self, seeds: List[str]) -> Dict[str, Any]:
+        indptr = array("Q", [0])
+        indices = array("I")
+        for idx in range(len(self.node_video_ids)):
+            row = self.adjacency.get(idx)
+            if row is not None:
+                indices.extend(row)
+            indptr.append(len(indices))
+
+        return {
+            "seeds": seeds,
+            "max_depth": self.max_depth,
+            "max_nodes": self.max_nodes,
+            "node_count": len(self.node_video_ids),
+            "edge_count": len(indices),
+            "node_video_ids": self.node_video_ids,
+            "node_depth": self.node_depth.tolist(),
+            "indptr": indptr.tolist(),
+            "indices": indices.tolist(),
+            "failed": self.failed,
+        }
+
+
+# ------------------------------
+# 시드 / 저장
+# ------------------------------
+
+def load_top_spike_seeds(limit: int = 20) -> List[str]:
+    """
+    스파이크 점수 상위 videoId를 시드로 사용한다.
+    """
+    from Scoring.scoring import run_scoring
+    results = run_scoring(limit_snapshots=5)
+    ranked = sorted(results.items(), key=lambda kv: kv[1]["score"], reverse=True)
+    return [vid for vid, _ in ranked[:limit]]
+
+
+@profiled("crawl_related_graph")
+def crawl_related_graph(
+    seed_video_ids: List[str],
+    max_workers: int = 8,
+    max_depth: int = 2,
+    max_nodes: int = 10000,
+) -> Path:
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    crawler = RelatedGraphCrawler(
+        max_workers=max_workers,
+        max_depth=max_depth,
+        max_nodes=max_nodes,
+    )
+    graph = crawler.crawl(seed_video_ids)
+
+    now_utc = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    graph["fetched_at_utc"] = now_utc
+    out_path = write_raw(RAW_DIR, f"{now_utc}__related_graph", graph, items_key=None)
+    logging.info("관련 영상 그래프 저장: %s (nodes=%d, edges=%d)",
+                 out_path, graph["node_count"], graph["edge_count"])
+    log_run_summary()
+    return out_path
+
+
+if __name__ == "__main__":
+    setup_logging(LOG_FILE, stream=False)
+    seeds = sys.argv[1:] or load_top_spike_seeds(limit=20)
+    print("saved:", crawl_related_graph(seeds))
@@ -7,10 +7,15 @@ Innertube API의 browse 엔드포인트를 사용해
 Shorts 피드를 수집한다.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from Sources.Youtube.api.youtube_client import InnertubeClient
+from Sources.Youtube.scraper.innertube_extract import extract_video_records
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Pipeline.log_setup import setup_logging
+from Sources.Youtube.storage.raw_store import write_raw
 import logging
 
 HERE = Path(__file__).resolve()
@@ -19,29 +24,33 @@ RAW_DIR = PROJECT_ROOT / "raw" / "shorts_feed"
 LOG_DIR = PROJECT_ROOT / "logs"
 
 LOG_FILE = LOG_DIR / "shorts_feed_scraper.log"
-logging.basicConfig(
-    filename=LOG_FILE, level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
 
-from Sources.Youtube.config.config_loader import load_innertube_config
+_client: Optional[InnertubeClient] = None
 
-client = InnertubeClient(
-    api_key=load_innertube_config()["api_key"],
-    context=load_innertube_config()["context"]
-)
+def _get_client() -> InnertubeClient:
+    # config 로딩 / 클라이언트 생성은 처음 수집할 때 한 번만 (import 시점 X)
+    global _client
+    if _client is None:
+        from Sources.Youtube.config.config_loader import load_innertube_config
+        config = load_innertube_config()
+        _client = InnertubeClient(api_key=config["api_key"], context=config["context"])
+    return _client
 
+@profiled("scrape_shorts_feed")
 def scrape_shorts_feed() -> Path:
     RAW_DIR.mkdir(parents=True, exist_ok=True)
-    data = client.get_shorts_feed()
+    data = _get_client().get_shorts_feed()
 
     now_utc = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    filename = f"{now_utc}__shorts_feed.json"
-    out_path = RAW_DIR / filename
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    logging.info("Shorts 저장: %s", out_path)
+    payload = {
+        "fetched_at_utc": now_utc,
+        "items": extract_video_records(data),
+    }
+    out_path = write_raw(RAW_DIR, f"{now_utc}__shorts_feed", payload)
+    logging.info("Shorts 저장: %s (items=%d)", out_path, len(payload["items"]))
+    log_run_summary()
     return out_path
 
 if __name__ == "__main__":
+    setup_logging(LOG_FILE, stream=False)
     scrape_shorts_feed()
@@ -0,0 +1,382 @@
+# 01_Sources/Youtube/storage/catalog.py
+
+"""
+catalog.py
+
+데이터셋 디렉토리별 manifest.
+sorted(dir.glob("*.json")) 로 "최신 파일 / 최근 N개"를 찾던 방식을 대체한다.
+
+디렉토리마다 다음 두 파일을 writer가 유지한다.
+- _catalog.jsonl : append-only 인덱스. 한 줄에 한 파일
+                   {"ts", "region", "item_count", "path", "checksum", "bytes"}
+- _latest.json   : 전체 / region별 최신 entry (O(1) 조회용)
+
+reader
+- latest_path(dir, region)           : _latest.json 한 번 읽기
+- recent_paths(dir, limit, region)   : 최근 N개
+- latest_paths_by_region(dir)        : region 별 최신 파일 (전 지역 일괄 처리용)
+- paths_between(dir, start, end, region) : ts 구간 조회 (bisect)
+
+catalog가 없거나 비어 있는 기존 디렉토리는 list_raw_files() 결과로 fallback 하며,
+rebuild_catalog(dir)로 기존 파일을 한 번 등록해둘 수 있다.
+"_" 로 시작하는 파일은 list_raw_files()에서 제외되므로 데이터 파일과 섞이지 않는다.
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CATALOG_NAME = "_catalog.jsonl"
+LATEST_NAME = "_latest.json"
+LOCK_NAME = "_catalog.lock"
+
+_thread_lock = threading.Lock()
+
+
+def file_checksum(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def stem_timestamp(path: Path) -> str:
+    """
+    파일명 앞의 timestamp ("20250101T000000Z__...") 를 ts로 쓴다.
+    """
+    from Sources.Youtube.storage.raw_store import raw_stem
+    return raw_stem(path).split("__")[0]
+
+
+@contextmanager
+def _locked(dir_path: Path):
+    """
+    같은 디렉토리에 여러 collector가 동시에 쓰는 경우를 대비한 프로세스/스레드 잠금.
+    """
+    with _thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with (dir_path / LOCK_NAME).open("a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _read_latest(dir_path: Path) -> Dict[str, Any]:
+    path = dir_path / LATEST_NAME
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"latest": None, "by_region": {}}
+
+
+def _write_latest(dir_path: Path, latest: Dict[str, Any]) -> None:
+    path = dir_path / LATEST_NAME
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(latest, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _newer(entry: Dict[str, Any], current: Optional[Dict[str, Any]]) -> bool:
+    return current is None or (entry["ts"], entry["path"]) >= (current["ts"], current["path"])
+
+
+# ------------------------------
+# writer
+# ------------------------------
+
+def register(
+    path: Path,
+    ts: Optional[str] = None,
+    region: Optional[str] = None,
+    item_count: Optional[int] = None,
+    checksum: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    방금 쓴 파일을 같은 디렉토리의 catalog에 추가하고 latest 포인터를 갱신한다.
+    checksum을 주지 않으면 파일 내용으로 계산한다.
+    """
+    path = Path(path)
+    dir_path = path.parent
+    if checksum is None:
+        checksum = file_checksum(path.read_bytes())
+    entry = {
+        "ts": ts or stem_timestamp(path),
+        "region": region,
+        "item_count": item_count,
+        "path": path.name,
+        "checksum": checksum,
+        "bytes": path.stat().st_size,
+    }
+    line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    with _locked(dir_path):
+        with (dir_path / CATALOG_NAME).open("a", encoding="utf-8") as f:
+            f.write(line)
+        latest = _read_latest(dir_path)
+        changed = False
+        if _newer(entry, latest.get("latest")):
+            latest["latest"] = entry
+            changed = True
+        if region:
+            by_region = latest.setdefault("by_region", {})
+            if _newer(entry, by_region.get(region)):
+                by_region[region] = entry
+                changed = True
+        if changed:
+            _write_latest(dir_path, latest)
+    return entry
+
+
+# ------------------------------
+# reader
+# ------------------------------
+
+class Catalog:
+    """
+    _catalog.jsonl 을 메모리에 올린 뷰.
+    새로 append된 줄만 이어서 읽으므로 장기 실행 프로세스에서도 재로딩 비용이 작다.
+    """
+
+    def __init__(self, dir_path: Path):
+        self.dir_path = Path(dir_path)
+        self.path = self.dir_path / CATALOG_NAME
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+        self._entries: List[Dict[str, Any]] = []
+        self._keys: List[tuple] = []
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size < self._offset:  # 잘리거나 재작성된 경우 처음부터
+            self._reset()
+        if size == self._offset:
+            return
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # 쓰는 중인 마지막 줄은 다음 refresh 때 읽는다
+        end = chunk.rfind(b"\n") + 1
+        for raw in chunk[:end].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                continue
+            # 같은 파일을 다시 쓴 경우 마지막 등록이 유효
+            self._by_path[entry["path"]] = entry
+        self._offset += end
+        self._entries = sorted(self._by_path.values(), key=lambda e: (e["ts"], e["path"]))
+        self._keys = [(e["ts"], e["path"]) for e in self._entries]
+
+    def entries(self, region: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.refresh()
+        if region is None:
+            return list(self._entries)
+        return [e for e in self._entries if e.get("region") == region]
+
+    def latest(self, region: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        latest = _read_latest(self.dir_path)
+        entry = latest.get("by_region", {}).get(region) if region else latest.get("latest")
+        if entry is not None:
+            return entry
+        entries = self.entries(region)
+        return entries[-1] if entries else None
+
+    def between(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        start <= ts <= end 인 entry를 시간순으로 반환.
+        """
+        self.refresh()
+        lo = bisect.bisect_left(self._keys, (start,)) if start else 0
+        hi = bisect.bisect_right(self._keys, (end, "\uffff")) if end else len(self._keys)
+        rows = self._entries[lo:hi]
+        if region is not None:
+            rows = [e for e in rows if e.get("region") == region]
+        return rows
+
+    def last(self, n: int, region: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.entries(region)[-n:] if n > 0 else []
+
+    def resolve(self, entry: Dict[str, Any]) -> Path:
+        return self.dir_path / entry["path"]
+
+
+_CATALOGS: Dict[Path, Catalog] = {}
+
+
+def get_catalog(dir_path: Path) -> Catalog:
+    key = Path(dir_path).resolve()
+    with _thread_lock:
+        if key not in _CATALOGS:
+            _CATALOGS[key] = Catalog(key)
+        return _CATALOGS[key]
+
+
+def _existing(catalog: Catalog, entries: List[Dict[str, Any]]) -> List[Path]:
+    paths = [catalog.resolve(e) for e in entries]
+    return [p for p in paths if p.exists()]
+
+
+def _legacy_files(dir_path: Path, region: Optional[str]) -> List[Path]:
+    from Sources.Youtube.storage.raw_store import list_raw_files, raw_stem
+    files = list_raw_files(dir_path)
+    if region is not None:
+        # catalog 없는 기존 파일은 파일명 끝의 region ("..._KR")으로만 거른다
+        files = [p for p in files if raw_stem(p).endswith(f"_{region}")]
+    return files
+
+
+def latest_path(dir_path: Path, region: Optional[str] = None) -> Optional[Path]:
+    catalog = get_catalog(dir_path)
+    if catalog.exists():
+        entry = catalog.latest(region)
+        if entry is not None:
+            path = catalog.resolve(entry)
+            if path.exists():
+                return path
+    files = _legacy_files(dir_path, region)
+    return files[-1] if files else None
+
+
+def latest_paths_by_region(dir_path: Path) -> Dict[str, Path]:
+    """
+    region 별 최신 파일. catalog 가 없으면 파일명 끝의 region ("..._KR") 기준.
+    """
+    catalog = get_catalog(dir_path)
+    out: Dict[str, Path] = {}
+    if catalog.exists():
+        # 시간순이므로 뒤의 entry가 덮어쓴다. stat 은 region 별 마지막 entry 만
+        entries = catalog.entries()
+        last: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            region = entry.get("region")
+            if region:
+                last[region] = entry
+        missing: List[str] = []
+        for region, entry in last.items():
+            path = catalog.resolve(entry)
+            if path.exists():
+                out[region] = path
+            else:
+                missing.append(region)
+        # 최신 파일이 지워진 region 만 이전 entry 로 거슬러 올라간다
+        for region in missing:
+            for entry in reversed(entries):
+                if entry.get("region") != region:
+                    continue
+                path = catalog.resolve(entry)
+                if path.exists():
+                    out[region] = path
+                    break
+        if out:
+            return out
+    from Sources.Youtube.storage.raw_store import raw_stem
+    for path in _legacy_files(dir_path, None):
+        stem = raw_stem(path)
+        if "_" in stem.split("__")[-1]:
+            out[stem.rsplit("_", 1)[-1]] = path
+    return out
+
+
+def recent_paths(dir_path: Path, limit: int, region: Optional[str] = None) -> List[Path]:
+    catalog = get_catalog(dir_path)
+    if catalog.exists():
+        paths = _existing(catalog, catalog.last(limit, region))
+        if len(paths) >= limit:
+            return paths
+    # catalog 도입 전 파일이 섞여 있을 수 있으므로 부족하면 파일 목록 기준
+    return _legacy_files(dir_path, region)[-limit:] if limit > 0 else []
+
+
+def paths_between(
+    dir_path: Path,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    region: Optional[str] = None,
+) -> List[Path]:
+    catalog = get_catalog(dir_path)
+    if catalog.exists():
+        return _existing(catalog, catalog.between(start, end, region))
+    files = _legacy_files(dir_path, region)
+    return [
+        p for p in files
+        if (not start or stem_timestamp(p) >= start) and (not end or stem_timestamp(p) <= end)
+    ]
+
+
+def rebuild_catalog(dir_path: Path) -> int:
+    """
+    catalog에 없는 기존 파일을 등록한다. 등록한 파일 수를 반환.
+    """
+    from Sources.Youtube.storage.raw_store import list_raw_files, read_raw
+    dir_path = Path(dir_path)
+    catalog = get_catalog(dir_path)
+    known = {e["path"] for e in catalog.entries()}
+    added = 0
+    for path in list_raw_files(dir_path):
+        if path.name in known:
+            continue
+        try:
+            data = read_raw(path)
+        except Exception:
+            continue
+        items = data.get("items", data.get("topics", data.get("videos"))) if isinstance(data, dict) else None
+        register(
+            path,
+            ts=stem_timestamp(path),
+            region=data.get("region_code") if isinstance(data, dict) else None,
+            item_count=len(items) if items is not None else None,
+        )
+        added += 1
+    return added
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="디렉토리의 기존 파일을 catalog 에 등록")
+    parser.add_argument("dirs", nargs="+", type=Path, help="raw 디렉토리 (예: raw/trending)")
+    args = parser.parse_args(argv)
+
+    for dir_path in args.dirs:
+        if not dir_path.is_dir():
+            parser.error(f"디렉토리가 아닙니다: {dir_path}")
+    for dir_path in args.dirs:
+        print(f"{dir_path}: {rebuild_catalog(dir_path)} files registered")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+# 01_Sources/Youtube/storage/fulltext_index.py
+
+"""
+fulltext_index.py
+
+수집한 영상의 제목 / 설명 / 태그 / 채널 전문 검색 인덱스. (SQLite FTS5)
+
+"X를 언급한 영상"을 찾으려고 raw/search, raw/trending, raw/yt_dlp_meta 를
+통째로 grep 하던 것을 대신한다.
+
+- 토큰화는 trending_topics 와 같다. (Normalized.text_tokens) (소문자, 영숫자/한글 외 공백, 1글자·불용어 제거)
+  토큰을 공백으로 이어 FTS5(unicode61)에 넣으므로 인덱스 토큰 = 토픽 키워드.
+  한글은 조사가 붙어 있으므로("게임을") search(..., prefix=True) 로 접두어 검색한다.
+- 영상당 문서 하나. 내용 해시가 같으면 다시 쓰지 않으므로
+  매시간 같은 트렌딩 영상이 들어와도 비용이 거의 없다.
+- 수집기는 저장 직후 add_file(out_path, payload) 로 증분 반영한다.
+  반영한 파일명은 ingested 테이블에 남고, update_from_dirs() 는 빠진 파일만 채운다.
+  수집기 쪽 색인 실패(DB 잠김, FTS5 미지원 SQLite 등)는 경고만 남기고
+  (index_raw_file) 다음 update_from_dirs() 가 채운다. raw 저장은 실패시키지 않는다.
+
+    python -m Sources.Youtube.storage.fulltext_index update
+    python -m Sources.Youtube.storage.fulltext_index search "원피스" --prefix
+    python -m Sources.Youtube.storage.fulltext_index topic "원피스"
+"""
+
+import argparse
+import hashlib
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from Sources.Youtube.storage.raw_store import RAW_ROOT, read_raw, list_raw_files
+from Normalized.text_tokens import tokenize as _tokenize
+
+DEFAULT_INDEX_PATH = RAW_ROOT / "_fulltext.sqlite3"
+INDEXED_DIRS = ("search", "trending", "yt_dlp_meta")
+FIELDS = ("title", "description", "tags", "channel")
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    doc_id     INTEGER PRIMARY KEY,
+    video_id   TEXT NOT NULL UNIQUE,
+    title      TEXT,
+    channel    TEXT,
+    digest     TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    title, description, tags, channel,
+    tokenize = 'unicode61 remove_diacritics 0',
+    prefix = '2 3'
+);
+CREATE TABLE IF NOT EXISTS ingested (
+    file TEXT PRIMARY KEY, indexed_at REAL NOT NULL
+);
+"""
+
+
+# ------------------------------
+# 문서 추출
+# ------------------------------
+
+def document_from_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    videos.list item(snippet) 또는 yt-dlp -J 결과에서 색인 문서를 만든다.
+    제목이 없으면 None. (statistics 만 있는 item 등)
+    """
+    vid = item.get("id")
+    if not isinstance(vid, str):
+        return None
+    snippet = item.get("snippet")
+    if isinstance(snippet, dict):
+        src, channel = snippet, snippet.get("channelTitle")
+    else:
+        src, channel = item, item.get("channel") or item.get("uploader")
+    title = src.get("title")
+    if not title:
+        return None
+    return {
+        "video_id": vid,
+        "title": title,
+        "description": src.get("description") or "",
+        "tags": [t for t in (src.get("tags") or []) if isinstance(t, str)],
+        "channel": channel or "",
+    }
+
+
+def _token_text(text: str) -> str:
+    return " ".join(_tokenize(text or ""))
+
+
+def _match_expr(query: str, prefix: bool, fields: Optional[Iterable[str]]) -> Optional[str]:
+    """
+    query를 같은 규칙으로 토큰화해 AND 로 묶은 FTS5 MATCH 식. 토큰이 없으면 None.
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        return None
+    star = "*" if prefix else ""
+    expr = " ".join(f'"{t}"{star}' for t in tokens)
+    if fields:
+        cols = [f for f in fields if f in FIELDS]
+        if cols:
+            expr = "{" + " ".join(cols) + "}: (" + expr + ")"
+    return expr
+
+
+class FullTextIndex:
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "FullTextIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------
+    # 쓰기
+    # ------------------------------
+
+    def add_documents(self, docs: Iterable[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """
+        문서를 upsert 한다. 내용이 바뀐 (또는 새) 영상 수를 반환.
+        """
+        now = time.time() if now is None else now
+        rows: Dict[str, Tuple] = {}
+        for doc in docs:
+            fields = (
+                _token_text(doc["title"]),
+                _token_text(doc.get("description", "")),
+                _token_text(" ".join(doc.get("tags", []))),
+                _token_text(doc.get("channel", "")),
+            )
+            digest = hashlib.blake2b("\x00".join(fields).encode("utf-8"), digest_size=12).hexdigest()
+            # 같은 배치에 같은 영상이 여러 번 있으면 마지막 것
+            rows[doc["video_id"]] = (doc, fields, digest)
+
+        changed = 0
+        with self._lock, self._conn:
+            conn = self._conn
+            for vid, (doc, fields, digest) in rows.items():
+                row = conn.execute("SELECT doc_id, digest FROM videos WHERE video_id = ?", (vid,)).fetchone()
+                if row is not None and row[1] == digest:
+                    continue
+                if row is None:
+                    rowid = conn.execute(
+                        "INSERT INTO videos (video_id, title, channel, digest, updated_at) VALUES (?,?,?,?,?)",
+                        (vid, doc["title"], doc.get("channel", ""), digest, now),
+                    ).lastrowid
+                else:
+                    rowid = row[0]
+                    conn.execute(
+                        "UPDATE videos SET title = ?, channel = ?, digest = ?, updated_at = ? WHERE doc_id = ?",
+                        (doc["title"], doc.get("channel", ""), digest, now, rowid),
+                    )
+                    conn.execute("DELETE FROM docs WHERE rowid = ?", (rowid,))
+                conn.execute(
+                    "INSERT INTO docs (rowid, title, description, tags, channel) VALUES (?,?,?,?,?)",
+                    (rowid,) + fields,
+                )
+                changed += 1
+        return changed
+
+    def add_items(self, items: Iterable[Dict[str, Any]]) -> int:
+        return self.add_documents(d for d in map(document_from_item, items) if d is not None)
+
+    def add_file(self, path: Path, payload: Optional[Dict[str, Any]] = None) -> int:
+        """
+        raw 파일 하나를 반영하고 ingested 에 기록한다.
+        payload 를 주면 파일을 다시 읽지 않는다. (수집기 저장 직후 호출용)
+        """
+        path = Path(path)
+        if payload is None:
+            payload = read_raw(path)
+        items = payload.get("items")
+        # yt_dlp_meta 는 items 없이 영상 하나의 dict
+        changed = self.add_items(items if isinstance(items, list) else [payload])
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested VALUES (?, ?)",
+                (f"{path.parent.name}/{path.name}", time.time()),
+            )
+        return changed
+
+    def update_from_dirs(self, raw_root: Path = RAW_ROOT, dirs: Iterable[str] = INDEXED_DIRS) -> int:
+        """
+        아직 반영하지 않은 raw 파일만 반영한다. 반영한 파일 수를 반환.
+        """
+        with self._lock:
+            done = {row[0] for row in self._conn.execute("SELECT file FROM ingested")}
+        added = 0
+        for name in dirs:
+            for path in list_raw_files(Path(raw_root) / name):
+                if f"{name}/{path.name}" in done:
+                    continue
+                try:
+                    self.add_file(path)
+                    added += 1
+                except Exception as e:
+                    logger.warning("색인 실패 %s: %s", path, e)
+        return added
+
+    # ------------------------------
+    # 조회
+    # ------------------------------
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        prefix: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        모든 토큰을 포함하는 영상을 bm25 순으로. (score 는 작을수록 관련도 높음)
+        """
+        expr = _match_expr(query, prefix, fields)
+        if expr is None:
+            return []
+        sql = (
+            "SELECT v.video_id, v.title, v.channel, bm25(docs, 10.0, 1.0, 4.0, 2.0) AS score "
+            "FROM docs JOIN videos v ON v.doc_id = docs.rowid "
+            "WHERE docs MATCH ? ORDER BY score LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (expr, limit)).fetchall()
+        return [
+            {"video_id": vid, "title": title, "channel": channel, "score": round(score, 4)}
+            for vid, title, channel, score in rows
+        ]
+
+    def count(self, query: str, prefix: bool = False, fields: Optional[Iterable[str]] = None) -> int:
+        expr = _match_expr(query, prefix, fields)
+        if expr is None:
+            return 0
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM docs WHERE docs MATCH ?", (expr,)).fetchone()
+        return n
+
+    def adhoc_topic(self, query: str, limit: int = 200, prefix: bool = True, top_k: int = 10) -> Dict[str, Any]:
+        """
+        검색 결과로 trending_topics 토픽과 같은 모양의 임시 토픽을 만든다.
+        (검색 기반 토픽 seed / 검색어 확장용 연관 키워드)
+        """
+        hits = self.search(query, limit=limit, prefix=prefix)
+        query_tokens = set(_tokenize(query))
+        keywords: Counter = Counter()
+        if hits:
+            with self._lock:
+                texts = self._conn.execute(
+                    "SELECT d.title, d.tags FROM docs d JOIN videos v ON v.doc_id = d.rowid "
+                    f"WHERE v.video_id IN ({','.join('?' * len(hits))})",
+                    [h["video_id"] for h in hits],
+                ).fetchall()
+            for title, tags in texts:
+                keywords.update(t for t in set((title + " " + tags).split()) if t not in query_tokens)
+        return {
+            "topic_id": f"search_{'_'.join(sorted(query_tokens)) or 'empty'}",
+            "label": query,
+            "video_count": len(hits),
+            "video_ids": [h["video_id"] for h in hits],
+            "top_keywords": [kw for kw, _ in keywords.most_common(top_k)],
+        }
+
+
+def index_raw_file(path: Path, payload: Optional[Dict[str, Any]] = None) -> int:
+    """
+    수집기가 raw 저장 직후 호출. 색인에 실패해도 예외를 올리지 않고 0.
+    (이미 저장한 데이터로 수집기를 실패시키지 않는다. 빠진 파일은 update_from_dirs 가 채움)
+    """
+    try:
+        with FullTextIndex() as index:
+            return index.add_file(path, payload)
+    except Exception as e:
+        logger.warning("전문 검색 색인 실패 %s (update_from_dirs 로 다시 반영): %s", path, e)
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="영상 전문 검색 인덱스")
+    parser.add_argument("command", choices=["update", "search", "topic"])
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("--prefix", action="store_true", help="접두어 검색 (한글 조사 대응)")
+    parser.add_argument("--field", action="append", choices=FIELDS)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with FullTextIndex() as index:
+        if args.command == "update":
+            print(f"indexed {index.update_from_dirs()} files")
+        elif not args.query:
+            parser.error(f"{args.command} 는 query 가 필요합니다.")
+        elif args.command == "search":
+            t0 = time.perf_counter()
+            hits = index.search(args.query, args.limit, args.prefix, args.field)
+            for h in hits:
+                print(f"{h['score']:8.3f} {h['video_id']} [{h['channel']}] {h['title']}")
+            print(f"{len(hits)} hits ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        else:
+            print(index.adhoc_topic(args.query, limit=args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
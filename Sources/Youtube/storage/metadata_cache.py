@@ -0,0 +1,269 @@
+# 01_Sources/Youtube/storage/metadata_cache.py
+
+"""
+metadata_cache.py
+
+영상별 정적 메타데이터(snippet / contentDetails) 로컬 캐시. (SQLite)
+
+제목, 채널, 카테고리, 길이, 게시 시각은 거의 바뀌지 않는데
+search_and_collect / collect_trending / run_snapshot 이 매번 다시 받아오고 있었다.
+
+- put_items(items)      : videos.list 응답 item의 snippet/contentDetails 저장
+- fetch_details(...)    : TTL 안의 캐시 ID는 part=statistics 만 요청하고
+                          캐시 정적 필드와 합쳐서 원래 item 형태로 돌려준다.
+                          캐시 miss / 만료 ID만 전체 part 요청.
+- plan_batches / iter_batches : 위 요청 계획과 배치 단위 실행 (run_snapshot 스트리밍 / 재개용)
+- lookup(ids)           : Normalized / Insights 용 제목·카테고리 빠른 조회 (TTL 무관)
+- evict()               : 오래 만료된 항목 삭제 + max_entries 초과분 LRU 삭제
+
+videos.list 쿼타는 part와 무관하게 호출당 1 unit이므로,
+statistics 배치의 자투리 캐시 ID는 전체 part 배치에 채워 넣는다.
+(호출 수는 나누지 않을 때와 같고, 마지막 배치를 빼고는 50개가 꽉 찬다)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Callable, Tuple
+
+from Sources.Youtube.storage.raw_store import RAW_ROOT
+
+DEFAULT_CACHE_PATH = RAW_ROOT / "_metadata_cache.sqlite3"
+FULL_PARTS = "snippet,statistics,contentDetails"
+VOLATILE_PARTS = "statistics"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id        TEXT PRIMARY KEY,
+    title           TEXT,
+    channel_id      TEXT,
+    channel_title   TEXT,
+    category_id     TEXT,
+    published_at    TEXT,
+    duration        TEXT,
+    snippet         TEXT NOT NULL,
+    content_details TEXT NOT NULL,
+    fetched_at      REAL NOT NULL,
+    last_access     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_videos_last_access ON videos(last_access);
+"""
+
+LOOKUP_FIELDS = ("title", "channel_id", "channel_title", "category_id", "published_at", "duration")
+
+
+class MetadataCache:
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_sec: float = 7 * 24 * 3600,
+        max_entries: int = 500_000,
+    ):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "MetadataCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------
+    # 쓰기
+    # ------------------------------
+
+    def put_items(self, items: Iterable[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """
+        snippet이 있는 item만 저장한다. 저장한 수를 반환.
+        """
+        now = time.time() if now is None else now
+        rows = []
+        for item in items:
+            vid = item.get("id")
+            snippet = item.get("snippet")
+            if not isinstance(vid, str) or not snippet:
+                continue
+            details = item.get("contentDetails") or {}
+            rows.append((
+                vid,
+                snippet.get("title"),
+                snippet.get("channelId"),
+                snippet.get("channelTitle"),
+                snippet.get("categoryId") or item.get("__category_id_from_request"),
+                snippet.get("publishedAt"),
+                details.get("duration"),
+                json.dumps(snippet, ensure_ascii=False, separators=(",", ":")),
+                json.dumps(details, ensure_ascii=False, separators=(",", ":")),
+                now,
+                now,
+            ))
+        if rows:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO videos VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows
+                )
+        return len(rows)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        TTL의 4배 넘게 갱신되지 않은 항목과, max_entries 초과분(오래 안 쓴 순)을 삭제한다.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM videos WHERE fetched_at < ?", (now - 4 * self.ttl_sec,)
+            ).rowcount
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()
+            if count > self.max_entries:
+                removed += self._conn.execute(
+                    "DELETE FROM videos WHERE video_id IN "
+                    "(SELECT video_id FROM videos ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        return removed
+
+    # ------------------------------
+    # 읽기
+    # ------------------------------
+
+    def _select(self, columns: str, video_ids: List[str]) -> List[Tuple]:
+        rows: List[Tuple] = []
+        # SQLite 변수 개수 제한 대비
+        for i in range(0, len(video_ids), 500):
+            chunk = video_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows.extend(self._conn.execute(
+                    f"SELECT {columns} FROM videos WHERE video_id IN ({marks})", chunk
+                ).fetchall())
+        return rows
+
+    def get_static(self, video_ids: List[str], now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        TTL 안의 항목만 {vid: {"snippet", "contentDetails"}} 로 반환하고 last_access 갱신.
+        """
+        now = time.time() if now is None else now
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for vid, snippet, details, fetched_at in self._select(
+            "video_id, snippet, content_details, fetched_at", video_ids
+        ):
+            if fetched_at + self.ttl_sec >= now:
+                fresh[vid] = {"snippet": json.loads(snippet), "contentDetails": json.loads(details)}
+        if fresh:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE videos SET last_access = ? WHERE video_id = ?",
+                    [(now, vid) for vid in fresh],
+                )
+        return fresh
+
+    def lookup(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        제목 / 채널 / 카테고리 등 조회용 필드. TTL과 무관하게 있는 값을 돌려준다.
+        """
+        cols = ", ".join(("video_id",) + LOOKUP_FIELDS)
+        return {row[0]: dict(zip(LOOKUP_FIELDS, row[1:])) for row in self._select(cols, video_ids)}
+
+    # ------------------------------
+    # videos.list 연동
+    # ------------------------------
+
+    def fresh_ids(self, video_ids: List[str], now: Optional[float] = None) -> set:
+        """
+        TTL 안의 캐시 ID. (snippet JSON은 읽지 않는다)
+        """
+        now = time.time() if now is None else now
+        return {
+            vid for vid, fetched_at in self._select("video_id, fetched_at", video_ids)
+            if fetched_at + self.ttl_sec >= now
+        }
+
+    def plan_batches(
+        self,
+        video_ids: List[str],
+        batch_size: int = 50,
+        now: Optional[float] = None,
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        videos.list 요청 계획 [(parts, ids), ...].
+        캐시 ID는 statistics 배치, 나머지는 전체 part 배치로 나누되
+        statistics 배치의 자투리는 전체 part 배치에 채운다.
+        마지막 배치를 빼고는 batch_size 개가 꽉 차므로 호출 수는 ceil(len / batch_size).
+        """
+        fresh = self.fresh_ids(video_ids, now)
+        cached_ids = [v for v in video_ids if v in fresh]
+        missing_ids = [v for v in video_ids if v not in fresh]
+
+        # 자투리를 따로 보내면 부분 배치가 두 개 생겨 호출(=쿼타)이 하나 늘어난다
+        tail = len(cached_ids) % batch_size
+        if tail and missing_ids:
+            cached_ids, missing_ids = cached_ids[:-tail], cached_ids[-tail:] + missing_ids
+
+        return [
+            (parts, ids[i:i + batch_size])
+            for parts, ids in ((VOLATILE_PARTS, cached_ids), (FULL_PARTS, missing_ids))
+            for i in range(0, len(ids), batch_size)
+        ]
+
+    def iter_batches(
+        self,
+        client: Any,
+        plan: List[Tuple[str, List[str]]],
+        start: int = 0,
+        delay_sec: float = 0.0,
+    ) -> Iterator[Tuple[int, List[str], List[Dict[str, Any]]]]:
+        """
+        plan[start:] 를 순서대로 요청해 (배치 번호, 요청 ID, 응답 item) 을 yield 한다.
+        정적 필드는 배치마다 캐시에서 읽으므로 메모리는 배치 하나 분량만 쓴다.
+        """
+        now = time.time()
+        for n in range(start, len(plan)):
+            if n > start and delay_sec:
+                time.sleep(delay_sec)
+            parts, batch = plan[n]
+            items = client.get_video_details(batch, parts=parts).get("items", [])
+            if parts == FULL_PARTS:
+                self.put_items(items, now)
+            else:
+                # 계획 이후 만료/삭제된 항목은 statistics 만 남는다
+                static = self.get_static(batch, now)
+                for item in items:
+                    cached = static.get(item.get("id"))
+                    if cached:
+                        item.update(cached)
+            yield n, batch, items
+
+    def fetch_details(
+        self,
+        client: Any,
+        video_ids: List[str],
+        batch_size: int = 50,
+        on_batch: Optional[Callable[[List[str], List[Dict[str, Any]]], None]] = None,
+        delay_sec: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        client.get_video_details(ids, parts=...) 로 상세 정보를 조회한다.
+        반환 item은 캐시 여부와 무관하게 snippet / statistics / contentDetails 를 모두 가진다.
+        on_batch(요청 ID, 응답 item) 은 요청 배치마다 호출된다.
+        """
+        out: List[Dict[str, Any]] = []
+        plan = self.plan_batches(video_ids, batch_size)
+        for _, batch, items in self.iter_batches(client, plan, delay_sec=delay_sec):
+            if on_batch is not None:
+                on_batch(batch, items)
+            out.extend(items)
+        return out
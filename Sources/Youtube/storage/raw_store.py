@@ -0,0 +1,254 @@
+# 01_Sources/Youtube/storage/raw_store.py
+
+"""
+raw_store.py
+
+raw/ 아래 수집 결과 공통 저장/로딩 레이어.
+search_api, trending_api, video_stats_snapshot, scraper 계열, yt_dlp_wrapper가
+모두 이 모듈을 통해 파일을 쓴다.
+
+- indent 없는 compact JSON + 파일 단위 압축 (zstandard 설치 시 .json.zst, 없으면 .json.gz)
+  파일 하나가 payload 전체를 담으므로 디렉토리만 복사해도 그대로 읽힌다.
+- dedupe_items=True (선택) : payload["items"]의 각 item을 content hash로
+  out_dir/_objects/ 에 한 번만 저장하고 본 파일에는 해시 목록("__item_refs")만 남긴다.
+  내용이 바뀌지 않는 정적 payload 용. 조회수 등 통계가 들어간 item은 거의 매번 달라
+  파일 수와 용량만 늘어나므로 기본값은 끔.
+- read_raw()는 기존 .json, .json.gz, .json.zst 를 모두 읽고 item ref를 풀어서
+  원래 payload 형태로 돌려준다. (예전 raw/_objects/ 에 저장된 ref도 읽는다)
+- write_raw()는 저장한 파일을 디렉토리 catalog(_catalog.jsonl)에 등록한다. (catalog.py)
+- write_raw_stream()은 item을 iterable로 받아 item 전체를 메모리에 올리지 않고 저장한다.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.catalog import register, file_checksum
+
+
+HERE = Path(__file__).resolve()
+PROJECT_ROOT = HERE.parents[1]   # .../01_Sources/Youtube
+RAW_ROOT = PROJECT_ROOT / "raw"
+OBJECTS_NAME = "_objects"
+LEGACY_OBJECTS_DIR = RAW_ROOT / OBJECTS_NAME  # 예전 전역 object store (읽기 전용)
+
+ITEM_REFS_KEY = "__item_refs"
+RAW_SUFFIXES = (".json", ".json.gz", ".json.zst")
+DEFAULT_SUFFIX = ".json.zst" if zstandard is not None else ".json.gz"
+
+
+# ------------------------------
+# 인코딩 / 압축
+# ------------------------------
+
+def dumps_compact(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(obj: Any) -> str:
+    """
+    key 순서와 무관한 canonical JSON 기준 해시.
+    """
+    canonical = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard 패키지가 없어 .zst 로 저장할 수 없습니다.")
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if suffix.endswith(".gz"):
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    return data
+
+
+def _decompress(data: bytes, path: Path) -> bytes:
+    name = path.name
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard 패키지가 없어 읽을 수 없습니다: {path}")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if name.endswith(".gz"):
+        return gzip.decompress(data)
+    return data
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# ------------------------------
+# item object store
+# ------------------------------
+
+def _object_path(objects_dir: Path, digest: str) -> Path:
+    return objects_dir / digest[:2] / f"{digest}{DEFAULT_SUFFIX}"
+
+
+def _find_object(objects_dir: Path, digest: str) -> Optional[Path]:
+    for base in (objects_dir, LEGACY_OBJECTS_DIR):
+        for suffix in (".json.zst", ".json.gz"):
+            path = base / digest[:2] / f"{digest}{suffix}"
+            if path.exists():
+                return path
+    return None
+
+
+def put_object(objects_dir: Path, obj: Any) -> str:
+    digest = content_hash(obj)
+    if _find_object(objects_dir, digest) is None:
+        _atomic_write(_object_path(objects_dir, digest), _compress(dumps_compact(obj), DEFAULT_SUFFIX))
+    return digest
+
+
+@lru_cache(maxsize=8192)
+def _load_object_bytes(objects_dir: Path, digest: str) -> bytes:
+    path = _find_object(objects_dir, digest)
+    if path is None:
+        raise FileNotFoundError(f"raw object가 없습니다: {objects_dir / digest}")
+    return _decompress(path.read_bytes(), path)
+
+
+def get_object(objects_dir: Path, digest: str) -> Any:
+    # 캐시는 bytes로 두고 매번 새 객체를 만들어 호출 측 수정이 캐시에 번지지 않게 한다
+    return json.loads(_load_object_bytes(objects_dir, digest))
+
+
+# ------------------------------
+# 저장 / 로딩
+# ------------------------------
+
+@profiled("write_raw")
+def write_raw(
+    out_dir: Path,
+    stem: str,
+    payload: Dict[str, Any],
+    items_key: Optional[str] = "items",
+    dedupe_items: bool = False,
+    catalog: bool = True,
+) -> Path:
+    """
+    payload를 out_dir/{stem}.json.(zst|gz) 로 저장하고 경로를 반환한다.
+    dedupe_items=True면 items_key 리스트의 item은 out_dir/_objects 로 분리 저장한다.
+    catalog=True면 stem 앞의 timestamp / payload의 region_code로 catalog에 등록한다.
+    """
+    body = payload
+    items = payload.get(items_key) if items_key else None
+    if dedupe_items and isinstance(items, list):
+        body = {k: v for k, v in payload.items() if k != items_key}
+        body[ITEM_REFS_KEY] = {
+            "key": items_key,
+            "refs": [put_object(Path(out_dir) / OBJECTS_NAME, item) for item in items],
+        }
+
+    return _write_body(
+        out_dir, stem, body, payload.get("region_code"),
+        len(items) if isinstance(items, list) else None, catalog,
+    )
+
+
+def write_raw_stream(
+    out_dir: Path,
+    stem: str,
+    header: Dict[str, Any],
+    items: Iterable[Dict[str, Any]],
+    items_key: str = "items",
+    catalog: bool = True,
+) -> Path:
+    """
+    write_raw 와 같은 파일을 만들되 item을 iterable로 받아 압축 스트림에 하나씩 쓴다.
+    item 전체를 메모리에 올리지 않는다.
+    read_raw 결과는 write_raw(out_dir, stem, {**header, items_key: list(items)}) 와 같다.
+    """
+    out_path = Path(out_dir) / f"{stem}{DEFAULT_SUFFIX}"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    head = {k: v for k, v in header.items() if k != items_key}
+    prefix = dumps_compact(head)[:-1] + (b"," if head else b"")
+
+    count = 0
+    with tmp.open("wb") as raw, _compressing_writer(raw, DEFAULT_SUFFIX) as f:
+        f.write(prefix + dumps_compact(items_key) + b":[")
+        for item in items:
+            f.write((b"," if count else b"") + dumps_compact(item))
+            count += 1
+        f.write(b"]}")
+    os.replace(tmp, out_path)
+
+    if catalog:
+        register(out_path, region=header.get("region_code"), item_count=count)
+    return out_path
+
+
+def _compressing_writer(f: BinaryIO, suffix: str) -> BinaryIO:
+    if suffix.endswith(".zst"):
+        return zstandard.ZstdCompressor(level=3).stream_writer(f)
+    if suffix.endswith(".gz"):
+        return gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0)
+    return f
+
+
+def _write_body(
+    out_dir: Path,
+    stem: str,
+    body: Dict[str, Any],
+    region: Optional[str],
+    item_count: Optional[int],
+    catalog: bool,
+) -> Path:
+    out_path = Path(out_dir) / f"{stem}{DEFAULT_SUFFIX}"
+    data = _compress(dumps_compact(body), DEFAULT_SUFFIX)
+    _atomic_write(out_path, data)
+    if catalog:
+        register(out_path, region=region, item_count=item_count, checksum=file_checksum(data))
+    return out_path
+
+
+@profiled("read_raw", count=lambda d: len(d.get("items", [])) if isinstance(d, dict) else 0)
+def read_raw(path: Path) -> Dict[str, Any]:
+    """
+    압축 여부/저장 포맷과 무관하게 원래 payload를 돌려준다.
+    """
+    path = Path(path)
+    data = json.loads(_decompress(path.read_bytes(), path))
+    refs = data.pop(ITEM_REFS_KEY, None) if isinstance(data, dict) else None
+    if refs is not None:
+        objects_dir = path.parent / OBJECTS_NAME
+        data[refs["key"]] = [get_object(objects_dir, d) for d in refs["refs"]]
+    return data
+
+
+def raw_stem(path: Path) -> str:
+    name = Path(path).name
+    for suffix in sorted(RAW_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return Path(path).stem
+
+
+def list_raw_files(dir_path: Path) -> List[Path]:
+    """
+    dir_path 아래 raw 파일(.json / .json.gz / .json.zst)을 파일명 순으로 반환.
+    """
+    dir_path = Path(dir_path)
+    if not dir_path.exists():
+        return []
+    files = [
+        p for p in dir_path.iterdir()
+        if p.is_file() and not p.name.startswith((".", "_")) and p.name.endswith(RAW_SUFFIXES)
+    ]
+    return sorted(files, key=lambda p: p.name)
@@ -0,0 +1,114 @@
+# 01_Sources/Youtube/storage/tombstones.py
+
+"""
+tombstones.py
+
+videos.list 응답에서 빠지는(삭제 / 비공개 / 지역 차단) 영상 ID 관리.
+
+- 요청했는데 응답에 없는 ID는 miss 카운트를 올리고,
+  miss_threshold 회 연속이면 tombstone 으로 옮긴다. (일시적 누락 대비)
+- tombstone ID는 평소 요청 대상에서 빠지고, next_check 시각이 되면 다시 요청한다.
+  재확인에도 없으면 간격을 두 배로 늘린다. (recheck_base_sec ~ recheck_max_sec)
+- 다시 응답에 나타나면 즉시 복구.
+
+상태는 {dir}/_tombstones.json 하나에 저장한다.
+("_" 접두어라 list_raw_files / catalog 대상에서 제외된다)
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+TOMBSTONE_NAME = "_tombstones.json"
+
+
+class TombstoneStore:
+
+    def __init__(
+        self,
+        path: Path,
+        miss_threshold: int = 2,
+        recheck_base_sec: float = 24 * 3600,
+        recheck_max_sec: float = 30 * 24 * 3600,
+    ):
+        self.path = Path(path)
+        self.miss_threshold = miss_threshold
+        self.recheck_base_sec = recheck_base_sec
+        self.recheck_max_sec = recheck_max_sec
+        # pending: vid → 연속 miss 횟수 / dead: vid → {"since", "checks", "next_check"}
+        self.pending: Dict[str, int] = {}
+        self.dead: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @classmethod
+    def for_dir(cls, dir_path: Path, **kwargs: Any) -> "TombstoneStore":
+        return cls(Path(dir_path) / TOMBSTONE_NAME, **kwargs)
+
+    def load(self) -> None:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.pending = state.get("pending", {})
+        self.dead = state.get("dead", {})
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"pending": self.pending, "dead": self.dead},
+                      f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def partition(self, video_ids: Iterable[str], now: Optional[float] = None) -> Tuple[List[str], List[str], int]:
+        """
+        (요청할 live ID, 재확인할 tombstone ID, 건너뛴 tombstone 수)
+        입력 순서를 유지한다.
+        """
+        now = time.time() if now is None else now
+        live: List[str] = []
+        recheck: List[str] = []
+        skipped = 0
+        for vid in video_ids:
+            tomb = self.dead.get(vid)
+            if tomb is None:
+                live.append(vid)
+            elif tomb["next_check"] <= now:
+                recheck.append(vid)
+            else:
+                skipped += 1
+        return live, recheck, skipped
+
+    def observe(self, requested: Iterable[str], returned: Iterable[str], now: Optional[float] = None) -> int:
+        """
+        성공한 videos.list 한 번의 요청/응답 ID를 반영한다. 새로 tombstone 된 수를 반환.
+        (요청 자체가 실패한 배치는 호출하지 않는다)
+        """
+        now = time.time() if now is None else now
+        returned_set = set(returned)
+        newly_dead = 0
+        for vid in requested:
+            if vid in returned_set:
+                self.pending.pop(vid, None)
+                self.dead.pop(vid, None)
+                continue
+            tomb = self.dead.get(vid)
+            if tomb is not None:
+                # 재확인 실패 → 간격 두 배
+                tomb["checks"] += 1
+                tomb["next_check"] = now + self._interval(tomb["checks"])
+                continue
+            misses = self.pending.get(vid, 0) + 1
+            if misses >= self.miss_threshold:
+                self.pending.pop(vid, None)
+                self.dead[vid] = {"since": now, "checks": 1, "next_check": now + self._interval(1)}
+                newly_dead += 1
+            else:
+                self.pending[vid] = misses
+        return newly_dead
+
+    def _interval(self, checks: int) -> float:
+        return min(self.recheck_base_sec * (2 ** (checks - 1)), self.recheck_max_sec)
@@ -5,11 +5,13 @@ batch_metadata_dump.py
 - 각 videoId에 대해 yt_dlp_wrapper.fetch_metadata_json 실행.
 """
 
-import json
 from pathlib import Path
 from typing import List
 
-from yt_dlp_wrapper import fetch_metadata_json
+from Sources.Youtube.yt_dlp.yt_dlp_wrapper import fetch_metadata_json
+from Sources.Youtube.api.metrics import log_run_summary
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import read_raw, list_raw_files
 
 
 HERE = Path(__file__).resolve()
@@ -20,9 +22,8 @@ SEARCH_RAW_DIR = PROJECT_ROOT / "raw" / "search"
 def load_video_ids_from_search() -> List[str]:
     video_ids: List[str] = []
 
-    for json_path in SEARCH_RAW_DIR.glob("*.json"):
-        with json_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+    for json_path in list_raw_files(SEARCH_RAW_DIR):
+        data = read_raw(json_path)
 
         items = data.get("items", [])
         for item in items:
@@ -33,6 +34,7 @@ def load_video_ids_from_search() -> List[str]:
     return list(set(video_ids))
 
 
+@profiled("run_batch")
 def run_batch():
     vids = load_video_ids_from_search()
     print(f"총 대상 영상 수: {len(vids)}")
@@ -43,6 +45,8 @@ def run_batch():
         except Exception as e:
             print(f"[실패] {vid}: {e}")
 
+    log_run_summary()
+
 
 if __name__ == "__main__":
     run_batch()
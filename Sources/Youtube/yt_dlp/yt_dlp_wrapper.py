@@ -7,16 +7,22 @@ yt_dlp_wrapper.py
 
 import json
 import subprocess
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from Sources.Youtube.api.metrics import METRICS
+from Pipeline.profiling import profiled
+from Sources.Youtube.storage.raw_store import write_raw
+from Sources.Youtube.storage.fulltext_index import index_raw_file
+
 
 HERE = Path(__file__).resolve()
 PROJECT_ROOT = HERE.parents[1]          # .../01_Sources/YouTube
 RAW_DIR = PROJECT_ROOT / "raw" / "yt_dlp_meta"
-RAW_DIR.mkdir(parents=True, exist_ok=True)
 
 
+@profiled("fetch_metadata_json")
 def fetch_metadata_json(
     video_id: str,
     save: bool = True,
@@ -36,11 +42,16 @@ def fetch_metadata_json(
         cmd.extend(extra_args)
 
     # yt-dlp 실행
+    t0 = time.perf_counter()
     completed = subprocess.run(
         cmd,
         capture_output=True,
         text=True
     )
+    METRICS.record_call(
+        "yt-dlp", "ok" if completed.returncode == 0 else f"exit_{completed.returncode}",
+        time.perf_counter() - t0, nbytes=len(completed.stdout.encode("utf-8")),
+    )
 
     if completed.returncode != 0:
         raise RuntimeError(
@@ -50,9 +61,8 @@ def fetch_metadata_json(
     data = json.loads(completed.stdout)
 
     if save:
-        # 파일명: videoId.json
-        out_path = RAW_DIR / f"{video_id}.json"
-        with out_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 파일명: videoId.json.(zst|gz) — timestamp 파일명이 아니므로 catalog 미등록
+        out_path = write_raw(RAW_DIR, video_id, data, items_key=None, catalog=False)
+        index_raw_file(out_path, data)
 
     return data